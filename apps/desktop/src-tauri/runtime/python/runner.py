@@ -2,19 +2,45 @@
 from __future__ import annotations
 
 import argparse
+import asyncio
 import copy
 import importlib.util
 import inspect
+import itertools
 import json
+import math
+import mmap
 import os
 import queue
+import select
+import struct
+import subprocess
 import sys
 import threading
 import time
 import traceback
-from dataclasses import dataclass, field
+from collections import deque
+from functools import lru_cache, partial
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Protocol, TypeAlias, cast
+from types import MappingProxyType
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeAlias,
+    cast,
+)
 
 JSONScalar: TypeAlias = str | int | float | bool | None
 JSONValue: TypeAlias = JSONScalar | List["JSONValue"] | Dict[str, "JSONValue"]
@@ -23,11 +49,141 @@ SensorPayload: TypeAlias = Dict[str, float]
 ActuatorPayload: TypeAlias = Dict[str, float]
 ControllerOutputPayload: TypeAlias = Dict[str, float]
 
+PROTOCOL_VERSION = 1
+PROTOCOL_FRAMING_NDJSON = "ndjson"
+PROTOCOL_FRAMING_BINARY = "binary"
+PROTOCOL_FRAMINGS = (PROTOCOL_FRAMING_NDJSON, PROTOCOL_FRAMING_BINARY)
 PROTOCOL_STDOUT: Optional[int] = None
 PROTOCOL_STDOUT_LOCK = threading.Lock()
+PROTOCOL_FRAMING = PROTOCOL_FRAMING_NDJSON
+BINARY_FRAME_MAGIC = b"SP"
+BINARY_FRAME_HEADER = struct.Struct("<2sBBI")
+BINARY_FRAME_KIND_JSON = 1
+BINARY_FRAME_KIND_TELEMETRY = 2
+BINARY_TELEMETRY_LENGTH = struct.Struct("<I")
+BINARY_TELEMETRY_MESSAGES = ("telemetry", "telemetry_batch")
+PROTOCOL_WRITE_MODE_BLOCKING = "blocking"
+PROTOCOL_WRITE_MODE_NONBLOCKING = "nonblocking"
+PROTOCOL_WRITE_MODES = (PROTOCOL_WRITE_MODE_BLOCKING, PROTOCOL_WRITE_MODE_NONBLOCKING)
+DROPPABLE_PROTOCOL_MESSAGES = ("telemetry", "telemetry_batch", "transport_stats")
+PROTOCOL_SERIALIZER_AUTO = "auto"
+PROTOCOL_SERIALIZER_STDLIB = "json"
+PROTOCOL_SERIALIZER_ORJSON = "orjson"
+PROTOCOL_SERIALIZER_UJSON = "ujson"
+PROTOCOL_SERIALIZERS = (
+    PROTOCOL_SERIALIZER_AUTO,
+    PROTOCOL_SERIALIZER_STDLIB,
+    PROTOCOL_SERIALIZER_ORJSON,
+    PROTOCOL_SERIALIZER_UJSON,
+)
 DRIVER_REQUIRED_METHODS = ("connect", "stop", "read")
 DRIVER_WRITE_METHOD = "write"
+DRIVER_DATA_READY_METHOD = "bind_data_ready"
+DATA_READY_COMMAND = "data_ready"
+TIMING_STRATEGY_DEADLINE = "deadline"
+TIMING_STRATEGY_EVENT = "event"
+TIMING_STRATEGIES = (TIMING_STRATEGY_DEADLINE, TIMING_STRATEGY_EVENT)
+CYCLE_TRIGGER_EVENT = "event"
+CYCLE_TRIGGER_TIMEOUT = "timeout"
+CATCH_UP_SKIP = "skip"
+CATCH_UP_BURST = "burst"
+CATCH_UP_STRETCH = "stretch"
+CATCH_UP_POLICIES = (CATCH_UP_SKIP, CATCH_UP_BURST, CATCH_UP_STRETCH)
+DRIVER_IO_INLINE = "inline"
+DRIVER_IO_THREAD = "thread"
+DRIVER_IO_MODES = (DRIVER_IO_INLINE, DRIVER_IO_THREAD)
+DRIVER_SAMPLE_BLOCK_MAX_PENDING_SAMPLES = 65536
+DRIVER_ASYNC_METHODS = ("connect", "read", "stop")
+CONTROLLER_ASYNC_METHODS = ("connect", "stop", "compute")
 CONTROLLER_REQUIRED_METHODS = ("compute",)
+CONTROLLER_MUTABLE_SNAPSHOT_ATTRIBUTE = "mutable_snapshot"
+CONTROLLER_ARRAY_METHOD = "compute_array"
+SNAPSHOT_MODE_COPY = "copy"
+SNAPSHOT_MODE_READONLY = "readonly"
+SNAPSHOT_MODES = (SNAPSHOT_MODE_COPY, SNAPSHOT_MODE_READONLY)
+SNAPSHOT_SCOPE_FULL = "full"
+SNAPSHOT_SCOPE_DECLARED = "declared"
+SNAPSHOT_SCOPES = (SNAPSHOT_SCOPE_FULL, SNAPSHOT_SCOPE_DECLARED)
+CONTROLLER_MODE_SEQUENTIAL = "sequential"
+CONTROLLER_MODE_PARALLEL = "parallel"
+CONTROLLER_MODES = (CONTROLLER_MODE_SEQUENTIAL, CONTROLLER_MODE_PARALLEL)
+CONTROLLER_ISOLATION_NONE = "none"
+CONTROLLER_ISOLATION_PROCESS = "process"
+CONTROLLER_ISOLATIONS = (CONTROLLER_ISOLATION_NONE, CONTROLLER_ISOLATION_PROCESS)
+CONTROLLER_DEADLINE_HOLD = "hold"
+CONTROLLER_DEADLINE_SAFE = "safe"
+CONTROLLER_DEADLINE_ACTIONS = (CONTROLLER_DEADLINE_HOLD, CONTROLLER_DEADLINE_SAFE)
+CONTROLLER_LATE_RESULT_DISCARD = "discard"
+CONTROLLER_LATE_RESULT_APPLY = "apply"
+CONTROLLER_LATE_RESULTS = (CONTROLLER_LATE_RESULT_DISCARD, CONTROLLER_LATE_RESULT_APPLY)
+CONTROLLER_PRIORITY_NORMAL = "normal"
+CONTROLLER_PRIORITY_LOW = "low"
+CONTROLLER_PRIORITIES = (CONTROLLER_PRIORITY_NORMAL, CONTROLLER_PRIORITY_LOW)
+LOAD_SHED_LEVEL_NAMES = ("normal", "reduced_telemetry", "skip_optional", "throttle_low_priority")
+LOAD_SHED_REDUCED_TELEMETRY = 1
+LOAD_SHED_SKIP_OPTIONAL = 2
+LOAD_SHED_THROTTLE_LOW_PRIORITY = 3
+CONTROLLER_WORKER_FLAG = "--controller-worker"
+CONTROLLER_CHANNELS_DIRNAME = "controllers"
+CONTROLLER_RESTART_BACKOFF_INITIAL_S = 0.1
+CONTROLLER_RESTART_BACKOFF_MAX_S = 5.0
+CONTROLLER_CHANNEL_MAGIC = b"SPCW"
+CONTROLLER_CHANNEL_VERSION = 1
+CONTROLLER_CHANNEL_HEADER = struct.Struct("<4sII")
+CONTROLLER_CHANNEL_MESSAGE = struct.Struct("<II")
+CONTROLLER_CHANNEL_DATA_OFFSET = 64
+CONTROLLER_CHANNEL_INIT = 1
+CONTROLLER_CHANNEL_COMPUTE = 2
+CONTROLLER_CHANNEL_STOP = 3
+CONTROLLER_CHANNEL_STATUS_OK = 0
+CONTROLLER_CHANNEL_STATUS_ERROR = 1
+CONTROLLER_CHANNEL_DOORBELL = b"\x01"
+TELEMETRY_LAYOUT_MAP = "map"
+TELEMETRY_LAYOUT_COLUMNAR = "columnar"
+TELEMETRY_LAYOUTS = (TELEMETRY_LAYOUT_MAP, TELEMETRY_LAYOUT_COLUMNAR)
+TELEMETRY_ENCODING_FULL = "full"
+TELEMETRY_ENCODING_DELTA = "delta"
+TELEMETRY_ENCODINGS = (TELEMETRY_ENCODING_FULL, TELEMETRY_ENCODING_DELTA)
+TELEMETRY_PUBLISHER_INLINE = "inline"
+TELEMETRY_PUBLISHER_THREAD = "thread"
+TELEMETRY_PUBLISHERS = (TELEMETRY_PUBLISHER_INLINE, TELEMETRY_PUBLISHER_THREAD)
+OVERFLOW_POLICY_DROP_OLDEST = "drop_oldest"
+OVERFLOW_POLICY_DROP_NEWEST = "drop_newest"
+OVERFLOW_POLICY_BLOCK = "block"
+OVERFLOW_POLICIES = (OVERFLOW_POLICY_DROP_OLDEST, OVERFLOW_POLICY_DROP_NEWEST, OVERFLOW_POLICY_BLOCK)
+DROPPABLE_TELEMETRY_MESSAGES = ("telemetry", "telemetry_batch")
+TELEMETRY_PUBLISHER_CONTROL_HEADROOM = 64
+TELEMETRY_TRANSPORT_STDOUT = "stdout"
+TELEMETRY_TRANSPORT_SHM = "shm"
+TELEMETRY_TRANSPORTS = (TELEMETRY_TRANSPORT_STDOUT, TELEMETRY_TRANSPORT_SHM)
+TELEMETRY_RING_FILENAME = "telemetry.ring"
+TELEMETRY_RING_MAGIC = b"SPRB"
+TELEMETRY_RING_VERSION = 1
+TELEMETRY_RING_HEADER = struct.Struct("<4sHHIIIIII")
+TELEMETRY_RING_WRITE_SEQUENCE = struct.Struct("<Q")
+TELEMETRY_RING_WRITE_SEQUENCE_OFFSET = 32
+TELEMETRY_RING_SCHEMA_OFFSET = 64
+TELEMETRY_RING_SLOT_SEQUENCE = struct.Struct("<Q")
+TELEMETRY_RING_METRIC_FIELDS = (
+    "timestamp",
+    "cycle_id",
+    "effective_dt_ms",
+    "cycle_duration_ms",
+    "read_duration_ms",
+    "control_duration_ms",
+    "write_duration_ms",
+    "publish_duration_ms",
+    "late_by_ms",
+    "uptime_s",
+)
+TELEMETRY_VALUE_FIELDS = (
+    "sensors",
+    "actuators",
+    "actuators_read",
+    "setpoints",
+    "controller_outputs",
+    "written_outputs",
+)
 
 
 @dataclass
@@ -76,6 +232,14 @@ class RuntimeTiming:
     clock: str
     strategy: str
     sample_time_ms: int
+    publish_every_cycles: int = 1
+    publish_max_rate_hz: float = 0.0
+    event_min_spacing_ms: int = 0
+    event_timeout_ms: int = 0
+    spin_window_ms: float = 0.0
+    catch_up: str = CATCH_UP_SKIP
+    catch_up_max_cycles: int = 4
+    overrun_report_interval_ms: int = 1000
 
 
 @dataclass(frozen=True)
@@ -93,12 +257,57 @@ class RuntimePaths:
     bootstrap_path: str
 
 
+@dataclass(frozen=True)
+class RuntimeExecution:
+    snapshot_mode: str = SNAPSHOT_MODE_COPY
+    snapshot_scope: str = SNAPSHOT_SCOPE_FULL
+    controller_mode: str = CONTROLLER_MODE_SEQUENTIAL
+    max_workers: int = 0
+    driver_io: str = DRIVER_IO_INLINE
+    driver_poll_ms: int = 0
+    async_timeout_ms: int = 0
+
+
+@dataclass(frozen=True)
+class RuntimeTelemetry:
+    layout: str = TELEMETRY_LAYOUT_MAP
+    encoding: str = TELEMETRY_ENCODING_FULL
+    keyframe_interval: int = 50
+    deadband_ratio: float = 0.0
+    publisher: str = TELEMETRY_PUBLISHER_INLINE
+    queue_size: int = 256
+    overflow_policy: str = OVERFLOW_POLICY_DROP_OLDEST
+    transport: str = TELEMETRY_TRANSPORT_STDOUT
+    ring_slots: int = 1024
+
+
+@dataclass(frozen=True)
+class RuntimeProtocol:
+    framing: str = PROTOCOL_FRAMING_NDJSON
+    write_mode: str = PROTOCOL_WRITE_MODE_BLOCKING
+    max_pending_bytes: int = 1048576
+    stats_interval_ms: int = 1000
+    serializer: str = PROTOCOL_SERIALIZER_AUTO
+
+
+@dataclass(frozen=True)
+class RuntimeLoadShedding:
+    degrade_after_late_cycles: int = 0
+    recover_after_on_time_cycles: int = 50
+    telemetry_every_cycles: int = 4
+    low_priority_period_multiplier: int = 4
+
+
 @dataclass(frozen=True)
 class RuntimeContext:
     id: str
     timing: RuntimeTiming
     supervision: RuntimeSupervision
     paths: RuntimePaths
+    execution: RuntimeExecution = field(default_factory=RuntimeExecution)
+    telemetry: RuntimeTelemetry = field(default_factory=RuntimeTelemetry)
+    protocol: RuntimeProtocol = field(default_factory=RuntimeProtocol)
+    load_shedding: RuntimeLoadShedding = field(default_factory=RuntimeLoadShedding)
 
 
 @dataclass(frozen=True)
@@ -119,6 +328,19 @@ class ControllerParamSpec:
     label: str
 
 
+@dataclass(frozen=True)
+class ControllerExecution:
+    isolation: str = CONTROLLER_ISOLATION_NONE
+    timeout_ms: int = 1000
+    channel_bytes: int = 1048576
+    deadline_ms: int = 0
+    on_deadline: str = CONTROLLER_DEADLINE_HOLD
+    safe_outputs: Dict[str, float] = field(default_factory=dict)
+    late_result: str = CONTROLLER_LATE_RESULT_DISCARD
+    period_ms: int = 0
+    priority: str = CONTROLLER_PRIORITY_NORMAL
+
+
 @dataclass
 class ControllerMetadata:
     id: str
@@ -133,6 +355,7 @@ class ControllerMetadata:
     input_variable_ids: List[str]
     output_variable_ids: List[str]
     params: Dict[str, ControllerParamSpec]
+    execution: ControllerExecution = field(default_factory=ControllerExecution)
 
 
 @dataclass(frozen=True)
@@ -175,6 +398,18 @@ class RuntimeBootstrap:
     runtime: RuntimeContext
 
 
+@dataclass(frozen=True)
+class TelemetrySchema:
+    version: int
+    columns: Dict[str, List[str]]
+
+    def serialize(self) -> Dict[str, Any]:
+        return {
+            "schema_version": self.version,
+            "columns": {name: list(ids) for name, ids in self.columns.items()},
+        }
+
+
 @dataclass(frozen=True)
 class CycleDurations:
     read_duration_ms: float = 0.0
@@ -182,6 +417,52 @@ class CycleDurations:
     write_duration_ms: float = 0.0
     publish_duration_ms: float = 0.0
     controller_durations_ms: Dict[str, float] = field(default_factory=dict)
+    controller_compute_total_ms: float = 0.0
+
+
+@dataclass
+class OverrunSummary:
+    started_at: float
+    first_cycle_id: int
+    last_cycle_id: int = 0
+    count: int = 0
+    skipped_deadlines: int = 0
+    worst_late_by_ms: float = 0.0
+    worst_cycle_duration_ms: float = 0.0
+
+    def serialize(self, configured_sample_time_ms: int, now: float) -> Dict[str, Any]:
+        return {
+            "first_cycle_id": self.first_cycle_id,
+            "last_cycle_id": self.last_cycle_id,
+            "count": self.count,
+            "skipped_deadlines": self.skipped_deadlines,
+            "worst_late_by_ms": self.worst_late_by_ms,
+            "worst_cycle_duration_ms": self.worst_cycle_duration_ms,
+            "interval_ms": max(0.0, (now - self.started_at) * 1000.0),
+            "configured_sample_time_ms": configured_sample_time_ms,
+        }
+
+
+@dataclass(frozen=True)
+class SampleBlock:
+    timestamps: List[float]
+    sensors: Dict[str, List[Optional[float]]]
+    actuators: Dict[str, List[Optional[float]]]
+
+    def serialize(self) -> Dict[str, Any]:
+        return {
+            "timestamps": self.timestamps,
+            "sensors": self.sensors,
+            "actuators": self.actuators,
+        }
+
+
+@dataclass(frozen=True)
+class DriverSample:
+    sensors: SensorPayload
+    actuators: ActuatorPayload
+    sequence: int
+    captured_at: float
 
 
 class DriverProtocol(Protocol):
@@ -195,7 +476,7 @@ class DriverProtocol(Protocol):
 
 
 class ControllerProtocol(Protocol):
-    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]: ...
+    def compute(self, snapshot: Mapping[str, Any]) -> Dict[str, float]: ...
 
 
 @dataclass
@@ -203,6 +484,34 @@ class LoadedController:
     metadata: ControllerMetadata
     public_metadata: Dict[str, Any]
     instance: ControllerProtocol
+    snapshot_mode: str = SNAPSHOT_MODE_COPY
+    mutable_snapshot: bool = False
+    watchdog: Optional["ControllerWatchdog"] = None
+    array_api: bool = False
+    snapshot_variable_ids: Optional[tuple[str, ...]] = None
+    period_cycles: int = 1
+    cycles_until_due: int = 0
+    elapsed_ms: float = 0.0
+    held_outputs: ControllerOutputPayload = field(default_factory=dict)
+    layer: int = 0
+    upstream_output_ids: tuple[str, ...] = ()
+
+
+@dataclass(frozen=True)
+class ControllerComputeResult:
+    outputs: ControllerOutputPayload
+    duration_ms: float
+    error: Optional[Exception] = None
+    error_traceback: str = ""
+
+
+@dataclass(frozen=True)
+class AsyncWriteResult:
+    cycle_id: int
+    outputs: ControllerOutputPayload
+    result: Any = None
+    error: Optional[Exception] = None
+    error_traceback: str = ""
 
 
 @dataclass
@@ -213,6 +522,812 @@ class ControllerReloadResult:
     error: Optional[str] = None
 
 
+class TelemetryDeltaEncoder:
+    def __init__(self, keyframe_interval: int, deadbands: Dict[str, float]) -> None:
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.deadbands = deadbands
+        self.sequence = 0
+        self.frames_since_keyframe = 0
+        self.keyframe_requested = True
+        self.last_sent: Dict[str, Dict[str, float]] = {}
+
+    def request_keyframe(self) -> None:
+        self.keyframe_requested = True
+
+    def encode(self, telemetry_payload: Dict[str, Any]) -> Dict[str, Any]:
+        self.sequence += 1
+        keyframe = self.keyframe_requested or self.frames_since_keyframe >= self.keyframe_interval
+        encoded = dict(telemetry_payload)
+        encoded["sequence"] = self.sequence
+        encoded["keyframe"] = keyframe
+
+        if keyframe:
+            self.keyframe_requested = False
+            self.frames_since_keyframe = 1
+            self.last_sent = {
+                field_name: dict(telemetry_payload.get(field_name) or {})
+                for field_name in TELEMETRY_VALUE_FIELDS
+            }
+            return encoded
+
+        self.frames_since_keyframe += 1
+        for field_name in TELEMETRY_VALUE_FIELDS:
+            last_values = self.last_sent.setdefault(field_name, {})
+            changed: Dict[str, float] = {}
+            for variable_id, value in (telemetry_payload.get(field_name) or {}).items():
+                last_value = last_values.get(variable_id)
+                if last_value is None or abs(value - last_value) > self.deadbands.get(variable_id, 0.0):
+                    changed[variable_id] = value
+            last_values.update(changed)
+            encoded[field_name] = changed
+        return encoded
+
+
+@dataclass(frozen=True)
+class TelemetryRingSample:
+    sequence: int
+    metrics: Dict[str, float]
+    values: Dict[str, List[Optional[float]]]
+
+
+class TelemetryRingWriter:
+    def __init__(self, path: Path, slot_count: int, schema: TelemetrySchema) -> None:
+        self.path = path
+        self.schema = schema
+        self.slot_count = max(1, slot_count)
+        self.value_count = sum(len(schema.columns[field_name]) for field_name in TELEMETRY_VALUE_FIELDS)
+        self.slot_values = struct.Struct(
+            f"<{len(TELEMETRY_RING_METRIC_FIELDS) + self.value_count}d"
+        )
+        self.slot_size = TELEMETRY_RING_SLOT_SEQUENCE.size + self.slot_values.size
+        self.sequence = 0
+
+        schema_bytes = json.dumps(
+            {**schema.serialize(), "metrics": list(TELEMETRY_RING_METRIC_FIELDS)},
+            ensure_ascii=False,
+            separators=(",", ":"),
+        ).encode("utf-8")
+        self.data_offset = _align8(TELEMETRY_RING_SCHEMA_OFFSET + len(schema_bytes))
+        size = self.data_offset + self.slot_count * self.slot_size
+
+        header = bytearray(self.data_offset)
+        TELEMETRY_RING_HEADER.pack_into(
+            header,
+            0,
+            TELEMETRY_RING_MAGIC,
+            TELEMETRY_RING_VERSION,
+            0,
+            self.slot_count,
+            self.value_count,
+            self.slot_size,
+            TELEMETRY_RING_SCHEMA_OFFSET,
+            len(schema_bytes),
+            self.data_offset,
+        )
+        TELEMETRY_RING_WRITE_SEQUENCE.pack_into(header, TELEMETRY_RING_WRITE_SEQUENCE_OFFSET, 0)
+        header[TELEMETRY_RING_SCHEMA_OFFSET : TELEMETRY_RING_SCHEMA_OFFSET + len(schema_bytes)] = schema_bytes
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        staging_path = path.with_name(f"{path.name}.tmp")
+        with staging_path.open("wb") as staging:
+            staging.write(header)
+            staging.truncate(size)
+        os.replace(staging_path, path)
+
+        self.handle = path.open("r+b")
+        try:
+            self.buffer = mmap.mmap(self.handle.fileno(), size)
+        except Exception:
+            self.handle.close()
+            raise
+
+    def describe(self) -> Dict[str, Any]:
+        return {
+            "transport": TELEMETRY_TRANSPORT_SHM,
+            "ring_path": str(self.path),
+            "slot_count": self.slot_count,
+        }
+
+    def write(self, telemetry_payload: Dict[str, Any]) -> None:
+        self.sequence += 1
+        slot_offset = self.data_offset + ((self.sequence - 1) % self.slot_count) * self.slot_size
+        values: List[float] = [
+            float(telemetry_payload.get(field_name) or 0.0) for field_name in TELEMETRY_RING_METRIC_FIELDS
+        ]
+        for field_name in TELEMETRY_VALUE_FIELDS:
+            values.extend(
+                float("nan") if value is None else value for value in telemetry_payload[field_name]
+            )
+
+        TELEMETRY_RING_SLOT_SEQUENCE.pack_into(self.buffer, slot_offset, self.sequence * 2 - 1)
+        self.slot_values.pack_into(self.buffer, slot_offset + TELEMETRY_RING_SLOT_SEQUENCE.size, *values)
+        TELEMETRY_RING_SLOT_SEQUENCE.pack_into(self.buffer, slot_offset, self.sequence * 2)
+        TELEMETRY_RING_WRITE_SEQUENCE.pack_into(
+            self.buffer,
+            TELEMETRY_RING_WRITE_SEQUENCE_OFFSET,
+            self.sequence,
+        )
+
+    def close(self) -> None:
+        self.buffer.close()
+        self.handle.close()
+
+
+class TelemetryRingReader:
+    def __init__(self, path: Path) -> None:
+        self.handle = path.open("rb")
+        self.buffer = mmap.mmap(self.handle.fileno(), 0, access=mmap.ACCESS_READ)
+        (
+            magic,
+            version,
+            _reserved,
+            self.slot_count,
+            self.value_count,
+            self.slot_size,
+            schema_offset,
+            schema_length,
+            self.data_offset,
+        ) = TELEMETRY_RING_HEADER.unpack_from(self.buffer, 0)
+        if magic != TELEMETRY_RING_MAGIC or version != TELEMETRY_RING_VERSION:
+            self.close()
+            raise RuntimeError(f"Ring de telemetria inválido em '{path}'")
+        self.schema = cast(
+            Dict[str, Any],
+            json.loads(bytes(self.buffer[schema_offset : schema_offset + schema_length])),
+        )
+        self.slot_values = struct.Struct(f"<{len(TELEMETRY_RING_METRIC_FIELDS) + self.value_count}d")
+
+    def write_sequence(self) -> int:
+        return int(
+            TELEMETRY_RING_WRITE_SEQUENCE.unpack_from(self.buffer, TELEMETRY_RING_WRITE_SEQUENCE_OFFSET)[0]
+        )
+
+    def read_since(self, last_sequence: int) -> List[TelemetryRingSample]:
+        newest = self.write_sequence()
+        oldest = max(last_sequence + 1, newest - self.slot_count + 1, 1)
+        samples: List[TelemetryRingSample] = []
+        for sequence in range(oldest, newest + 1):
+            slot_offset = self.data_offset + ((sequence - 1) % self.slot_count) * self.slot_size
+            before = TELEMETRY_RING_SLOT_SEQUENCE.unpack_from(self.buffer, slot_offset)[0]
+            values = self.slot_values.unpack_from(self.buffer, slot_offset + TELEMETRY_RING_SLOT_SEQUENCE.size)
+            after = TELEMETRY_RING_SLOT_SEQUENCE.unpack_from(self.buffer, slot_offset)[0]
+            if before != sequence * 2 or after != before:
+                continue
+            samples.append(self._decode_sample(sequence, values))
+        return samples
+
+    def _decode_sample(self, sequence: int, values: Tuple[float, ...]) -> TelemetryRingSample:
+        metric_count = len(TELEMETRY_RING_METRIC_FIELDS)
+        decoded: Dict[str, List[Optional[float]]] = {}
+        cursor = metric_count
+        for field_name in TELEMETRY_VALUE_FIELDS:
+            column_length = len(self.schema["columns"][field_name])
+            decoded[field_name] = [
+                None if value != value else value for value in values[cursor : cursor + column_length]
+            ]
+            cursor += column_length
+        return TelemetryRingSample(
+            sequence=sequence,
+            metrics=dict(zip(TELEMETRY_RING_METRIC_FIELDS, values[:metric_count])),
+            values=decoded,
+        )
+
+    def close(self) -> None:
+        self.buffer.close()
+        self.handle.close()
+
+
+class TelemetryPublisher:
+    def __init__(self, capacity: int, overflow_policy: str) -> None:
+        self.capacity = max(1, capacity)
+        self.overflow_policy = overflow_policy
+        self.frames: Deque[Tuple[str, Dict[str, Any]]] = deque()
+        self.condition = threading.Condition()
+        self.dropped_frames = 0
+        self.in_flight = False
+        self.closed = False
+        self.thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self.thread is not None:
+            return
+        self.thread = threading.Thread(target=self._run, daemon=True, name="telemetry-publisher")
+        self.thread.start()
+
+    def publish(self, msg_type: str, payload: Dict[str, Any]) -> None:
+        with self.condition:
+            if self.closed:
+                return
+            droppable = msg_type in DROPPABLE_TELEMETRY_MESSAGES
+            limit = self.capacity if droppable else self.capacity + TELEMETRY_PUBLISHER_CONTROL_HEADROOM
+            if len(self.frames) >= limit:
+                if self.overflow_policy == OVERFLOW_POLICY_BLOCK:
+                    while len(self.frames) >= limit and not self.closed:
+                        self.condition.wait()
+                elif (
+                    droppable and self.overflow_policy == OVERFLOW_POLICY_DROP_NEWEST
+                ) or not self._drop_oldest_droppable():
+                    self.dropped_frames += 1
+                    return
+            self.frames.append((msg_type, payload))
+            self.condition.notify_all()
+
+    def _drop_oldest_droppable(self) -> bool:
+        for index, (queued_type, _payload) in enumerate(self.frames):
+            if queued_type in DROPPABLE_TELEMETRY_MESSAGES:
+                del self.frames[index]
+                self.dropped_frames += 1
+                return True
+        return False
+
+    def stats(self) -> Dict[str, int]:
+        with self.condition:
+            return {
+                "telemetry_dropped_frames": self.dropped_frames,
+                "telemetry_queue_depth": len(self.frames),
+            }
+
+    def flush(self, timeout_s: float) -> bool:
+        deadline = time.monotonic() + max(0.0, timeout_s)
+        with self.condition:
+            while self.frames or self.in_flight:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0.0 or self.thread is None or not self.thread.is_alive():
+                    return False
+                self.condition.wait(remaining)
+        return True
+
+    def close(self, timeout_s: float) -> None:
+        self.flush(timeout_s)
+        with self.condition:
+            self.closed = True
+            self.condition.notify_all()
+        if self.thread is not None:
+            self.thread.join(timeout=max(0.0, timeout_s))
+
+    def _run(self) -> None:
+        while True:
+            with self.condition:
+                while not self.frames and not self.closed:
+                    self.condition.wait()
+                if not self.frames:
+                    return
+                msg_type, payload = self.frames.popleft()
+                self.in_flight = True
+                self.condition.notify_all()
+
+            try:
+                emit(msg_type, payload)
+            except Exception as exc:  # noqa: BLE001
+                log_error(f"Falha ao publicar telemetria: {format_exception_message(exc)}")
+            finally:
+                with self.condition:
+                    self.in_flight = False
+                    self.condition.notify_all()
+
+
+class ControllerWatchdog:
+    def __init__(self, metadata: ControllerMetadata) -> None:
+        self.execution = metadata.execution
+        self.output_variable_ids = list(metadata.output_variable_ids)
+        self.jobs: "queue.Queue[Optional[Tuple[Future[ControllerComputeResult], Callable[[], ControllerComputeResult]]]]" = (
+            queue.Queue()
+        )
+        self.pending: Optional["Future[ControllerComputeResult]"] = None
+        self.pending_started_at = 0.0
+        self.last_good_outputs: ControllerOutputPayload = {}
+        self.deadline_misses = 0
+        self.late_results = 0
+        self.skipped_cycles = 0
+        self.thread = threading.Thread(
+            target=self._run,
+            daemon=True,
+            name=f"controller-watchdog-{metadata.id}",
+        )
+        self.thread.start()
+
+    def submit(self, compute: Callable[[], ControllerComputeResult]) -> bool:
+        if self.pending is not None:
+            if not self.pending.done():
+                self.skipped_cycles += 1
+                return False
+            self._settle_late_result(self.pending.result())
+        self.pending = Future()
+        self.pending_started_at = time.monotonic()
+        self.jobs.put((self.pending, compute))
+        return True
+
+    def collect(self, submitted: bool) -> ControllerComputeResult:
+        pending = self.pending
+        if submitted and pending is not None:
+            remaining_s = self.pending_started_at + self.execution.deadline_ms / 1000.0 - time.monotonic()
+            try:
+                result = pending.result(timeout=max(0.0, remaining_s))
+            except FutureTimeoutError:
+                self.deadline_misses += 1
+            else:
+                self.pending = None
+                if result.error is None:
+                    self.last_good_outputs = dict(result.outputs)
+                return result
+
+        return ControllerComputeResult(
+            outputs=self._fallback_outputs(),
+            duration_ms=(time.monotonic() - self.pending_started_at) * 1000.0,
+        )
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "deadline_misses": self.deadline_misses,
+            "late_results": self.late_results,
+            "skipped_cycles": self.skipped_cycles,
+        }
+
+    def close(self) -> None:
+        self.jobs.put(None)
+
+    def _fallback_outputs(self) -> ControllerOutputPayload:
+        if self.execution.on_deadline == CONTROLLER_DEADLINE_SAFE:
+            return {
+                variable_id: value
+                for variable_id, value in self.execution.safe_outputs.items()
+                if variable_id in self.output_variable_ids
+            }
+        return dict(self.last_good_outputs)
+
+    def _settle_late_result(self, result: ControllerComputeResult) -> None:
+        self.pending = None
+        self.late_results += 1
+        if self.execution.late_result == CONTROLLER_LATE_RESULT_APPLY and result.error is None:
+            self.last_good_outputs = dict(result.outputs)
+
+    def _run(self) -> None:
+        while True:
+            job = self.jobs.get()
+            if job is None:
+                return
+            future, compute = job
+            if future.set_running_or_notify_cancel():
+                future.set_result(compute())
+
+
+class DriverIoThread:
+    def __init__(self, driver: DriverProtocol, plant: PlantContext, poll_interval_s: float) -> None:
+        self.driver = driver
+        self.plant = plant
+        self.poll_interval_s = poll_interval_s
+        self.samples: List[Optional[DriverSample]] = [None, None]
+        self.front = 0
+        self.sequence = 0
+        self.mailbox: Optional[ControllerOutputPayload] = None
+        self.mailbox_lock = threading.Lock()
+        self.replaced_writes = 0
+        self.sample_blocks: List[SampleBlock] = []
+        self.sample_blocks_lock = threading.Lock()
+        self.pending_block_samples = 0
+        self.dropped_block_samples = 0
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread = threading.Thread(target=self._run, daemon=True, name="driver-io")
+        self.thread.start()
+
+    def latest(self) -> Optional[DriverSample]:
+        return self.samples[self.front]
+
+    def drain_sample_blocks(self) -> List[SampleBlock]:
+        with self.sample_blocks_lock:
+            blocks, self.sample_blocks = self.sample_blocks, []
+            self.pending_block_samples = 0
+        return blocks
+
+    def discard_sample_blocks(self) -> None:
+        with self.sample_blocks_lock:
+            self.dropped_block_samples += self.pending_block_samples
+            self.sample_blocks = []
+            self.pending_block_samples = 0
+
+    def submit_write(self, outputs: ControllerOutputPayload) -> None:
+        with self.mailbox_lock:
+            if self.mailbox is not None:
+                self.replaced_writes += 1
+            self.mailbox = outputs
+        self.wakeup.set()
+
+    def stats(self, now: float) -> Dict[str, Any]:
+        stats: Dict[str, Any] = {"driver_writes_replaced": self.replaced_writes}
+        sample = self.latest()
+        if sample is not None:
+            stats["driver_sample_sequence"] = sample.sequence
+            stats["driver_sample_age_ms"] = max(0.0, (now - sample.captured_at) * 1000.0)
+        return stats
+
+    def close(self, timeout_s: float) -> None:
+        self.stopping = True
+        self.wakeup.set()
+        self.thread.join(timeout_s)
+
+    def _run(self) -> None:
+        while not self.stopping:
+            self.wakeup.clear()
+            self._flush_write()
+            self._read()
+            self.wakeup.wait(self.poll_interval_s)
+        self._flush_write()
+
+    def _read(self) -> None:
+        try:
+            sensors, actuators, sample_block = normalize_read_snapshot(self.driver.read(), self.plant)
+        except Exception as exc:  # noqa: BLE001
+            log_error(traceback.format_exc())
+            emit("warning", {"message": f"Falha em leitura de driver: {exc}"})
+            return
+        if sample_block is not None:
+            with self.sample_blocks_lock:
+                self.sample_blocks.append(sample_block)
+                self.pending_block_samples += len(sample_block.timestamps)
+                while (
+                    self.pending_block_samples > DRIVER_SAMPLE_BLOCK_MAX_PENDING_SAMPLES
+                    and len(self.sample_blocks) > 1
+                ):
+                    dropped = len(self.sample_blocks.pop(0).timestamps)
+                    self.pending_block_samples -= dropped
+                    self.dropped_block_samples += dropped
+        self.sequence += 1
+        back = 1 - self.front
+        self.samples[back] = DriverSample(
+            sensors=sensors,
+            actuators=actuators,
+            sequence=self.sequence,
+            captured_at=time.monotonic(),
+        )
+        self.front = back
+
+    def _flush_write(self) -> None:
+        with self.mailbox_lock:
+            outputs, self.mailbox = self.mailbox, None
+        if outputs is None:
+            return
+        try:
+            coerce_optional_bool(
+                "write",
+                self.driver.write(outputs),
+                "Driver retornou False em write(outputs)",
+            )
+        except Exception as exc:  # noqa: BLE001
+            log_error(traceback.format_exc())
+            emit("warning", {"message": f"Falha em escrita de driver: {exc}"})
+
+
+class AsyncioBridge:
+    def __init__(self, timeout_ms: int) -> None:
+        self.timeout_ms = timeout_ms
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self._run, daemon=True, name="asyncio-bridge")
+        self.thread.start()
+
+    def submit(self, method_name: str, method: Callable[..., Any], *args: Any) -> "Future[Any]":
+        return asyncio.run_coroutine_threadsafe(self._call(method_name, method, *args), self.loop)
+
+    def run(self, method_name: str, method: Callable[..., Any], *args: Any) -> Any:
+        return self.submit(method_name, method, *args).result()
+
+    def close(self, timeout_s: float) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self.thread.join(timeout_s)
+        if not self.thread.is_alive():
+            self.loop.close()
+
+    async def _call(self, method_name: str, method: Callable[..., Any], *args: Any) -> Any:
+        if self.timeout_ms <= 0:
+            return await method(*args)
+        try:
+            return await asyncio.wait_for(method(*args), self.timeout_ms / 1000.0)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"{method_name}() excedeu o prazo de {self.timeout_ms} ms") from None
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+
+class OverlappedAsyncWrite:
+    def __init__(self, bridge: AsyncioBridge, method: Callable[..., Any]) -> None:
+        self.bridge = bridge
+        self.method = method
+        self.pending: Optional["Future[Any]"] = None
+        self.pending_cycle_id = 0
+        self.pending_outputs: ControllerOutputPayload = {}
+
+    def __call__(self, outputs: ControllerOutputPayload) -> Any:
+        try:
+            return self.settle()
+        finally:
+            self._start(outputs, 0)
+
+    def submit(self, outputs: ControllerOutputPayload, cycle_id: int) -> Optional[AsyncWriteResult]:
+        try:
+            return self.settle_result()
+        finally:
+            self._start(outputs, cycle_id)
+
+    def settle(self) -> Any:
+        settled = self.settle_result()
+        if settled is None:
+            return None
+        if settled.error is not None:
+            raise settled.error
+        return settled.result
+
+    def settle_result(self) -> Optional[AsyncWriteResult]:
+        pending, self.pending = self.pending, None
+        if pending is None:
+            return None
+        try:
+            result = pending.result()
+        except Exception as exc:  # noqa: BLE001
+            return AsyncWriteResult(
+                cycle_id=self.pending_cycle_id,
+                outputs=self.pending_outputs,
+                error=exc,
+                error_traceback=traceback.format_exc(),
+            )
+        return AsyncWriteResult(cycle_id=self.pending_cycle_id, outputs=self.pending_outputs, result=result)
+
+    def _start(self, outputs: ControllerOutputPayload, cycle_id: int) -> None:
+        self.pending_cycle_id = cycle_id
+        self.pending_outputs = outputs
+        self.pending = self.bridge.submit(DRIVER_WRITE_METHOD, self.method, outputs)
+
+
+class ControllerChannel:
+    def __init__(self, path: Path, region_size: int, create: bool) -> None:
+        self.path = path
+        self.region_size = region_size
+        size = CONTROLLER_CHANNEL_DATA_OFFSET + 2 * region_size
+        if create:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = path.open("w+b")
+            self.handle.truncate(size)
+        else:
+            self.handle = path.open("r+b")
+        try:
+            self.buffer = mmap.mmap(self.handle.fileno(), size)
+            if create:
+                CONTROLLER_CHANNEL_HEADER.pack_into(
+                    self.buffer,
+                    0,
+                    CONTROLLER_CHANNEL_MAGIC,
+                    CONTROLLER_CHANNEL_VERSION,
+                    region_size,
+                )
+            else:
+                magic, version, stored_region_size = CONTROLLER_CHANNEL_HEADER.unpack_from(self.buffer, 0)
+                if (magic, version, stored_region_size) != (
+                    CONTROLLER_CHANNEL_MAGIC,
+                    CONTROLLER_CHANNEL_VERSION,
+                    region_size,
+                ):
+                    raise RuntimeError(f"Canal de controlador inválido em '{path}'")
+        except Exception:
+            self.handle.close()
+            raise
+
+    def write_request(self, kind: int, body: bytes) -> None:
+        self._write(CONTROLLER_CHANNEL_DATA_OFFSET, kind, body)
+
+    def read_request(self) -> Tuple[int, bytes]:
+        return self._read(CONTROLLER_CHANNEL_DATA_OFFSET)
+
+    def write_response(self, status: int, body: bytes) -> None:
+        self._write(CONTROLLER_CHANNEL_DATA_OFFSET + self.region_size, status, body)
+
+    def read_response(self) -> Tuple[int, bytes]:
+        return self._read(CONTROLLER_CHANNEL_DATA_OFFSET + self.region_size)
+
+    def close(self) -> None:
+        self.buffer.close()
+        self.handle.close()
+
+    def _write(self, offset: int, code: int, body: bytes) -> None:
+        if CONTROLLER_CHANNEL_MESSAGE.size + len(body) > self.region_size:
+            raise RuntimeError(
+                f"Mensagem de {len(body)} bytes excede o canal do controlador ({self.region_size} bytes)"
+            )
+        body_offset = offset + CONTROLLER_CHANNEL_MESSAGE.size
+        self.buffer[body_offset : body_offset + len(body)] = body
+        CONTROLLER_CHANNEL_MESSAGE.pack_into(self.buffer, offset, len(body), code)
+
+    def _read(self, offset: int) -> Tuple[int, bytes]:
+        length, code = CONTROLLER_CHANNEL_MESSAGE.unpack_from(self.buffer, offset)
+        body_offset = offset + CONTROLLER_CHANNEL_MESSAGE.size
+        return code, bytes(self.buffer[body_offset : body_offset + length])
+
+
+class IsolatedController:
+    def __init__(
+        self,
+        metadata: ControllerMetadata,
+        plant: PlantContext,
+        channel_path: Path,
+        startup_timeout_s: float,
+        shutdown_timeout_s: float,
+    ) -> None:
+        self.metadata = metadata
+        self.plant = plant
+        self.channel_path = channel_path
+        self.startup_timeout_s = startup_timeout_s
+        self.shutdown_timeout_s = shutdown_timeout_s
+        self.timeout_s = metadata.execution.timeout_ms / 1000.0
+        self.channel: Optional[ControllerChannel] = None
+        self.process: Optional[subprocess.Popen[bytes]] = None
+        self.doorbells: "queue.Queue[bool]" = queue.Queue()
+        self.restart_count = 0
+        self.restart_backoff_s = 0.0
+        self.next_restart_at = 0.0
+        self.respawn_thread: Optional[threading.Thread] = None
+        self.spawn_lock = threading.Lock()
+        self.stopping = False
+
+    def start(self) -> None:
+        self._spawn()
+
+    def compute(self, snapshot: Mapping[str, Any]) -> Dict[str, float]:
+        with self.spawn_lock:
+            if self.process is None or self.respawn_thread is not None:
+                self._schedule_respawn()
+                raise RuntimeError(f"Processo do controlador '{self.metadata.name}' está reiniciando")
+        body = json.dumps(snapshot, ensure_ascii=False, separators=(",", ":"), default=dict)
+        outputs = cast(
+            Dict[str, float],
+            self._call(CONTROLLER_CHANNEL_COMPUTE, body.encode("utf-8"), self.timeout_s),
+        )
+        self.restart_backoff_s = 0.0
+        self.next_restart_at = 0.0
+        return outputs
+
+    def stop(self) -> bool:
+        with self.spawn_lock:
+            self.stopping = True
+            respawn_thread = self.respawn_thread
+        if respawn_thread is not None:
+            respawn_thread.join(self.startup_timeout_s + self.shutdown_timeout_s)
+        try:
+            if self.process is not None:
+                self._call(CONTROLLER_CHANNEL_STOP, b"", self.shutdown_timeout_s)
+        finally:
+            self._terminate()
+            if self.channel is not None:
+                self.channel.close()
+                self.channel = None
+            try:
+                self.channel_path.unlink()
+            except OSError:
+                pass
+        return True
+
+    def _schedule_respawn(self) -> None:
+        if self.stopping or self.respawn_thread is not None or time.monotonic() < self.next_restart_at:
+            return
+        self.restart_count += 1
+        self.respawn_thread = threading.Thread(
+            target=self._respawn,
+            daemon=True,
+            name=f"controller-respawn-{self.metadata.id}",
+        )
+        self.respawn_thread.start()
+
+    def _respawn(self) -> None:
+        try:
+            self._spawn()
+        except Exception as exc:  # noqa: BLE001
+            self._terminate(kill=True)
+            log_error(f"Falha ao reiniciar o processo do controlador '{self.metadata.name}': {exc}")
+        finally:
+            with self.spawn_lock:
+                self.restart_backoff_s = min(
+                    CONTROLLER_RESTART_BACKOFF_MAX_S,
+                    max(CONTROLLER_RESTART_BACKOFF_INITIAL_S, self.restart_backoff_s * 2.0),
+                )
+                self.next_restart_at = time.monotonic() + self.restart_backoff_s
+                self.respawn_thread = None
+
+    def _spawn(self) -> None:
+        if self.channel is None:
+            self.channel = ControllerChannel(
+                self.channel_path,
+                self.metadata.execution.channel_bytes,
+                create=True,
+            )
+        self.process = subprocess.Popen(
+            [
+                sys.executable,
+                str(Path(__file__).resolve()),
+                CONTROLLER_WORKER_FLAG,
+                str(self.channel_path),
+                str(self.metadata.execution.channel_bytes),
+            ],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+        self.doorbells = queue.Queue()
+        threading.Thread(
+            target=self._read_doorbells,
+            args=(self.process, self.doorbells),
+            daemon=True,
+            name=f"controller-doorbell-{self.metadata.id}",
+        ).start()
+        init_body = json.dumps(
+            {
+                "controller": asdict(self.metadata),
+                "plant": serialize_plant_context(self.plant),
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
+        )
+        self._call(CONTROLLER_CHANNEL_INIT, init_body.encode("utf-8"), self.startup_timeout_s)
+
+    def _call(self, kind: int, body: bytes, timeout_s: float) -> Any:
+        process = self.process
+        if process is None or self.channel is None or process.stdin is None:
+            raise RuntimeError(f"Processo do controlador '{self.metadata.name}' não está ativo")
+
+        self.channel.write_request(kind, body)
+        try:
+            process.stdin.write(CONTROLLER_CHANNEL_DOORBELL)
+            process.stdin.flush()
+            answered = self.doorbells.get(timeout=max(0.0, timeout_s))
+        except queue.Empty:
+            self._terminate(kill=True)
+            raise RuntimeError(
+                f"Processo do controlador '{self.metadata.name}' excedeu o prazo de "
+                f"{timeout_s * 1000.0:.0f} ms e será reiniciado"
+            ) from None
+        except OSError:
+            answered = False
+
+        if not answered:
+            self._terminate(kill=True)
+            raise RuntimeError(
+                f"Processo do controlador '{self.metadata.name}' terminou "
+                f"(código {process.returncode}) e será reiniciado"
+            )
+
+        status, response = self.channel.read_response()
+        result = json.loads(response) if response else None
+        if status != CONTROLLER_CHANNEL_STATUS_OK:
+            raise RuntimeError(str(cast(Dict[str, Any], result).get("message", "erro desconhecido")))
+        return result
+
+    def _terminate(self, kill: bool = False) -> None:
+        process = self.process
+        if process is None:
+            return
+        self.process = None
+        if kill:
+            process.kill()
+        if process.stdin is not None:
+            try:
+                process.stdin.close()
+            except OSError:
+                pass
+        try:
+            process.wait(timeout=self.shutdown_timeout_s)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    @staticmethod
+    def _read_doorbells(process: "subprocess.Popen[bytes]", doorbells: "queue.Queue[bool]") -> None:
+        stdout = process.stdout
+        if stdout is None:
+            doorbells.put(False)
+            return
+        while stdout.read(1):
+            doorbells.put(True)
+        process.wait()
+        doorbells.put(False)
+
+
 class PlantRuntimeEngine:
     def __init__(self, bootstrap: RuntimeBootstrap) -> None:
         self.bootstrap = bootstrap
@@ -220,7 +1335,11 @@ class PlantRuntimeEngine:
         self.plant_id = bootstrap.plant.id
         self.sample_time_ms = bootstrap.runtime.timing.sample_time_ms
         self.driver_instance: Optional[DriverProtocol] = None
+        self.driver_io: Optional[DriverIoThread] = None
+        self.asyncio_bridge: Optional[AsyncioBridge] = None
+        self.asyncio_bridge_lock = threading.Lock()
         self.controllers: List[LoadedController] = []
+        self.controller_layers: List[List[int]] = []
         self.running = False
         self.paused = False
         self.should_exit = False
@@ -229,19 +1348,53 @@ class PlantRuntimeEngine:
         self.first_cycle_started_at: Optional[float] = None
         self.last_cycle_started_at: Optional[float] = None
         self.next_cycle_deadline: Optional[float] = None
+        self.data_ready = threading.Event()
+        self.cycle_wakeup: Optional[Callable[[], None]] = None
+        self.catch_up_cycles = 0
+        self.overrun_summary: Optional[OverrunSummary] = None
+        self.load_shed_level = 0
+        self.late_cycle_streak = 0
+        self.on_time_cycle_streak = 0
+        self.pending_sample_blocks: List[SampleBlock] = []
+        self.dropped_block_samples = 0
         self.paused_started_at: Optional[float] = None
         self.paused_duration_s = 0.0
         self.controller_reload_version = 0
         self.controller_reload_results: "queue.Queue[ControllerReloadResult]" = queue.Queue()
+        self.controller_snapshot_templates: Dict[str, Dict[str, Any]] = {}
+        self.readonly_snapshot_base: Optional[Dict[str, Any]] = None
+        self.array_setpoints: Any = None
+        self.array_variable_ids: tuple[tuple[str, ...], tuple[str, ...]] = ((), ())
+        self.telemetry_schema: Optional[TelemetrySchema] = None
+        self.published_telemetry_schema: Optional[TelemetrySchema] = None
+        self.telemetry_schema_version = 0
+        self.telemetry_publisher: Optional[TelemetryPublisher] = None
+        self.controller_pool: Optional[ThreadPoolExecutor] = None
+        self.controller_channel_ids = itertools.count(1)
+        self.telemetry_delta_encoder: Optional[TelemetryDeltaEncoder] = None
+        self.telemetry_ring: Optional[TelemetryRingWriter] = None
+        self.transport_stats_emitted_at: Optional[float] = None
+        self.last_publish_duration_ms = 0.0
+        self.telemetry_batch: List[Dict[str, Any]] = []
+        self.telemetry_batch_flushed_at: Optional[float] = None
 
     def apply_init(self, bootstrap: RuntimeBootstrap) -> None:
         self._clear_pending_controller_reload_results()
+        self._flush_overrun_summary()
+        self._flush_telemetry_batch()
+        self._close_telemetry_publisher()
+        self._close_telemetry_ring()
+        self._close_controller_pool()
+        self._close_driver_io()
+        self._close_asyncio_bridge()
         self.bootstrap = bootstrap
         self.runtime_id = bootstrap.runtime.id
         self.plant_id = bootstrap.plant.id
         self.sample_time_ms = bootstrap.runtime.timing.sample_time_ms
         self.driver_instance = None
+        self._stop_loaded_controllers(self.controllers)
         self.controllers = []
+        self.controller_layers = []
         self.running = False
         self.paused = False
         self.should_exit = False
@@ -250,9 +1403,21 @@ class PlantRuntimeEngine:
         self.first_cycle_started_at = None
         self.last_cycle_started_at = None
         self.next_cycle_deadline = None
+        self.data_ready.clear()
+        self.catch_up_cycles = 0
+        self.overrun_summary = None
+        self.load_shed_level = 0
+        self.late_cycle_streak = 0
+        self.on_time_cycle_streak = 0
+        self.pending_sample_blocks = []
+        self.dropped_block_samples = 0
         self.paused_started_at = None
         self.paused_duration_s = 0.0
         self.controller_reload_version = 0
+        self.published_telemetry_schema = None
+        self.telemetry_delta_encoder = None
+        self.last_publish_duration_ms = 0.0
+        self._invalidate_cycle_caches()
 
     def start(self) -> None:
         if self.driver_instance is None:
@@ -269,6 +1434,12 @@ class PlantRuntimeEngine:
                 driver_context,
                 "driver",
             )
+            bind_coroutine_methods(
+                self.driver_instance,
+                DRIVER_ASYNC_METHODS,
+                self._resolve_asyncio_bridge,
+                (DRIVER_WRITE_METHOD,),
+            )
 
             if self.bootstrap.controllers and not callable(
                 getattr(self.driver_instance, DRIVER_WRITE_METHOD, None)
@@ -276,6 +1447,7 @@ class PlantRuntimeEngine:
                 raise RuntimeError(
                     "Driver precisa implementar write(outputs) quando houver controladores ativos"
                 )
+            self._bind_driver_data_ready()
 
             try:
                 connected_result = self.driver_instance.connect()
@@ -289,7 +1461,9 @@ class PlantRuntimeEngine:
                 raise RuntimeError("Driver retornou False em connect()")
 
             self._replace_controllers(self.bootstrap.controllers)
+            self._ensure_driver_io()
 
+        self._ensure_telemetry_publisher()
         self.running = True
         self.paused = False
         now = time.monotonic()
@@ -299,8 +1473,128 @@ class PlantRuntimeEngine:
         self.next_cycle_deadline = now
         self.last_cycle_started_at = None
 
+    def _bind_driver_data_ready(self) -> None:
+        if self.bootstrap.runtime.timing.strategy != TIMING_STRATEGY_EVENT:
+            return
+        bind_data_ready = getattr(self.driver_instance, DRIVER_DATA_READY_METHOD, None)
+        if not callable(bind_data_ready):
+            emit(
+                "warning",
+                {
+                    "message": "Driver não implementa bind_data_ready(callback); "
+                    "timing.strategy 'event' executará ciclos apenas pelo timeout",
+                },
+            )
+            return
+        bind_data_ready(self.notify_data_ready)
+
+    def notify_data_ready(self) -> None:
+        if self.data_ready.is_set():
+            return
+        self.data_ready.set()
+        if self.cycle_wakeup is not None:
+            self.cycle_wakeup()
+
+    def _resolve_event_timeout_s(self) -> float:
+        timing = self.bootstrap.runtime.timing
+        return (timing.event_timeout_ms or self.sample_time_ms) / 1000.0
+
+    def _resolve_event_spacing_deadline(self) -> float:
+        if self.last_cycle_started_at is None:
+            return 0.0
+        return self.last_cycle_started_at + self.bootstrap.runtime.timing.event_min_spacing_ms / 1000.0
+
+    def _resolve_spin_window_s(self) -> float:
+        return self.bootstrap.runtime.timing.spin_window_ms / 1000.0
+
+    def _wait_for_cycle_trigger(self) -> Optional[str]:
+        if self.bootstrap.runtime.timing.strategy != TIMING_STRATEGY_EVENT:
+            wait_until_deadline(self.next_cycle_deadline, self._resolve_spin_window_s())
+            return None
+
+        remaining = self.next_cycle_deadline - time.monotonic()
+        if remaining > 0.0 and not self.data_ready.is_set():
+            self.data_ready.wait(remaining)
+        wait_until_deadline(self._resolve_event_spacing_deadline(), self._resolve_spin_window_s())
+        if self.data_ready.is_set():
+            self.data_ready.clear()
+            return CYCLE_TRIGGER_EVENT
+        return CYCLE_TRIGGER_TIMEOUT
+
+    def _ensure_telemetry_publisher(self) -> None:
+        telemetry = self.bootstrap.runtime.telemetry
+        if telemetry.publisher != TELEMETRY_PUBLISHER_THREAD or self.telemetry_publisher is not None:
+            return
+        self.telemetry_publisher = TelemetryPublisher(telemetry.queue_size, telemetry.overflow_policy)
+        self.telemetry_publisher.start()
+
+    def _close_telemetry_publisher(self) -> None:
+        if self.telemetry_publisher is None:
+            return
+        self.telemetry_publisher.close(
+            self.bootstrap.runtime.supervision.shutdown_timeout_ms / 1000.0
+        )
+        self.telemetry_publisher = None
+
+    def _ensure_controller_pool(self) -> Optional[ThreadPoolExecutor]:
+        execution = self.bootstrap.runtime.execution
+        if execution.controller_mode != CONTROLLER_MODE_PARALLEL or len(self.controllers) < 2:
+            return None
+        if self.controller_pool is None:
+            self.controller_pool = ThreadPoolExecutor(
+                max_workers=execution.max_workers or None,
+                thread_name_prefix="controller-worker",
+            )
+        return self.controller_pool
+
+    def _close_controller_pool(self) -> None:
+        if self.controller_pool is None:
+            return
+        self.controller_pool.shutdown(wait=True)
+        self.controller_pool = None
+
+    def _resolve_asyncio_bridge(self) -> AsyncioBridge:
+        with self.asyncio_bridge_lock:
+            if self.asyncio_bridge is None:
+                self.asyncio_bridge = AsyncioBridge(self.bootstrap.runtime.execution.async_timeout_ms)
+            return self.asyncio_bridge
+
+    def _close_asyncio_bridge(self) -> None:
+        with self.asyncio_bridge_lock:
+            bridge, self.asyncio_bridge = self.asyncio_bridge, None
+        if bridge is not None:
+            bridge.close(self.bootstrap.runtime.supervision.shutdown_timeout_ms / 1000.0)
+
+    def _ensure_driver_io(self) -> None:
+        execution = self.bootstrap.runtime.execution
+        if (
+            execution.driver_io != DRIVER_IO_THREAD
+            or self.driver_io is not None
+            or self.driver_instance is None
+        ):
+            return
+        self.driver_io = DriverIoThread(
+            self.driver_instance,
+            self.bootstrap.plant,
+            (execution.driver_poll_ms or self.sample_time_ms) / 1000.0,
+        )
+
+    def _close_driver_io(self) -> None:
+        if self.driver_io is None:
+            return
+        self.driver_io.close(self.bootstrap.runtime.supervision.shutdown_timeout_ms / 1000.0)
+        self.driver_io = None
+
+    def _close_telemetry_ring(self) -> None:
+        if self.telemetry_ring is None:
+            return
+        self.telemetry_ring.close()
+        self.telemetry_ring = None
+
     def _stop_loaded_controllers(self, controllers: List[LoadedController]) -> None:
         for controller in controllers:
+            if controller.watchdog is not None:
+                controller.watchdog.close()
             maybe_call_optional_stop(controller.instance, controller.metadata.name)
 
     def _clear_pending_controller_reload_results(self) -> None:
@@ -328,8 +1622,18 @@ class PlantRuntimeEngine:
         self,
         controllers: List[ControllerMetadata],
     ) -> List[LoadedController]:
+        period_cycles = [
+            resolve_controller_period_cycles(controller_meta, self.sample_time_ms)
+            for controller_meta in controllers
+        ]
+        layers, upstream_output_ids, cycle_warnings = build_controller_graph(controllers)
+        for message in cycle_warnings:
+            emit("warning", {"message": message})
         loaded: List[LoadedController] = []
         for controller_meta in controllers:
+            if controller_meta.execution.isolation == CONTROLLER_ISOLATION_PROCESS:
+                loaded.append(self._load_isolated_controller(controller_meta))
+                continue
             controller_cls = load_plugin_class(
                 Path(controller_meta.plugin_dir),
                 controller_meta.source_file,
@@ -346,16 +1650,57 @@ class PlantRuntimeEngine:
                 context,
                 f"controlador '{controller_meta.name}'",
             )
+            bind_coroutine_methods(instance, CONTROLLER_ASYNC_METHODS, self._resolve_asyncio_bridge)
             loaded.append(
                 LoadedController(
                     metadata=controller_meta,
                     public_metadata=build_public_controller_metadata(controller_meta).serialize(),
                     instance=cast(ControllerProtocol, instance),
+                    snapshot_mode=resolve_controller_snapshot_mode(
+                        self.bootstrap.runtime.execution.snapshot_mode,
+                        instance,
+                    ),
+                    mutable_snapshot=getattr(instance, CONTROLLER_MUTABLE_SNAPSHOT_ATTRIBUTE, False) is True,
+                    watchdog=build_controller_watchdog(controller_meta),
+                    array_api=supports_controller_array_api(instance),
+                    snapshot_variable_ids=resolve_snapshot_variable_ids(
+                        self.bootstrap.runtime.execution.snapshot_scope,
+                        controller_meta,
+                    ),
                 )
             )
             maybe_call_optional_connect(loaded[-1].instance, controller_meta.name)
+        for index, controller in enumerate(loaded):
+            controller.period_cycles = period_cycles[index]
+            controller.layer = layers[index]
+            controller.upstream_output_ids = upstream_output_ids[index]
+        assign_controller_phases(loaded)
         return loaded
 
+    def _load_isolated_controller(self, controller_meta: ControllerMetadata) -> LoadedController:
+        supervision = self.bootstrap.runtime.supervision
+        instance = IsolatedController(
+            controller_meta,
+            self.bootstrap.plant,
+            Path(self.bootstrap.runtime.paths.runtime_dir)
+            / CONTROLLER_CHANNELS_DIRNAME
+            / f"{controller_meta.id}-{next(self.controller_channel_ids)}.channel",
+            startup_timeout_s=supervision.startup_timeout_ms / 1000.0,
+            shutdown_timeout_s=supervision.shutdown_timeout_ms / 1000.0,
+        )
+        instance.start()
+        return LoadedController(
+            metadata=controller_meta,
+            public_metadata=build_public_controller_metadata(controller_meta).serialize(),
+            instance=cast(ControllerProtocol, instance),
+            snapshot_mode=SNAPSHOT_MODE_READONLY,
+            watchdog=build_controller_watchdog(controller_meta),
+            snapshot_variable_ids=resolve_snapshot_variable_ids(
+                self.bootstrap.runtime.execution.snapshot_scope,
+                controller_meta,
+            ),
+        )
+
     def _install_controllers(
         self,
         controllers: List[ControllerMetadata],
@@ -369,12 +1714,58 @@ class PlantRuntimeEngine:
             runtime=self.bootstrap.runtime,
         )
         self.controllers = loaded
+        self.controller_layers = group_controller_layers(loaded)
+        self._invalidate_cycle_caches()
+
+    def _invalidate_cycle_caches(self) -> None:
+        self.controller_snapshot_templates = {}
+        self.readonly_snapshot_base = None
+        self.array_setpoints = None
+        self.telemetry_schema = None
+        if self.telemetry_delta_encoder is not None:
+            self.telemetry_delta_encoder.deadbands = build_telemetry_deadbands(
+                self.bootstrap.plant,
+                self.bootstrap.runtime.telemetry.deadband_ratio,
+            )
+            self.telemetry_delta_encoder.request_keyframe()
+
+    def request_telemetry_keyframe(self) -> None:
+        if self.telemetry_delta_encoder is not None:
+            self.telemetry_delta_encoder.request_keyframe()
+
+    def _resolve_controller_snapshot_template(self, controller: LoadedController) -> Dict[str, Any]:
+        template = self.controller_snapshot_templates.get(controller.metadata.id)
+        if template is None:
+            if not controller.mutable_snapshot:
+                template = build_readonly_controller_snapshot_template(
+                    self._resolve_readonly_snapshot_base()
+                    if controller.snapshot_variable_ids is None
+                    else build_readonly_snapshot_base(self.bootstrap.plant, controller.snapshot_variable_ids),
+                    controller.public_metadata,
+                )
+            else:
+                template = build_controller_snapshot_template(
+                    self.bootstrap.plant,
+                    controller.public_metadata,
+                    controller.snapshot_variable_ids,
+                )
+            self.controller_snapshot_templates[controller.metadata.id] = template
+        return template
+
+    def _resolve_readonly_snapshot_base(self) -> Dict[str, Any]:
+        if self.readonly_snapshot_base is None:
+            self.readonly_snapshot_base = build_readonly_snapshot_base(self.bootstrap.plant)
+        return self.readonly_snapshot_base
 
     def pause(self) -> None:
+        self._flush_overrun_summary()
+        self._flush_telemetry_batch()
         if not self.paused:
             self.paused_started_at = time.monotonic()
         self.paused = True
         self.next_cycle_deadline = None
+        if self.driver_io is not None:
+            self.driver_io.discard_sample_blocks()
         self.last_cycle_started_at = None
 
     def resume(self) -> None:
@@ -386,10 +1777,13 @@ class PlantRuntimeEngine:
             self.paused_started_at = None
         self.paused = False
         self.next_cycle_deadline = time.monotonic() + (self.sample_time_ms / 1000.0)
+        if self.driver_io is not None:
+            self.driver_io.discard_sample_blocks()
         self.last_cycle_started_at = None
 
     def update_setpoints(self, setpoints: Dict[str, float]) -> None:
         self.bootstrap.plant.apply_setpoints(setpoints)
+        self._invalidate_cycle_caches()
 
     def update_controllers(self, controllers: List[ControllerMetadata]) -> None:
         if not self.running:
@@ -418,7 +1812,10 @@ class PlantRuntimeEngine:
             return None
         if self.next_cycle_deadline is None:
             return 0.0
-        return max(0.0, self.next_cycle_deadline - time.monotonic())
+        now = time.monotonic()
+        if self.bootstrap.runtime.timing.strategy == TIMING_STRATEGY_EVENT and self.data_ready.is_set():
+            return max(0.0, self._resolve_event_spacing_deadline() - now - self._resolve_spin_window_s())
+        return max(0.0, self.next_cycle_deadline - now - self._resolve_spin_window_s())
 
     def run_cycle(self) -> None:
         if not self.running or self.paused:
@@ -427,17 +1824,27 @@ class PlantRuntimeEngine:
         if self.next_cycle_deadline is None:
             self.next_cycle_deadline = time.monotonic()
 
-        now = time.monotonic()
-        if now < self.next_cycle_deadline:
-            time.sleep(self.next_cycle_deadline - now)
+        cycle_trigger = self._wait_for_cycle_trigger()
 
         cycle_started_at = time.monotonic()
+        start_jitter_ms = (
+            (cycle_started_at - self.next_cycle_deadline) * 1000.0
+            if cycle_trigger != CYCLE_TRIGGER_EVENT
+            else None
+        )
         self.cycle_id += 1
         if self.first_cycle_started_at is None:
             self.first_cycle_started_at = cycle_started_at
         effective_dt_ms = self._resolve_effective_dt_ms(cycle_started_at)
 
-        sensors, actuators_read, durations, controller_outputs, written_outputs = self._execute_cycle(
+        (
+            sensors,
+            actuators_read,
+            durations,
+            controller_outputs,
+            written_outputs,
+            sample_block,
+        ) = self._execute_cycle(
             cycle_started_at,
             effective_dt_ms,
         )
@@ -446,11 +1853,13 @@ class PlantRuntimeEngine:
         cycle_duration_ms = (cycle_finished_at - cycle_started_at) * 1000.0
 
         sample_step = self.sample_time_ms / 1000.0
-        planned_next_deadline = (self.next_cycle_deadline or cycle_started_at) + sample_step
+        if cycle_trigger is None:
+            planned_next_deadline = (self.next_cycle_deadline or cycle_started_at) + sample_step
+        else:
+            planned_next_deadline = cycle_started_at + sample_step
         late_by_ms = max(0.0, (cycle_finished_at - planned_next_deadline) * 1000.0)
         cycle_late = late_by_ms > 0.0
 
-        publish_started_at = time.monotonic()
         telemetry_payload = {
             "timestamp": time.time(),
             "cycle_id": self.cycle_id,
@@ -460,7 +1869,7 @@ class PlantRuntimeEngine:
             "read_duration_ms": durations.read_duration_ms,
             "control_duration_ms": durations.control_duration_ms,
             "write_duration_ms": durations.write_duration_ms,
-            "publish_duration_ms": max(0.0, (time.monotonic() - publish_started_at) * 1000.0),
+            "publish_duration_ms": self.last_publish_duration_ms,
             "cycle_late": cycle_late,
             "late_by_ms": late_by_ms,
             "phase": "publish_telemetry",
@@ -472,42 +1881,318 @@ class PlantRuntimeEngine:
             "controller_outputs": controller_outputs,
             "written_outputs": written_outputs,
             "controller_durations_ms": durations.controller_durations_ms,
+            "controller_compute_total_ms": durations.controller_compute_total_ms,
         }
-        emit("telemetry", telemetry_payload)
+        skip_optional = self.load_shed_level >= LOAD_SHED_SKIP_OPTIONAL
+        if not skip_optional:
+            controller_watchdogs = {
+                controller.metadata.id: controller.watchdog.stats()
+                for controller in self.controllers
+                if controller.watchdog is not None
+            }
+            if controller_watchdogs:
+                telemetry_payload["controller_watchdogs"] = controller_watchdogs
+        if start_jitter_ms is not None:
+            telemetry_payload["start_jitter_ms"] = start_jitter_ms
+        if cycle_trigger is not None:
+            telemetry_payload["cycle_trigger"] = cycle_trigger
+        if self.load_shed_level > 0:
+            telemetry_payload["load_shedding_level"] = self.load_shed_level
+        if not skip_optional:
+            if self.driver_io is not None:
+                telemetry_payload.update(self.driver_io.stats(cycle_started_at))
+            if self.telemetry_publisher is not None:
+                telemetry_payload.update(self.telemetry_publisher.stats())
+
+        publish_started_at = time.monotonic()
+        publish_telemetry = (
+            self.load_shed_level < LOAD_SHED_REDUCED_TELEMETRY
+            or self.cycle_id % self.bootstrap.runtime.load_shedding.telemetry_every_cycles == 0
+        )
+        self._queue_sample_block(sample_block, skip_optional)
+        if publish_telemetry:
+            self._attach_sample_blocks(telemetry_payload)
+            self._publish_telemetry(telemetry_payload)
+
+        if cycle_trigger is None:
+            skipped_deadlines = self._advance_cycle_deadline(planned_next_deadline)
+        else:
+            skipped_deadlines = 0
+            self.next_cycle_deadline = cycle_started_at + self._resolve_event_timeout_s()
 
         if cycle_late:
-            emit(
+            self._report_cycle_overrun(cycle_finished_at, cycle_duration_ms, late_by_ms, skipped_deadlines)
+        elif self.overrun_summary is not None:
+            self._flush_overrun_summary(cycle_finished_at)
+        self._update_load_shedding(cycle_late)
+        if not skip_optional:
+            self._publish_transport_stats(cycle_finished_at)
+        self.last_publish_duration_ms = max(0.0, (time.monotonic() - publish_started_at) * 1000.0)
+
+        self.last_cycle_started_at = cycle_started_at
+
+    def _advance_cycle_deadline(self, planned_next_deadline: float) -> int:
+        timing = self.bootstrap.runtime.timing
+        now = time.monotonic()
+        self.next_cycle_deadline = planned_next_deadline
+        if planned_next_deadline >= now:
+            self.catch_up_cycles = 0
+            return 0
+        if timing.catch_up == CATCH_UP_STRETCH:
+            self.next_cycle_deadline = now
+            return 0
+        if timing.catch_up == CATCH_UP_BURST and self.catch_up_cycles < timing.catch_up_max_cycles:
+            self.catch_up_cycles += 1
+            return 0
+
+        self.catch_up_cycles = 0
+        sample_step = self.sample_time_ms / 1000.0
+        skipped_deadlines = 0
+        while self.next_cycle_deadline < now:
+            self.next_cycle_deadline += sample_step
+            skipped_deadlines += 1
+        return skipped_deadlines
+
+    def _resolve_controller_period_multiplier(self, controller: LoadedController) -> int:
+        if (
+            self.load_shed_level < LOAD_SHED_THROTTLE_LOW_PRIORITY
+            or controller.metadata.execution.priority != CONTROLLER_PRIORITY_LOW
+        ):
+            return 1
+        return self.bootstrap.runtime.load_shedding.low_priority_period_multiplier
+
+    def _queue_sample_block(self, sample_block: Optional[SampleBlock], skip_optional: bool) -> None:
+        if sample_block is None:
+            return
+        if skip_optional:
+            self.dropped_block_samples += len(sample_block.timestamps)
+            return
+        self.pending_sample_blocks.append(sample_block)
+
+    def _attach_sample_blocks(self, telemetry_payload: Dict[str, Any]) -> None:
+        dropped_samples = self.dropped_block_samples
+        if self.driver_io is not None:
+            dropped_samples += self.driver_io.dropped_block_samples
+        if dropped_samples:
+            telemetry_payload["sample_block_dropped_samples"] = dropped_samples
+        sample_block = concat_sample_blocks(self.pending_sample_blocks)
+        if sample_block is None:
+            return
+        self.pending_sample_blocks = []
+        if self.bootstrap.runtime.telemetry.transport == TELEMETRY_TRANSPORT_SHM:
+            self._emit_cycle_message("sample_block", {"cycle_id": self.cycle_id, **sample_block.serialize()})
+            return
+        telemetry_payload["sample_block"] = sample_block.serialize()
+
+    def _update_load_shedding(self, cycle_late: bool) -> None:
+        load_shedding = self.bootstrap.runtime.load_shedding
+        if load_shedding.degrade_after_late_cycles == 0:
+            return
+        if cycle_late:
+            self.on_time_cycle_streak = 0
+            self.late_cycle_streak += 1
+            if (
+                self.late_cycle_streak >= load_shedding.degrade_after_late_cycles
+                and self.load_shed_level < len(LOAD_SHED_LEVEL_NAMES) - 1
+            ):
+                self.late_cycle_streak = 0
+                self._set_load_shed_level(self.load_shed_level + 1)
+            return
+
+        self.late_cycle_streak = 0
+        self.on_time_cycle_streak += 1
+        if self.on_time_cycle_streak >= load_shedding.recover_after_on_time_cycles and self.load_shed_level > 0:
+            self.on_time_cycle_streak = 0
+            self._set_load_shed_level(self.load_shed_level - 1)
+
+    def _set_load_shed_level(self, level: int) -> None:
+        previous_level, self.load_shed_level = self.load_shed_level, level
+        self._emit_cycle_message(
+            "load_shedding",
+            {
+                "cycle_id": self.cycle_id,
+                "level": level,
+                "name": LOAD_SHED_LEVEL_NAMES[level],
+                "previous_level": previous_level,
+            },
+        )
+
+    def _report_cycle_overrun(
+        self,
+        now: float,
+        cycle_duration_ms: float,
+        late_by_ms: float,
+        skipped_deadlines: int,
+    ) -> None:
+        if self.bootstrap.runtime.timing.overrun_report_interval_ms == 0:
+            self._emit_cycle_message(
                 "cycle_overrun",
                 {
                     "cycle_id": self.cycle_id,
                     "configured_sample_time_ms": self.sample_time_ms,
                     "cycle_duration_ms": cycle_duration_ms,
                     "late_by_ms": late_by_ms,
+                    "skipped_deadlines": skipped_deadlines,
                     "phase": "publish_telemetry",
                 },
             )
+            return
 
-        self.next_cycle_deadline = planned_next_deadline
-        while self.next_cycle_deadline < time.monotonic():
-            self.next_cycle_deadline += sample_step
+        if self.overrun_summary is None:
+            self.overrun_summary = OverrunSummary(started_at=now, first_cycle_id=self.cycle_id)
+        summary = self.overrun_summary
+        summary.last_cycle_id = self.cycle_id
+        summary.count += 1
+        summary.skipped_deadlines += skipped_deadlines
+        summary.worst_late_by_ms = max(summary.worst_late_by_ms, late_by_ms)
+        summary.worst_cycle_duration_ms = max(summary.worst_cycle_duration_ms, cycle_duration_ms)
+        self._flush_overrun_summary(now)
+
+    def _flush_overrun_summary(self, now: Optional[float] = None) -> None:
+        summary = self.overrun_summary
+        if summary is None:
+            return
+        if now is None:
+            now = time.monotonic()
+        elif now - summary.started_at < self.bootstrap.runtime.timing.overrun_report_interval_ms / 1000.0:
+            return
+        self.overrun_summary = None
+        self._emit_cycle_message("cycle_overrun_summary", summary.serialize(self.sample_time_ms, now))
+
+    def _publish_telemetry(self, telemetry_payload: Dict[str, Any]) -> None:
+        if self.bootstrap.runtime.telemetry.transport == TELEMETRY_TRANSPORT_SHM:
+            schema = self._resolve_telemetry_schema()
+            if self.telemetry_ring is not None:
+                self.telemetry_ring.write(encode_columnar_telemetry(telemetry_payload, schema))
+            return
 
-        self.last_cycle_started_at = cycle_started_at
+        if self.bootstrap.runtime.telemetry.encoding == TELEMETRY_ENCODING_DELTA:
+            telemetry_payload = self._resolve_telemetry_delta_encoder().encode(telemetry_payload)
+        if self.bootstrap.runtime.telemetry.layout == TELEMETRY_LAYOUT_COLUMNAR:
+            schema = self._resolve_telemetry_schema()
+            telemetry_payload = encode_columnar_telemetry(telemetry_payload, schema)
+
+        if not self._telemetry_batching_enabled():
+            self._emit_cycle_message("telemetry", telemetry_payload)
+            return
+
+        now = time.monotonic()
+        if not self.telemetry_batch:
+            self.telemetry_batch_flushed_at = self.telemetry_batch_flushed_at or now
+        self.telemetry_batch.append(telemetry_payload)
+        if self._telemetry_batch_due(now):
+            self._flush_telemetry_batch()
+
+    def _resolve_telemetry_delta_encoder(self) -> TelemetryDeltaEncoder:
+        if self.telemetry_delta_encoder is None:
+            telemetry = self.bootstrap.runtime.telemetry
+            self.telemetry_delta_encoder = TelemetryDeltaEncoder(
+                telemetry.keyframe_interval,
+                build_telemetry_deadbands(self.bootstrap.plant, telemetry.deadband_ratio),
+            )
+        return self.telemetry_delta_encoder
+
+    def _telemetry_batching_enabled(self) -> bool:
+        timing = self.bootstrap.runtime.timing
+        return timing.publish_every_cycles > 1 or timing.publish_max_rate_hz > 0.0
+
+    def _telemetry_batch_due(self, now: float) -> bool:
+        timing = self.bootstrap.runtime.timing
+        if timing.publish_every_cycles > 1 and len(self.telemetry_batch) >= timing.publish_every_cycles:
+            return True
+        if timing.publish_max_rate_hz > 0.0:
+            flushed_at = self.telemetry_batch_flushed_at or now
+            return now - flushed_at >= 1.0 / timing.publish_max_rate_hz
+        return False
+
+    def _flush_telemetry_batch(self) -> None:
+        if not self.telemetry_batch:
+            return
+        samples = self.telemetry_batch
+        self.telemetry_batch = []
+        self.telemetry_batch_flushed_at = time.monotonic()
+        self._emit_cycle_message("telemetry_batch", {"count": len(samples), "samples": samples})
+
+    def _publish_transport_stats(self, now: float) -> None:
+        protocol = self.bootstrap.runtime.protocol
+        if protocol.write_mode != PROTOCOL_WRITE_MODE_NONBLOCKING:
+            return
+        if self.telemetry_publisher is None:
+            drain_protocol_output()
+        if self.transport_stats_emitted_at is None:
+            self.transport_stats_emitted_at = now
+            return
+        if (now - self.transport_stats_emitted_at) * 1000.0 < protocol.stats_interval_ms:
+            return
+        self.transport_stats_emitted_at = now
+        with PROTOCOL_STDOUT_LOCK:
+            stats = PROTOCOL_WRITER.stats()
+        self._emit_cycle_message("transport_stats", stats)
+
+    def _emit_cycle_message(self, msg_type: str, payload: Dict[str, Any]) -> None:
+        if self.telemetry_publisher is not None:
+            self.telemetry_publisher.publish(msg_type, payload)
+            return
+        emit(msg_type, payload)
+
+    def _resolve_telemetry_schema(self) -> TelemetrySchema:
+        if self.telemetry_schema is not None:
+            return self.telemetry_schema
+
+        columns = build_telemetry_columns(self.bootstrap.plant, self.bootstrap.controllers)
+        published = self.published_telemetry_schema
+        if published is not None and published.columns == columns:
+            self.telemetry_schema = published
+            return published
+
+        self._flush_telemetry_batch()
+        self.telemetry_schema_version += 1
+        schema = TelemetrySchema(version=self.telemetry_schema_version, columns=columns)
+        schema_payload = schema.serialize()
+        if self.bootstrap.runtime.telemetry.transport == TELEMETRY_TRANSPORT_SHM:
+            schema_payload.update(self._open_telemetry_ring(schema).describe())
+        self._emit_cycle_message("telemetry_schema", schema_payload)
+        self.telemetry_schema = schema
+        self.published_telemetry_schema = schema
+        return schema
+
+    def _open_telemetry_ring(self, schema: TelemetrySchema) -> TelemetryRingWriter:
+        self._close_telemetry_ring()
+        self.telemetry_ring = TelemetryRingWriter(
+            Path(self.bootstrap.runtime.paths.runtime_dir) / TELEMETRY_RING_FILENAME,
+            self.bootstrap.runtime.telemetry.ring_slots,
+            schema,
+        )
+        return self.telemetry_ring
 
     def _execute_cycle(
         self,
         cycle_started_at: float,
         effective_dt_ms: float,
-    ) -> tuple[SensorPayload, ActuatorPayload, CycleDurations, ControllerOutputPayload, ActuatorPayload]:
+    ) -> tuple[
+        SensorPayload,
+        ActuatorPayload,
+        CycleDurations,
+        ControllerOutputPayload,
+        ActuatorPayload,
+        Optional[SampleBlock],
+    ]:
         sensors: SensorPayload = {}
         actuators_read: ActuatorPayload = {}
+        sample_block: Optional[SampleBlock] = None
         controller_outputs: ControllerOutputPayload = {}
         written_outputs: ActuatorPayload = {}
         controller_durations: Dict[str, float] = {}
 
         read_started_at = time.monotonic()
         try:
-            if self.driver_instance is not None:
-                sensors, actuators_read = normalize_read_snapshot(
+            if self.driver_io is not None:
+                sample = self.driver_io.latest()
+                if sample is not None:
+                    sensors, actuators_read = sample.sensors, sample.actuators
+                sample_block = concat_sample_blocks(self.driver_io.drain_sample_blocks())
+            elif self.driver_instance is not None:
+                sensors, actuators_read, sample_block = normalize_read_snapshot(
                     self.driver_instance.read(),
                     self.bootstrap.plant,
                 )
@@ -517,45 +2202,71 @@ class PlantRuntimeEngine:
         read_duration_ms = (time.monotonic() - read_started_at) * 1000.0
 
         control_started_at = time.monotonic()
-        for controller in self.controllers:
-            compute_started_at = time.monotonic()
-            try:
-                snapshot = build_controller_snapshot(
-                    cycle_id=self.cycle_id,
-                    cycle_started_at=cycle_started_at,
-                    dt_ms=effective_dt_ms,
-                    plant=self.bootstrap.plant,
-                    controller_public_metadata=controller.public_metadata,
-                    sensors=sensors,
-                    actuators=actuators_read,
-                )
-                outputs = normalize_controller_outputs(
-                    controller.instance.compute(snapshot),
-                    controller.metadata.output_variable_ids,
-                    controller.metadata.name,
-                )
-                for variable_id, value in outputs.items():
-                    if variable_id in controller_outputs:
-                        raise RuntimeError(
-                            f"Saída '{variable_id}' recebeu mais de um valor no mesmo ciclo"
-                        )
-                    controller_outputs[variable_id] = value
-            except Exception as exc:  # noqa: BLE001
-                log_error(traceback.format_exc())
-                emit(
-                    "warning",
-                    {
-                        "message": f"Falha no controlador '{controller.metadata.name}': {exc}",
-                    },
+        sensors_view = MappingProxyType(sensors)
+        actuators_view = MappingProxyType(actuators_read)
+
+        array_inputs = (
+            self._build_array_inputs(sensors, actuators_read)
+            if any(controller.array_api for controller in self.controllers)
+            else {}
+        )
+
+        due_dt_ms: Dict[int, float] = {}
+        for index, controller in enumerate(self.controllers):
+            controller_dt_ms = advance_controller_schedule(
+                controller,
+                effective_dt_ms,
+                self._resolve_controller_period_multiplier(controller),
+            )
+            if controller_dt_ms is not None:
+                due_dt_ms[index] = controller_dt_ms
+
+        def snapshot_factory(index: int, controller: LoadedController) -> Callable[[], Mapping[str, Any]]:
+            if controller.array_api:
+                return lambda: self._fill_array_snapshot(
+                    controller,
+                    cycle_started_at,
+                    due_dt_ms[index],
+                    array_inputs,
+                    controller_outputs,
                 )
-            finally:
-                controller_durations[controller.metadata.id] = (
-                    time.monotonic() - compute_started_at
-                ) * 1000.0
+            return lambda: self._fill_cycle_snapshot(
+                controller,
+                cycle_started_at,
+                due_dt_ms[index],
+                sensors,
+                actuators_read,
+                sensors_view,
+                actuators_view,
+                controller_outputs,
+            )
+
+        for controller in self.controllers:
+            self._resolve_controller_snapshot_template(controller)
+
+        for layer in self.controller_layers:
+            self._run_controller_layer(
+                layer,
+                due_dt_ms,
+                snapshot_factory,
+                controller_outputs,
+                controller_durations,
+            )
         control_duration_ms = (time.monotonic() - control_started_at) * 1000.0
 
         write_started_at = time.monotonic()
-        if controller_outputs and self.driver_instance is not None:
+        if controller_outputs and self.driver_io is not None:
+            written_outputs = dict(controller_outputs)
+            self.driver_io.submit_write(written_outputs)
+        elif controller_outputs and isinstance(
+            getattr(self.driver_instance, DRIVER_WRITE_METHOD, None),
+            OverlappedAsyncWrite,
+        ):
+            written_outputs = dict(controller_outputs)
+            self._report_async_write(
+                cast(OverlappedAsyncWrite, self.driver_instance.write).submit(written_outputs, self.cycle_id)
+            )
+        elif controller_outputs and self.driver_instance is not None:
             try:
                 write_status = self.driver_instance.write(dict(controller_outputs))
                 coerce_optional_bool(
@@ -577,9 +2288,197 @@ class PlantRuntimeEngine:
                 control_duration_ms=control_duration_ms,
                 write_duration_ms=write_duration_ms,
                 controller_durations_ms=controller_durations,
+                controller_compute_total_ms=sum(controller_durations.values()),
             ),
             controller_outputs,
             written_outputs,
+            sample_block,
+        )
+
+    def _report_async_write(self, settled: Optional[AsyncWriteResult]) -> None:
+        if settled is None:
+            return
+        if settled.error is not None:
+            log_error(settled.error_traceback)
+            message = f"Falha em escrita de driver do ciclo {settled.cycle_id}: {settled.error}"
+        elif settled.result is None or settled.result is True:
+            return
+        elif settled.result is False:
+            message = f"Driver retornou False em write(outputs) do ciclo {settled.cycle_id}"
+        else:
+            message = (
+                f"Falha em escrita de driver do ciclo {settled.cycle_id}: método 'write' deve retornar "
+                f"bool ou None, recebeu {type(settled.result).__name__}"
+            )
+        emit("warning", {"message": message, "cycle_id": settled.cycle_id, "outputs": settled.outputs})
+
+    def _run_controller_layer(
+        self,
+        layer: List[int],
+        due_dt_ms: Dict[int, float],
+        snapshot_factory: Callable[[int, LoadedController], Callable[[], Mapping[str, Any]]],
+        controller_outputs: ControllerOutputPayload,
+        controller_durations: Dict[str, float],
+    ) -> None:
+        due_controllers = [(index, self.controllers[index]) for index in layer if index in due_dt_ms]
+        watched_submissions = {
+            index: controller.watchdog.submit(
+                partial(compute_controller_outputs, controller, snapshot_factory(index, controller))
+            )
+            for index, controller in due_controllers
+            if controller.watchdog is not None
+        }
+        unwatched = [(index, controller) for index, controller in due_controllers if controller.watchdog is None]
+        results: Dict[int, ControllerComputeResult] = {}
+        controller_pool = self._ensure_controller_pool() if len(unwatched) > 1 else None
+        if controller_pool is None:
+            for index, controller in unwatched:
+                results[index] = compute_controller_outputs(controller, snapshot_factory(index, controller))
+        else:
+            futures = {
+                index: controller_pool.submit(
+                    compute_controller_outputs,
+                    controller,
+                    snapshot_factory(index, controller),
+                )
+                for index, controller in unwatched
+            }
+            results.update((index, future.result()) for index, future in futures.items())
+        for index, submitted in watched_submissions.items():
+            results[index] = cast(ControllerWatchdog, self.controllers[index].watchdog).collect(submitted)
+
+        for index in layer:
+            controller = self.controllers[index]
+            result = results.get(index)
+            if result is None:
+                result = ControllerComputeResult(outputs=controller.held_outputs, duration_ms=0.0)
+            else:
+                controller_durations[controller.metadata.id] = result.duration_ms
+                if result.error is None:
+                    controller.held_outputs = result.outputs
+            self._merge_controller_outputs(controller, result, controller_outputs)
+
+    def _fill_cycle_snapshot(
+        self,
+        controller: LoadedController,
+        cycle_started_at: float,
+        effective_dt_ms: float,
+        sensors: SensorPayload,
+        actuators_read: ActuatorPayload,
+        sensors_view: Mapping[str, float],
+        actuators_view: Mapping[str, float],
+        controller_outputs: ControllerOutputPayload,
+    ) -> Mapping[str, Any]:
+        if controller.snapshot_variable_ids is not None:
+            sensors = project_variable_values(sensors, controller.snapshot_variable_ids)
+            actuators_read = project_variable_values(actuators_read, controller.snapshot_variable_ids)
+            sensors_view = MappingProxyType(sensors)
+            actuators_view = MappingProxyType(actuators_read)
+        if controller.snapshot_mode == SNAPSHOT_MODE_READONLY:
+            snapshot = fill_readonly_controller_snapshot(
+                self._resolve_controller_snapshot_template(controller),
+                cycle_id=self.cycle_id,
+                cycle_started_at=cycle_started_at,
+                dt_ms=effective_dt_ms,
+                sensors=sensors_view,
+                actuators=actuators_view,
+            )
+            if not controller.upstream_output_ids:
+                return snapshot
+            return MappingProxyType(
+                {
+                    **snapshot,
+                    "upstream_outputs": MappingProxyType(
+                        project_variable_values(controller_outputs, controller.upstream_output_ids)
+                    ),
+                }
+            )
+        mutable_snapshot = fill_controller_snapshot(
+            self._resolve_controller_snapshot_template(controller),
+            cycle_id=self.cycle_id,
+            cycle_started_at=cycle_started_at,
+            dt_ms=effective_dt_ms,
+            sensors=sensors,
+            actuators=actuators_read,
+            clone_static=controller.mutable_snapshot,
+        )
+        if controller.upstream_output_ids:
+            mutable_snapshot["upstream_outputs"] = project_variable_values(
+                controller_outputs,
+                controller.upstream_output_ids,
+            )
+        return mutable_snapshot
+
+    def _build_array_inputs(self, sensors: SensorPayload, actuators_read: ActuatorPayload) -> Dict[str, Any]:
+        plant = self.bootstrap.plant
+        if self.array_setpoints is None:
+            self.array_setpoints = build_readonly_array(
+                [plant.setpoints.get(variable_id, math.nan) for variable_id in plant.sensors.ids]
+            )
+            self.array_variable_ids = (tuple(plant.sensors.ids), tuple(plant.actuators.ids))
+        return {
+            "sensors": build_readonly_array(
+                [sensors.get(variable_id, math.nan) for variable_id in plant.sensors.ids]
+            ),
+            "actuators": build_readonly_array(
+                [actuators_read.get(variable_id, math.nan) for variable_id in plant.actuators.ids]
+            ),
+            "setpoints": self.array_setpoints,
+        }
+
+    def _fill_array_snapshot(
+        self,
+        controller: LoadedController,
+        cycle_started_at: float,
+        effective_dt_ms: float,
+        array_inputs: Dict[str, Any],
+        controller_outputs: ControllerOutputPayload,
+    ) -> Mapping[str, Any]:
+        snapshot = {
+            "cycle_id": self.cycle_id,
+            "timestamp": cycle_started_at,
+            "dt_s": max(0.0, effective_dt_ms / 1000.0),
+            "sensor_ids": self.array_variable_ids[0],
+            "actuator_ids": self.array_variable_ids[1],
+            "output_ids": tuple(controller.metadata.output_variable_ids),
+            "sensors": array_inputs["sensors"],
+            "actuators": array_inputs["actuators"],
+            "setpoints": array_inputs["setpoints"],
+            "controller": self._resolve_controller_snapshot_template(controller)["controller"],
+        }
+        if controller.upstream_output_ids:
+            snapshot["upstream_outputs"] = MappingProxyType(
+                project_variable_values(controller_outputs, controller.upstream_output_ids)
+            )
+        return MappingProxyType(snapshot)
+
+    def _merge_controller_outputs(
+        self,
+        controller: LoadedController,
+        result: ControllerComputeResult,
+        controller_outputs: ControllerOutputPayload,
+    ) -> None:
+        error = result.error
+        error_traceback = result.error_traceback
+        if error is None:
+            try:
+                for variable_id, value in result.outputs.items():
+                    if variable_id in controller_outputs:
+                        raise RuntimeError(
+                            f"Saída '{variable_id}' recebeu mais de um valor no mesmo ciclo"
+                        )
+                    controller_outputs[variable_id] = value
+                return
+            except Exception as exc:  # noqa: BLE001
+                error = exc
+                error_traceback = traceback.format_exc()
+
+        log_error(error_traceback)
+        emit(
+            "warning",
+            {
+                "message": f"Falha no controlador '{controller.metadata.name}': {error}",
+            },
         )
 
     def _resolve_effective_dt_ms(self, cycle_started_at: float) -> float:
@@ -595,16 +2494,26 @@ class PlantRuntimeEngine:
 
     def stop(self) -> None:
         self._clear_pending_controller_reload_results()
-        for controller in self.controllers:
-            maybe_call_optional_stop(controller.instance, controller.metadata.name)
+        self._flush_overrun_summary()
+        self._flush_telemetry_batch()
+        self._close_telemetry_publisher()
+        self._close_telemetry_ring()
+        self._close_controller_pool()
+        self._stop_loaded_controllers(self.controllers)
         self.controllers = []
+        self.controller_layers = []
+        self._close_driver_io()
         if self.driver_instance is not None:
+            write = getattr(self.driver_instance, DRIVER_WRITE_METHOD, None)
+            if isinstance(write, OverlappedAsyncWrite):
+                self._report_async_write(write.settle_result())
             try:
                 stopped = coerce_required_bool("stop", self.driver_instance.stop())
                 if not stopped:
                     emit("warning", {"message": "Driver retornou False em stop()"})
             except Exception as exc:  # noqa: BLE001
                 log_error(f"Falha ao finalizar driver: {exc}")
+        self._close_asyncio_bridge()
 
     def apply_pending_controller_reload(self) -> None:
         while True:
@@ -655,6 +2564,10 @@ class PlantRuntimeEngine:
             )
 
 
+def _align8(value: int) -> int:
+    return (value + 7) & ~7
+
+
 def _require_stream_fd(stream: Any, name: str) -> int:
     if stream is None or not hasattr(stream, "fileno"):
         raise RuntimeError(f"{name} não expõe um descritor de arquivo")
@@ -730,26 +2643,296 @@ def _resolve_protocol_stdout_fd() -> int:
     return _require_stream_fd(sys.__stdout__, "stdout")
 
 
-def emit(msg_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
-    envelope: Dict[str, Any] = {"type": msg_type}
-    if payload is not None:
-        envelope["payload"] = payload
-    data = (
-        json.dumps(envelope, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
-        + b"\n"
-    )
-    protocol_stdout_fd = _resolve_protocol_stdout_fd()
-    total_written = 0
+class ProtocolWriter:
+    def __init__(self) -> None:
+        self.nonblocking = False
+        self.max_pending_bytes = RuntimeProtocol.max_pending_bytes
+        self.pending = bytearray()
+        self.bytes_written = 0
+        self.bytes_dropped = 0
+        self.frames_dropped = 0
+        self.max_pending_bytes_seen = 0
+        self.blocked_time_s = 0.0
 
-    with PROTOCOL_STDOUT_LOCK:
+    def configure_nonblocking(self, fd: int, max_pending_bytes: int) -> bool:
+        try:
+            os.set_blocking(fd, False)
+        except (AttributeError, OSError) as exc:
+            log_error(f"Aviso: stdout do protocolo continuará bloqueante: {exc}")
+            return False
+        self.nonblocking = True
+        self.max_pending_bytes = max_pending_bytes
+        return True
+
+    def write(self, fd: int, data: bytes, droppable: bool) -> None:
+        if not self.nonblocking:
+            self._write_all(fd, data)
+            return
+
+        self.drain(fd)
+        if self.pending:
+            if droppable and len(self.pending) + len(data) > self.max_pending_bytes:
+                self._drop(data)
+                return
+            self._enqueue(data)
+        else:
+            written = self._write_some(fd, data)
+            if written < len(data):
+                if written == 0 and droppable and len(data) > self.max_pending_bytes:
+                    self._drop(data)
+                    return
+                self._enqueue(data[written:])
+
+        if len(self.pending) > self.max_pending_bytes:
+            self.flush(fd)
+
+    def drain(self, fd: int) -> None:
+        while self.pending:
+            written = self._write_some(fd, self.pending)
+            if written <= 0:
+                return
+            del self.pending[:written]
+
+    def flush(self, fd: int) -> None:
+        if not self.pending:
+            return
+        blocked_started_at = time.monotonic()
+        while self.pending:
+            written = self._write_some(fd, self.pending)
+            if written > 0:
+                del self.pending[:written]
+                continue
+            _wait_until_writable(fd, 0.05)
+        self.blocked_time_s += time.monotonic() - blocked_started_at
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "bytes_written": self.bytes_written,
+            "bytes_dropped": self.bytes_dropped,
+            "frames_dropped": self.frames_dropped,
+            "pending_bytes": len(self.pending),
+            "max_pending_bytes_seen": self.max_pending_bytes_seen,
+            "blocked_time_ms": self.blocked_time_s * 1000.0,
+        }
+
+    def _enqueue(self, data: bytes) -> None:
+        self.pending += data
+        self.max_pending_bytes_seen = max(self.max_pending_bytes_seen, len(self.pending))
+
+    def _drop(self, data: bytes) -> None:
+        self.bytes_dropped += len(data)
+        self.frames_dropped += 1
+
+    def _write_some(self, fd: int, data: bytes | bytearray) -> int:
+        try:
+            written = os.write(fd, data)
+        except (BlockingIOError, InterruptedError):
+            return 0
+        if written <= 0:
+            raise RuntimeError("Falha ao escrever envelope no stdout do protocolo")
+        self.bytes_written += written
+        return written
+
+    def _write_all(self, fd: int, data: bytes) -> None:
+        total_written = 0
         while total_written < len(data):
             try:
-                written = os.write(protocol_stdout_fd, data[total_written:])
+                written = os.write(fd, data[total_written:])
             except InterruptedError:
                 continue
             if written <= 0:
                 raise RuntimeError("Falha ao escrever envelope no stdout do protocolo")
             total_written += written
+        self.bytes_written += total_written
+
+
+PROTOCOL_WRITER = ProtocolWriter()
+
+
+def _wait_until_writable(fd: int, timeout_s: float) -> None:
+    try:
+        select.select([], [fd], [], max(0.0, timeout_s))
+    except (OSError, ValueError):
+        time.sleep(min(max(0.0, timeout_s), 0.001))
+
+
+def configure_protocol_writer(write_mode: str, max_pending_bytes: int) -> None:
+    if write_mode != PROTOCOL_WRITE_MODE_NONBLOCKING:
+        return
+    with PROTOCOL_STDOUT_LOCK:
+        PROTOCOL_WRITER.configure_nonblocking(_resolve_protocol_stdout_fd(), max_pending_bytes)
+
+
+def drain_protocol_output(timeout_s: float = 0.0) -> bool:
+    if not PROTOCOL_WRITER.nonblocking:
+        return False
+    protocol_stdout_fd = _resolve_protocol_stdout_fd()
+    with PROTOCOL_STDOUT_LOCK:
+        PROTOCOL_WRITER.drain(protocol_stdout_fd)
+        if not PROTOCOL_WRITER.pending or timeout_s <= 0.0:
+            return bool(PROTOCOL_WRITER.pending)
+
+    _wait_until_writable(protocol_stdout_fd, timeout_s)
+    with PROTOCOL_STDOUT_LOCK:
+        PROTOCOL_WRITER.drain(protocol_stdout_fd)
+        return bool(PROTOCOL_WRITER.pending)
+
+
+def flush_protocol_output() -> None:
+    with PROTOCOL_STDOUT_LOCK:
+        PROTOCOL_WRITER.flush(_resolve_protocol_stdout_fd())
+
+
+def configure_protocol_framing(framing: str) -> None:
+    global PROTOCOL_FRAMING
+
+    PROTOCOL_FRAMING = framing
+
+
+class ProtocolSerializer:
+    def __init__(
+        self,
+        name: str,
+        dumps: Callable[[Any], bytes],
+        loads: Callable[[str | bytes], Any],
+    ) -> None:
+        self.name = name
+        self._dumps = dumps
+        self.loads = loads
+
+    def dumps(self, value: Any) -> bytes:
+        try:
+            return self._dumps(value)
+        except (TypeError, ValueError, OverflowError):
+            return _stdlib_json_dumps(value)
+
+
+def _stdlib_json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _build_optional_protocol_serializer(name: str) -> Optional[ProtocolSerializer]:
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        return None
+
+    if name == PROTOCOL_SERIALIZER_ORJSON:
+        return ProtocolSerializer(name, module.dumps, module.loads)
+
+    def _ujson_dumps(value: Any) -> bytes:
+        return cast(
+            str,
+            module.dumps(value, ensure_ascii=False, escape_forward_slashes=False),
+        ).encode("utf-8")
+
+    return ProtocolSerializer(name, _ujson_dumps, module.loads)
+
+
+def resolve_protocol_serializer(name: str) -> ProtocolSerializer:
+    if name == PROTOCOL_SERIALIZER_AUTO:
+        candidates = [PROTOCOL_SERIALIZER_ORJSON, PROTOCOL_SERIALIZER_UJSON]
+    elif name == PROTOCOL_SERIALIZER_STDLIB:
+        candidates = []
+    else:
+        candidates = [name]
+
+    for candidate in candidates:
+        serializer = _build_optional_protocol_serializer(candidate)
+        if serializer is not None:
+            return serializer
+        if name != PROTOCOL_SERIALIZER_AUTO:
+            log_error(f"Aviso: serializador '{candidate}' indisponível; usando json da biblioteca padrão")
+    return ProtocolSerializer(PROTOCOL_SERIALIZER_STDLIB, _stdlib_json_dumps, json.loads)
+
+
+PROTOCOL_SERIALIZER = ProtocolSerializer(PROTOCOL_SERIALIZER_STDLIB, _stdlib_json_dumps, json.loads)
+
+
+def configure_protocol_serializer(name: str) -> str:
+    global PROTOCOL_SERIALIZER
+
+    PROTOCOL_SERIALIZER = resolve_protocol_serializer(name)
+    return PROTOCOL_SERIALIZER.name
+
+
+def encode_binary_frame(kind: int, body: bytes) -> bytes:
+    return BINARY_FRAME_HEADER.pack(BINARY_FRAME_MAGIC, PROTOCOL_VERSION, kind, len(body)) + body
+
+
+def encode_binary_telemetry_frame(envelope: Dict[str, Any]) -> bytes:
+    payload = cast(Dict[str, Any], envelope["payload"])
+    is_batch = envelope["type"] == "telemetry_batch"
+    samples = cast(List[Dict[str, Any]], payload["samples"]) if is_batch else [payload]
+
+    values: List[float] = []
+    header_samples: List[Dict[str, Any]] = []
+    for sample in samples:
+        header_sample = dict(sample)
+        for field_name in TELEMETRY_VALUE_FIELDS:
+            column = sample.get(field_name)
+            if isinstance(column, list):
+                values.extend(float("nan") if value is None else value for value in column)
+                del header_sample[field_name]
+        header_samples.append(header_sample)
+
+    header_payload = {**payload, "samples": header_samples} if is_batch else header_samples[0]
+    header = PROTOCOL_SERIALIZER.dumps({"type": envelope["type"], "payload": header_payload})
+    body = (
+        BINARY_TELEMETRY_LENGTH.pack(len(header))
+        + header
+        + struct.pack(f"<{len(values)}d", *values)
+    )
+    return encode_binary_frame(BINARY_FRAME_KIND_TELEMETRY, body)
+
+
+def encode_envelope(msg_type: str, payload: Optional[Dict[str, Any]] = None) -> bytes:
+    envelope: Dict[str, Any] = {"type": msg_type}
+    if payload is not None:
+        envelope["payload"] = payload
+
+    if PROTOCOL_FRAMING == PROTOCOL_FRAMING_BINARY:
+        if msg_type in BINARY_TELEMETRY_MESSAGES and payload is not None:
+            return encode_binary_telemetry_frame(envelope)
+        return encode_binary_frame(BINARY_FRAME_KIND_JSON, PROTOCOL_SERIALIZER.dumps(envelope))
+
+    return PROTOCOL_SERIALIZER.dumps(envelope) + b"\n"
+
+
+def read_binary_frame(stream: BinaryIO) -> Optional[Tuple[int, bytes]]:
+    header = stream.read(BINARY_FRAME_HEADER.size)
+    if not header:
+        return None
+    if len(header) < BINARY_FRAME_HEADER.size:
+        raise RuntimeError("Frame binário truncado no cabeçalho")
+
+    magic, version, kind, length = BINARY_FRAME_HEADER.unpack(header)
+    if magic != BINARY_FRAME_MAGIC or version != PROTOCOL_VERSION:
+        raise RuntimeError("Cabeçalho de frame binário inválido")
+
+    body = stream.read(length)
+    if len(body) < length:
+        raise RuntimeError("Frame binário truncado no corpo")
+    return kind, body
+
+
+def iter_binary_json_frames(stream: BinaryIO) -> Iterator[bytes]:
+    while True:
+        frame = read_binary_frame(stream)
+        if frame is None:
+            return
+        kind, body = frame
+        if kind != BINARY_FRAME_KIND_JSON:
+            raise RuntimeError(f"Tipo de frame binário não suportado em comandos: {kind}")
+        yield body
+
+
+def emit(msg_type: str, payload: Optional[Dict[str, Any]] = None) -> None:
+    data = encode_envelope(msg_type, payload)
+    protocol_stdout_fd = _resolve_protocol_stdout_fd()
+
+    with PROTOCOL_STDOUT_LOCK:
+        PROTOCOL_WRITER.write(protocol_stdout_fd, data, msg_type in DROPPABLE_PROTOCOL_MESSAGES)
 
 
 def log_error(message: str) -> None:
@@ -797,6 +2980,34 @@ def normalize_positive_int(raw_value: Any, context: str, default: int = 1) -> in
     return resolved
 
 
+def normalize_non_negative_float(raw_value: Any, context: str, default: float = 0.0) -> float:
+    if raw_value is None:
+        return default
+    try:
+        resolved = float(raw_value)
+    except Exception as exc:  # noqa: BLE001
+        raise RuntimeError(f"{context} deve ser numérico") from exc
+    if resolved != resolved or resolved in (float("inf"), float("-inf")):
+        raise RuntimeError(f"{context} deve ser finito")
+    if resolved < 0.0:
+        raise RuntimeError(f"{context} não pode ser negativo")
+    return resolved
+
+
+def normalize_choice(
+    raw_value: Any,
+    context: str,
+    choices: tuple[str, ...],
+    default: str,
+) -> str:
+    if raw_value is None:
+        return default
+    resolved = normalize_string(raw_value, context)
+    if resolved not in choices:
+        raise RuntimeError(f"{context} deve ser um de: {', '.join(choices)}")
+    return resolved
+
+
 def normalize_string_list(raw_value: Any, context: str) -> List[str]:
     if raw_value is None:
         return []
@@ -903,6 +3114,17 @@ def normalize_io_group(raw_value: Any, context: str) -> IOGroup:
     return IOGroup(ids=ids, count=count, variables=variables, variables_by_id=variables_by_id)
 
 
+def serialize_plant_context(plant: PlantContext) -> Dict[str, Any]:
+    return {
+        "id": plant.id,
+        "name": plant.name,
+        "variables": [asdict(variable) for variable in plant.variables],
+        "sensor_ids": list(plant.sensors.ids),
+        "actuator_ids": list(plant.actuators.ids),
+        "setpoints": dict(plant.setpoints),
+    }
+
+
 def normalize_plant_context(raw_value: Any) -> PlantContext:
     raw = expect_dict(raw_value, "bootstrap.plant")
     variables = normalize_variable_list(raw.get("variables"), "bootstrap.plant.variables")
@@ -947,18 +3169,84 @@ def normalize_runtime_context(raw_value: Any) -> RuntimeContext:
     timing_raw = expect_dict(raw.get("timing"), "bootstrap.runtime.timing")
     supervision_raw = expect_dict(raw.get("supervision"), "bootstrap.runtime.supervision")
     paths_raw = expect_dict(raw.get("paths"), "bootstrap.runtime.paths")
+    execution_raw = expect_dict(raw.get("execution") or {}, "bootstrap.runtime.execution")
+    telemetry_raw = expect_dict(raw.get("telemetry") or {}, "bootstrap.runtime.telemetry")
+    protocol_raw = expect_dict(raw.get("protocol") or {}, "bootstrap.runtime.protocol")
+    load_shedding_raw = expect_dict(raw.get("load_shedding") or {}, "bootstrap.runtime.load_shedding")
+    framing = normalize_choice(
+        protocol_raw.get("framing"),
+        "bootstrap.runtime.protocol.framing",
+        PROTOCOL_FRAMINGS,
+        PROTOCOL_FRAMING_NDJSON,
+    )
+    telemetry_layout = normalize_choice(
+        telemetry_raw.get("layout"),
+        "bootstrap.runtime.telemetry.layout",
+        TELEMETRY_LAYOUTS,
+        TELEMETRY_LAYOUT_COLUMNAR if framing == PROTOCOL_FRAMING_BINARY else TELEMETRY_LAYOUT_MAP,
+    )
+    if framing == PROTOCOL_FRAMING_BINARY and telemetry_layout != TELEMETRY_LAYOUT_COLUMNAR:
+        raise RuntimeError(
+            "bootstrap.runtime.telemetry.layout deve ser 'columnar' com bootstrap.runtime.protocol.framing 'binary'"
+        )
 
     return RuntimeContext(
         id=normalize_string(raw.get("id"), "bootstrap.runtime.id"),
         timing=RuntimeTiming(
             owner=normalize_string(timing_raw.get("owner"), "bootstrap.runtime.timing.owner"),
             clock=normalize_string(timing_raw.get("clock"), "bootstrap.runtime.timing.clock"),
-            strategy=normalize_string(timing_raw.get("strategy"), "bootstrap.runtime.timing.strategy"),
+            strategy=normalize_choice(
+                timing_raw.get("strategy"),
+                "bootstrap.runtime.timing.strategy",
+                TIMING_STRATEGIES,
+                TIMING_STRATEGY_DEADLINE,
+            ),
             sample_time_ms=normalize_positive_int(
                 timing_raw.get("sample_time_ms"),
                 "bootstrap.runtime.timing.sample_time_ms",
                 100,
             ),
+            publish_every_cycles=normalize_positive_int(
+                timing_raw.get("publish_every_cycles"),
+                "bootstrap.runtime.timing.publish_every_cycles",
+                1,
+            ),
+            publish_max_rate_hz=normalize_non_negative_float(
+                timing_raw.get("publish_max_rate_hz"),
+                "bootstrap.runtime.timing.publish_max_rate_hz",
+                0.0,
+            ),
+            event_min_spacing_ms=normalize_non_negative_int(
+                timing_raw.get("event_min_spacing_ms"),
+                "bootstrap.runtime.timing.event_min_spacing_ms",
+                0,
+            ),
+            event_timeout_ms=normalize_non_negative_int(
+                timing_raw.get("event_timeout_ms"),
+                "bootstrap.runtime.timing.event_timeout_ms",
+                0,
+            ),
+            spin_window_ms=normalize_non_negative_float(
+                timing_raw.get("spin_window_ms"),
+                "bootstrap.runtime.timing.spin_window_ms",
+                0.0,
+            ),
+            catch_up=normalize_choice(
+                timing_raw.get("catch_up"),
+                "bootstrap.runtime.timing.catch_up",
+                CATCH_UP_POLICIES,
+                CATCH_UP_SKIP,
+            ),
+            catch_up_max_cycles=normalize_positive_int(
+                timing_raw.get("catch_up_max_cycles"),
+                "bootstrap.runtime.timing.catch_up_max_cycles",
+                4,
+            ),
+            overrun_report_interval_ms=normalize_non_negative_int(
+                timing_raw.get("overrun_report_interval_ms"),
+                "bootstrap.runtime.timing.overrun_report_interval_ms",
+                1000,
+            ),
         ),
         supervision=RuntimeSupervision(
             owner=normalize_string(
@@ -994,6 +3282,141 @@ def normalize_runtime_context(raw_value: Any) -> RuntimeContext:
                 "bootstrap.runtime.paths.bootstrap_path",
             ),
         ),
+        execution=RuntimeExecution(
+            snapshot_mode=normalize_choice(
+                execution_raw.get("snapshot_mode"),
+                "bootstrap.runtime.execution.snapshot_mode",
+                SNAPSHOT_MODES,
+                SNAPSHOT_MODE_COPY,
+            ),
+            snapshot_scope=normalize_choice(
+                execution_raw.get("snapshot_scope"),
+                "bootstrap.runtime.execution.snapshot_scope",
+                SNAPSHOT_SCOPES,
+                SNAPSHOT_SCOPE_FULL,
+            ),
+            controller_mode=normalize_choice(
+                execution_raw.get("controller_mode"),
+                "bootstrap.runtime.execution.controller_mode",
+                CONTROLLER_MODES,
+                CONTROLLER_MODE_SEQUENTIAL,
+            ),
+            max_workers=normalize_non_negative_int(
+                execution_raw.get("max_workers"),
+                "bootstrap.runtime.execution.max_workers",
+                RuntimeExecution.max_workers,
+            ),
+            driver_io=normalize_choice(
+                execution_raw.get("driver_io"),
+                "bootstrap.runtime.execution.driver_io",
+                DRIVER_IO_MODES,
+                DRIVER_IO_INLINE,
+            ),
+            driver_poll_ms=normalize_non_negative_int(
+                execution_raw.get("driver_poll_ms"),
+                "bootstrap.runtime.execution.driver_poll_ms",
+                RuntimeExecution.driver_poll_ms,
+            ),
+            async_timeout_ms=normalize_non_negative_int(
+                execution_raw.get("async_timeout_ms"),
+                "bootstrap.runtime.execution.async_timeout_ms",
+                RuntimeExecution.async_timeout_ms,
+            ),
+        ),
+        telemetry=RuntimeTelemetry(
+            layout=telemetry_layout,
+            encoding=normalize_choice(
+                telemetry_raw.get("encoding"),
+                "bootstrap.runtime.telemetry.encoding",
+                TELEMETRY_ENCODINGS,
+                TELEMETRY_ENCODING_FULL,
+            ),
+            keyframe_interval=normalize_positive_int(
+                telemetry_raw.get("keyframe_interval"),
+                "bootstrap.runtime.telemetry.keyframe_interval",
+                50,
+            ),
+            deadband_ratio=normalize_non_negative_float(
+                telemetry_raw.get("deadband_ratio"),
+                "bootstrap.runtime.telemetry.deadband_ratio",
+                0.0,
+            ),
+            publisher=normalize_choice(
+                telemetry_raw.get("publisher"),
+                "bootstrap.runtime.telemetry.publisher",
+                TELEMETRY_PUBLISHERS,
+                TELEMETRY_PUBLISHER_INLINE,
+            ),
+            queue_size=normalize_positive_int(
+                telemetry_raw.get("queue_size"),
+                "bootstrap.runtime.telemetry.queue_size",
+                256,
+            ),
+            overflow_policy=normalize_choice(
+                telemetry_raw.get("overflow_policy"),
+                "bootstrap.runtime.telemetry.overflow_policy",
+                OVERFLOW_POLICIES,
+                OVERFLOW_POLICY_DROP_OLDEST,
+            ),
+            transport=normalize_choice(
+                telemetry_raw.get("transport"),
+                "bootstrap.runtime.telemetry.transport",
+                TELEMETRY_TRANSPORTS,
+                TELEMETRY_TRANSPORT_STDOUT,
+            ),
+            ring_slots=normalize_positive_int(
+                telemetry_raw.get("ring_slots"),
+                "bootstrap.runtime.telemetry.ring_slots",
+                1024,
+            ),
+        ),
+        protocol=RuntimeProtocol(
+            framing=framing,
+            write_mode=normalize_choice(
+                protocol_raw.get("write_mode"),
+                "bootstrap.runtime.protocol.write_mode",
+                PROTOCOL_WRITE_MODES,
+                PROTOCOL_WRITE_MODE_BLOCKING,
+            ),
+            max_pending_bytes=normalize_positive_int(
+                protocol_raw.get("max_pending_bytes"),
+                "bootstrap.runtime.protocol.max_pending_bytes",
+                RuntimeProtocol.max_pending_bytes,
+            ),
+            stats_interval_ms=normalize_positive_int(
+                protocol_raw.get("stats_interval_ms"),
+                "bootstrap.runtime.protocol.stats_interval_ms",
+                RuntimeProtocol.stats_interval_ms,
+            ),
+            serializer=normalize_choice(
+                protocol_raw.get("serializer"),
+                "bootstrap.runtime.protocol.serializer",
+                PROTOCOL_SERIALIZERS,
+                PROTOCOL_SERIALIZER_AUTO,
+            ),
+        ),
+        load_shedding=RuntimeLoadShedding(
+            degrade_after_late_cycles=normalize_non_negative_int(
+                load_shedding_raw.get("degrade_after_late_cycles"),
+                "bootstrap.runtime.load_shedding.degrade_after_late_cycles",
+                RuntimeLoadShedding.degrade_after_late_cycles,
+            ),
+            recover_after_on_time_cycles=normalize_positive_int(
+                load_shedding_raw.get("recover_after_on_time_cycles"),
+                "bootstrap.runtime.load_shedding.recover_after_on_time_cycles",
+                RuntimeLoadShedding.recover_after_on_time_cycles,
+            ),
+            telemetry_every_cycles=normalize_positive_int(
+                load_shedding_raw.get("telemetry_every_cycles"),
+                "bootstrap.runtime.load_shedding.telemetry_every_cycles",
+                RuntimeLoadShedding.telemetry_every_cycles,
+            ),
+            low_priority_period_multiplier=normalize_positive_int(
+                load_shedding_raw.get("low_priority_period_multiplier"),
+                "bootstrap.runtime.load_shedding.low_priority_period_multiplier",
+                RuntimeLoadShedding.low_priority_period_multiplier,
+            ),
+        ),
     )
 
 
@@ -1023,6 +3446,7 @@ def normalize_controller_metadata(raw_value: Any, index: int) -> ControllerMetad
     context = f"bootstrap.controllers[{index}]"
     raw = expect_dict(raw_value, context)
     params_raw = expect_dict(raw.get("params") or {}, f"{context}.params")
+    execution_raw = expect_dict(raw.get("execution") or {}, f"{context}.execution")
 
     return ControllerMetadata(
         id=normalize_string(raw.get("id"), f"{context}.id"),
@@ -1040,6 +3464,56 @@ def normalize_controller_metadata(raw_value: Any, index: int) -> ControllerMetad
             str(key): normalize_controller_param(value, f"{context}.params.{key}", str(key))
             for key, value in params_raw.items()
         },
+        execution=ControllerExecution(
+            isolation=normalize_choice(
+                execution_raw.get("isolation"),
+                f"{context}.execution.isolation",
+                CONTROLLER_ISOLATIONS,
+                CONTROLLER_ISOLATION_NONE,
+            ),
+            timeout_ms=normalize_positive_int(
+                execution_raw.get("timeout_ms"),
+                f"{context}.execution.timeout_ms",
+                ControllerExecution.timeout_ms,
+            ),
+            channel_bytes=normalize_positive_int(
+                execution_raw.get("channel_bytes"),
+                f"{context}.execution.channel_bytes",
+                ControllerExecution.channel_bytes,
+            ),
+            deadline_ms=normalize_non_negative_int(
+                execution_raw.get("deadline_ms"),
+                f"{context}.execution.deadline_ms",
+                ControllerExecution.deadline_ms,
+            ),
+            on_deadline=normalize_choice(
+                execution_raw.get("on_deadline"),
+                f"{context}.execution.on_deadline",
+                CONTROLLER_DEADLINE_ACTIONS,
+                CONTROLLER_DEADLINE_HOLD,
+            ),
+            safe_outputs=normalize_float_map(
+                execution_raw.get("safe_outputs"),
+                f"{context}.execution.safe_outputs",
+            ),
+            late_result=normalize_choice(
+                execution_raw.get("late_result"),
+                f"{context}.execution.late_result",
+                CONTROLLER_LATE_RESULTS,
+                CONTROLLER_LATE_RESULT_DISCARD,
+            ),
+            period_ms=normalize_non_negative_int(
+                execution_raw.get("period_ms"),
+                f"{context}.execution.period_ms",
+                ControllerExecution.period_ms,
+            ),
+            priority=normalize_choice(
+                execution_raw.get("priority"),
+                f"{context}.execution.priority",
+                CONTROLLER_PRIORITIES,
+                CONTROLLER_PRIORITY_NORMAL,
+            ),
+        ),
     )
 
 
@@ -1136,6 +3610,22 @@ def coerce_optional_bool(method_name: str, result: Any, false_message: str) -> N
         emit("warning", {"message": false_message})
 
 
+def bind_coroutine_methods(
+    instance: Any,
+    method_names: tuple[str, ...],
+    resolve_bridge: Callable[[], AsyncioBridge],
+    overlapped_method_names: tuple[str, ...] = (),
+) -> None:
+    for method_name in (*method_names, *overlapped_method_names):
+        method = getattr(instance, method_name, None)
+        if not inspect.iscoroutinefunction(method):
+            continue
+        if method_name in overlapped_method_names:
+            setattr(instance, method_name, OverlappedAsyncWrite(resolve_bridge(), method))
+        else:
+            setattr(instance, method_name, partial(resolve_bridge().run, method_name, method))
+
+
 def maybe_call_optional_connect(instance: Any, component_name: str) -> None:
     connect = getattr(instance, "connect", None)
     if not callable(connect):
@@ -1166,9 +3656,9 @@ def maybe_call_optional_stop(instance: Any, component_name: str) -> None:
 def normalize_read_snapshot(
     raw_value: Any,
     plant: PlantContext,
-) -> tuple[SensorPayload, ActuatorPayload]:
+) -> tuple[SensorPayload, ActuatorPayload, Optional[SampleBlock]]:
     if raw_value is None:
-        return {}, {}
+        return {}, {}, None
     if not isinstance(raw_value, dict):
         raise RuntimeError(
             "read() deve retornar um objeto JSON no formato {'sensors': {...}, 'actuators': {...}}"
@@ -1176,7 +3666,98 @@ def normalize_read_snapshot(
 
     sensors = normalize_float_map(raw_value.get("sensors"), "read().sensors", set(plant.sensors.ids))
     actuators = normalize_float_map(raw_value.get("actuators"), "read().actuators", set(plant.actuators.ids))
-    return sensors, actuators
+    sample_block = normalize_sample_block(raw_value.get("samples"), plant)
+    if sample_block is not None:
+        sensors.update({variable_id: column[-1] for variable_id, column in sample_block.sensors.items()})
+        actuators.update({variable_id: column[-1] for variable_id, column in sample_block.actuators.items()})
+    return sensors, actuators, sample_block
+
+
+def normalize_float_column(raw_value: Any, context: str, length: Optional[int] = None) -> List[float]:
+    if not isinstance(raw_value, (list, tuple)) and not hasattr(raw_value, "tolist"):
+        raise RuntimeError(f"{context} deve ser um array numérico")
+    np = load_optional_numpy()
+    if np is not None:
+        try:
+            column = np.asarray(raw_value, dtype=float)
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"{context} deve ser um array numérico") from exc
+        if column.ndim != 1:
+            raise RuntimeError(f"{context} deve ser um array numérico")
+        finite = bool(np.isfinite(column).all())
+        values = column.tolist()
+    else:
+        try:
+            values = [float(value) for value in raw_value]
+        except Exception as exc:  # noqa: BLE001
+            raise RuntimeError(f"{context} deve ser um array numérico") from exc
+        finite = all(map(math.isfinite, values))
+    if length is not None and len(values) != length:
+        raise RuntimeError(f"{context} deve ter {length} amostras")
+    if not finite:
+        raise RuntimeError(f"{context} deve conter apenas valores finitos")
+    return values
+
+
+def normalize_sample_block(raw_value: Any, plant: PlantContext) -> Optional[SampleBlock]:
+    if raw_value is None:
+        return None
+    raw = expect_dict(raw_value, "read().samples")
+    raw_timestamps = raw.get("timestamps")
+    if raw_timestamps is None:
+        raise RuntimeError("read().samples.timestamps é obrigatório")
+    timestamps = normalize_float_column(raw_timestamps, "read().samples.timestamps")
+    if not timestamps:
+        return None
+    if any(later < earlier for earlier, later in zip(timestamps, timestamps[1:])):
+        raise RuntimeError("read().samples.timestamps deve ser não decrescente")
+
+    columns: Dict[str, Dict[str, List[Optional[float]]]] = {}
+    for group_name, allowed_ids in (("sensors", plant.sensors.ids), ("actuators", plant.actuators.ids)):
+        raw_columns = raw.get(group_name)
+        if raw_columns is None:
+            columns[group_name] = {}
+            continue
+        if not isinstance(raw_columns, dict):
+            raise RuntimeError(f"read().samples.{group_name} deve ser um objeto JSON")
+        allowed = set(allowed_ids)
+        columns[group_name] = {
+            str(variable_id): cast(
+                List[Optional[float]],
+                normalize_float_column(
+                    raw_column,
+                    f"read().samples.{group_name}.{variable_id}",
+                    len(timestamps),
+                ),
+            )
+            for variable_id, raw_column in raw_columns.items()
+            if str(variable_id) in allowed
+        }
+    return SampleBlock(
+        timestamps=timestamps,
+        sensors=columns["sensors"],
+        actuators=columns["actuators"],
+    )
+
+
+def concat_sample_blocks(blocks: List[SampleBlock]) -> Optional[SampleBlock]:
+    if not blocks:
+        return None
+    if len(blocks) == 1:
+        return blocks[0]
+    timestamps: List[float] = []
+    columns: Dict[str, Dict[str, List[Optional[float]]]] = {"sensors": {}, "actuators": {}}
+    for block in blocks:
+        offset = len(timestamps)
+        for group_name, block_columns in (("sensors", block.sensors), ("actuators", block.actuators)):
+            group = columns[group_name]
+            for column in group.values():
+                column.extend([None] * len(block.timestamps))
+            for variable_id, values in block_columns.items():
+                column = group.setdefault(variable_id, [None] * (offset + len(block.timestamps)))
+                column[offset:] = values
+        timestamps.extend(block.timestamps)
+    return SampleBlock(timestamps=timestamps, sensors=columns["sensors"], actuators=columns["actuators"])
 
 
 def normalize_controller_outputs(
@@ -1248,26 +3829,23 @@ def build_controller_plugin_context(
     )
 
 
-def build_controller_snapshot(
-    cycle_id: int,
-    cycle_started_at: float,
-    dt_ms: float,
+def build_controller_snapshot_template(
     plant: PlantContext,
     controller_public_metadata: Dict[str, Any],
-    sensors: SensorPayload,
-    actuators: ActuatorPayload,
+    variable_ids: Optional[tuple[str, ...]] = None,
 ) -> Dict[str, Any]:
+    if variable_ids is None:
+        setpoints = dict(plant.setpoints)
+        variables_by_id = plant.variables_by_id
+    else:
+        setpoints = project_variable_values(plant.setpoints, variable_ids)
+        variables_by_id = project_variable_values(plant.variables_by_id, variable_ids)
     return {
-        "cycle_id": cycle_id,
-        "timestamp": cycle_started_at,
-        "dt_s": max(0.0, dt_ms / 1000.0),
         "plant": {
             "id": plant.id,
             "name": plant.name,
         },
-        "setpoints": dict(plant.setpoints),
-        "sensors": dict(sensors),
-        "actuators": dict(actuators),
+        "setpoints": setpoints,
         "variables_by_id": {
             variable_id: {
                 "id": variable.id,
@@ -1279,20 +3857,426 @@ def build_controller_snapshot(
                 "pv_max": variable.pv_max,
                 "linked_sensor_ids": list(variable.linked_sensor_ids),
             }
-            for variable_id, variable in plant.variables_by_id.items()
+            for variable_id, variable in variables_by_id.items()
         },
         "controller": copy.deepcopy(controller_public_metadata),
     }
 
 
-def spawn_command_reader(command_queue: "queue.Queue[Dict[str, Any]]") -> None:
-    def _reader() -> None:
+def fill_controller_snapshot(
+    template: Dict[str, Any],
+    cycle_id: int,
+    cycle_started_at: float,
+    dt_ms: float,
+    sensors: SensorPayload,
+    actuators: ActuatorPayload,
+    clone_static: bool = False,
+) -> Dict[str, Any]:
+    snapshot = {
+        "cycle_id": cycle_id,
+        "timestamp": cycle_started_at,
+        "dt_s": max(0.0, dt_ms / 1000.0),
+        "plant": template["plant"],
+        "setpoints": template["setpoints"],
+        "sensors": dict(sensors),
+        "actuators": dict(actuators),
+        "variables_by_id": template["variables_by_id"],
+        "controller": template["controller"],
+    }
+    if clone_static:
+        snapshot["plant"] = dict(template["plant"])
+        snapshot["setpoints"] = dict(template["setpoints"])
+        snapshot["variables_by_id"] = {
+            variable_id: {**variable, "linked_sensor_ids": list(variable["linked_sensor_ids"])}
+            for variable_id, variable in template["variables_by_id"].items()
+        }
+        snapshot["controller"] = clone_json_value(template["controller"])
+    return snapshot
+
+
+def clone_json_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: clone_json_value(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [clone_json_value(item) for item in value]
+    return value
+
+
+def wait_until_deadline(deadline: float, spin_window_s: float) -> None:
+    remaining = deadline - time.monotonic()
+    if remaining <= 0.0:
+        return
+    if spin_window_s <= 0.0:
+        time.sleep(remaining)
+        return
+    target_ns = time.perf_counter_ns() + int(remaining * 1_000_000_000)
+    if remaining > spin_window_s:
+        time.sleep(remaining - spin_window_s)
+    while time.perf_counter_ns() < target_ns:
+        pass
+
+
+@lru_cache(maxsize=None)
+def load_optional_numpy() -> Any:
+    try:
+        return importlib.import_module("numpy")
+    except ImportError:
+        return None
+
+
+def supports_controller_array_api(instance: Any) -> bool:
+    if not callable(getattr(instance, CONTROLLER_ARRAY_METHOD, None)):
+        return False
+    return load_optional_numpy() is not None
+
+
+def build_readonly_array(values: List[float]) -> Any:
+    array = load_optional_numpy().array(values, dtype=float)
+    array.flags.writeable = False
+    return array
+
+
+def map_array_controller_outputs(
+    raw_value: Any,
+    output_variable_ids: List[str],
+    controller_name: str,
+) -> ControllerOutputPayload:
+    values = raw_value.tolist() if hasattr(raw_value, "tolist") else list(raw_value)
+    if len(values) != len(output_variable_ids):
+        raise RuntimeError(
+            f"compute_array do controlador '{controller_name}' deve retornar "
+            f"{len(output_variable_ids)} valores"
+        )
+    return {
+        variable_id: value
+        for variable_id, value in zip(output_variable_ids, values)
+        if value == value
+    }
+
+
+def build_controller_watchdog(metadata: ControllerMetadata) -> Optional[ControllerWatchdog]:
+    if metadata.execution.deadline_ms <= 0:
+        return None
+    return ControllerWatchdog(metadata)
+
+
+def compute_controller_outputs(
+    controller: LoadedController,
+    build_snapshot: Callable[[], Mapping[str, Any]],
+) -> ControllerComputeResult:
+    compute_started_at = time.monotonic()
+    try:
+        if controller.array_api:
+            raw_outputs: Any = map_array_controller_outputs(
+                cast(Any, controller.instance).compute_array(build_snapshot()),
+                controller.metadata.output_variable_ids,
+                controller.metadata.name,
+            )
+        else:
+            raw_outputs = controller.instance.compute(build_snapshot())
+        outputs = normalize_controller_outputs(
+            raw_outputs,
+            controller.metadata.output_variable_ids,
+            controller.metadata.name,
+        )
+    except Exception as exc:  # noqa: BLE001
+        return ControllerComputeResult(
+            outputs={},
+            duration_ms=(time.monotonic() - compute_started_at) * 1000.0,
+            error=exc,
+            error_traceback=traceback.format_exc(),
+        )
+    return ControllerComputeResult(
+        outputs=outputs,
+        duration_ms=(time.monotonic() - compute_started_at) * 1000.0,
+    )
+
+
+def freeze_json_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        return MappingProxyType({key: freeze_json_value(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return tuple(freeze_json_value(item) for item in value)
+    return value
+
+
+def resolve_controller_snapshot_mode(snapshot_mode: str, instance: Any) -> str:
+    if getattr(instance, CONTROLLER_MUTABLE_SNAPSHOT_ATTRIBUTE, False) is True:
+        return SNAPSHOT_MODE_COPY
+    return snapshot_mode
+
+
+def build_controller_graph(
+    controllers: List[ControllerMetadata],
+) -> Tuple[List[int], List[tuple[str, ...]], List[str]]:
+    producers: Dict[str, List[int]] = {}
+    for index, controller in enumerate(controllers):
+        for variable_id in controller.output_variable_ids:
+            producers.setdefault(variable_id, []).append(index)
+
+    upstream_output_ids: List[tuple[str, ...]] = []
+    upstream_controllers: List[set[int]] = []
+    for index, controller in enumerate(controllers):
+        variable_ids = [
+            variable_id
+            for variable_id in dict.fromkeys(controller.input_variable_ids)
+            if any(producer != index for producer in producers.get(variable_id, []))
+        ]
+        upstream_output_ids.append(tuple(variable_ids))
+        upstream_controllers.append(
+            {
+                producer
+                for variable_id in variable_ids
+                for producer in producers[variable_id]
+                if producer != index
+            }
+        )
+
+    layers: List[int] = [-1] * len(controllers)
+    remaining = list(range(len(controllers)))
+    cycle_warnings: List[str] = []
+    layer = 0
+    while remaining:
+        ready = [
+            index
+            for index in remaining
+            if all(layers[producer] != -1 for producer in upstream_controllers[index])
+        ]
+        if not ready:
+            index = remaining[0]
+            upstream_output_ids[index] = tuple(
+                variable_id
+                for variable_id in upstream_output_ids[index]
+                if any(layers[producer] != -1 for producer in producers[variable_id] if producer != index)
+            )
+            cycle_warnings.append(
+                "Dependência cíclica entre controladores: "
+                + ", ".join(f"'{controllers[index].name}'" for index in remaining)
+                + f"; '{controllers[index].name}' roda primeiro com as saídas do ciclo anterior"
+            )
+            ready = [index]
+        for index in ready:
+            layers[index] = layer
+        remaining = [index for index in remaining if layers[index] == -1]
+        layer += 1
+    return layers, upstream_output_ids, cycle_warnings
+
+
+def group_controller_layers(controllers: List[LoadedController]) -> List[List[int]]:
+    layers: List[List[int]] = []
+    for index, controller in enumerate(controllers):
+        while len(layers) <= controller.layer:
+            layers.append([])
+        layers[controller.layer].append(index)
+    return layers
+
+
+def resolve_controller_period_cycles(metadata: ControllerMetadata, sample_time_ms: int) -> int:
+    period_ms = metadata.execution.period_ms
+    if period_ms == 0:
+        return 1
+    if period_ms % sample_time_ms != 0:
+        raise RuntimeError(
+            f"execution.period_ms do controlador '{metadata.name}' deve ser múltiplo de "
+            f"sample_time_ms ({sample_time_ms})"
+        )
+    return period_ms // sample_time_ms
+
+
+def assign_controller_phases(controllers: List[LoadedController]) -> None:
+    placed: List[Tuple[int, int]] = []
+    for controller in controllers:
+        period_cycles = controller.period_cycles
+        if period_cycles <= 1:
+            continue
+        phase = min(
+            range(period_cycles),
+            key=lambda candidate: sum(
+                1
+                for other_period, other_phase in placed
+                if (candidate - other_phase) % math.gcd(period_cycles, other_period) == 0
+            ),
+        )
+        placed.append((period_cycles, phase))
+        controller.cycles_until_due = phase
+
+
+def advance_controller_schedule(
+    controller: LoadedController,
+    effective_dt_ms: float,
+    period_multiplier: int = 1,
+) -> Optional[float]:
+    controller.elapsed_ms += effective_dt_ms
+    if controller.cycles_until_due > 0:
+        controller.cycles_until_due -= 1
+        return None
+    controller.cycles_until_due = controller.period_cycles * period_multiplier - 1
+    dt_ms = controller.elapsed_ms
+    controller.elapsed_ms = 0.0
+    return dt_ms
+
+
+def resolve_snapshot_variable_ids(
+    snapshot_scope: str,
+    metadata: ControllerMetadata,
+) -> Optional[tuple[str, ...]]:
+    if snapshot_scope != SNAPSHOT_SCOPE_DECLARED:
+        return None
+    return tuple(dict.fromkeys([*metadata.input_variable_ids, *metadata.output_variable_ids]))
+
+
+def project_variable_values(values: Mapping[str, Any], variable_ids: tuple[str, ...]) -> Dict[str, Any]:
+    return {variable_id: values[variable_id] for variable_id in variable_ids if variable_id in values}
+
+
+def build_readonly_snapshot_base(
+    plant: PlantContext,
+    variable_ids: Optional[tuple[str, ...]] = None,
+) -> Dict[str, Any]:
+    template = build_controller_snapshot_template(plant, {}, variable_ids)
+    return {
+        "plant": freeze_json_value(template["plant"]),
+        "setpoints": freeze_json_value(template["setpoints"]),
+        "variables_by_id": freeze_json_value(template["variables_by_id"]),
+    }
+
+
+def build_readonly_controller_snapshot_template(
+    base: Dict[str, Any],
+    controller_public_metadata: Dict[str, Any],
+) -> Dict[str, Any]:
+    return {
+        "plant": base["plant"],
+        "setpoints": base["setpoints"],
+        "variables_by_id": base["variables_by_id"],
+        "controller": freeze_json_value(controller_public_metadata),
+    }
+
+
+def fill_readonly_controller_snapshot(
+    template: Dict[str, Any],
+    cycle_id: int,
+    cycle_started_at: float,
+    dt_ms: float,
+    sensors: Mapping[str, float],
+    actuators: Mapping[str, float],
+) -> Mapping[str, Any]:
+    return MappingProxyType(
+        {
+            "cycle_id": cycle_id,
+            "timestamp": cycle_started_at,
+            "dt_s": max(0.0, dt_ms / 1000.0),
+            "plant": template["plant"],
+            "setpoints": template["setpoints"],
+            "sensors": sensors,
+            "actuators": actuators,
+            "variables_by_id": template["variables_by_id"],
+            "controller": template["controller"],
+        }
+    )
+
+
+def build_controller_snapshot(
+    cycle_id: int,
+    cycle_started_at: float,
+    dt_ms: float,
+    plant: PlantContext,
+    controller_public_metadata: Dict[str, Any],
+    sensors: SensorPayload,
+    actuators: ActuatorPayload,
+) -> Dict[str, Any]:
+    return fill_controller_snapshot(
+        build_controller_snapshot_template(plant, controller_public_metadata),
+        cycle_id=cycle_id,
+        cycle_started_at=cycle_started_at,
+        dt_ms=dt_ms,
+        sensors=sensors,
+        actuators=actuators,
+    )
+
+
+def build_telemetry_columns(
+    plant: PlantContext,
+    controllers: List[ControllerMetadata],
+) -> Dict[str, List[str]]:
+    output_ids = list(plant.actuators.ids)
+    for controller in controllers:
+        for variable_id in controller.output_variable_ids:
+            if variable_id not in output_ids:
+                output_ids.append(variable_id)
+
+    return {
+        "sensors": list(plant.sensors.ids),
+        "actuators": list(output_ids),
+        "actuators_read": list(plant.actuators.ids),
+        "setpoints": list(plant.setpoints.keys()),
+        "controller_outputs": list(output_ids),
+        "written_outputs": list(output_ids),
+    }
+
+
+def build_telemetry_deadbands(plant: PlantContext, deadband_ratio: float) -> Dict[str, float]:
+    if deadband_ratio <= 0.0:
+        return {}
+    return {
+        variable_id: deadband_ratio * abs(variable.pv_max - variable.pv_min)
+        for variable_id, variable in plant.variables_by_id.items()
+    }
+
+
+def encode_columnar_telemetry(
+    telemetry_payload: Dict[str, Any],
+    schema: TelemetrySchema,
+) -> Dict[str, Any]:
+    encoded = dict(telemetry_payload)
+    encoded["schema_version"] = schema.version
+    if telemetry_payload.get("keyframe") is False:
+        changed_columns: Dict[str, List[int]] = {}
+        for field_name in TELEMETRY_VALUE_FIELDS:
+            values = telemetry_payload.get(field_name) or {}
+            indexes = [
+                index
+                for index, variable_id in enumerate(schema.columns[field_name])
+                if variable_id in values
+            ]
+            changed_columns[field_name] = indexes
+            encoded[field_name] = [values[schema.columns[field_name][index]] for index in indexes]
+        encoded["changed_columns"] = changed_columns
+        return encoded
+
+    for field_name in TELEMETRY_VALUE_FIELDS:
+        values = telemetry_payload.get(field_name) or {}
+        encoded[field_name] = [values.get(variable_id) for variable_id in schema.columns[field_name]]
+    return encoded
+
+
+def spawn_command_reader(
+    command_queue: "queue.Queue[Dict[str, Any]]",
+    framing: str = PROTOCOL_FRAMING_NDJSON,
+) -> None:
+    def _iter_raw_commands() -> Iterator[str | bytes]:
+        if framing == PROTOCOL_FRAMING_BINARY:
+            yield from iter_binary_json_frames(sys.stdin.buffer)
+            return
         for raw_line in sys.stdin:
             line = raw_line.strip()
-            if not line:
-                continue
+            if line:
+                yield line
+
+    def _reader() -> None:
+        raw_commands = _iter_raw_commands()
+        while True:
+            try:
+                raw_command = next(raw_commands)
+            except StopIteration:
+                return
+            except Exception as exc:  # noqa: BLE001
+                emit("error", {"message": f"Falha ao ler comandos do stdin: {exc}"})
+                command_queue.put({"type": "shutdown"})
+                return
+
             try:
-                payload = json.loads(line)
+                payload = PROTOCOL_SERIALIZER.loads(raw_command)
             except Exception as exc:  # noqa: BLE001
                 emit("error", {"message": f"Comando JSON inválido: {exc}"})
                 continue
@@ -1317,7 +4301,13 @@ def handle_command(command: Dict[str, Any], engine: PlantRuntimeEngine) -> None:
     payload = command.get("payload")
 
     if msg_type == "init":
-        engine.apply_init(normalize_bootstrap(payload))
+        bootstrap = normalize_bootstrap(payload)
+        if bootstrap.runtime.protocol.framing != PROTOCOL_FRAMING:
+            raise RuntimeError(
+                "init não pode trocar bootstrap.runtime.protocol.framing "
+                f"de '{PROTOCOL_FRAMING}' para '{bootstrap.runtime.protocol.framing}'"
+            )
+        engine.apply_init(bootstrap)
         return
 
     if msg_type == "start":
@@ -1364,6 +4354,13 @@ def handle_command(command: Dict[str, Any], engine: PlantRuntimeEngine) -> None:
             emit("error", {"message": f"Falha ao atualizar controladores: {exc}"})
         return
 
+    if msg_type == DATA_READY_COMMAND:
+        return
+
+    if msg_type == "request_keyframe":
+        engine.request_telemetry_keyframe()
+        return
+
     if msg_type in ("stop", "shutdown"):
         engine.request_shutdown()
         return
@@ -1391,7 +4388,10 @@ def run() -> int:
     bootstrap = bootstrap_from_file(bootstrap_path)
     engine = PlantRuntimeEngine(bootstrap)
     command_queue: "queue.Queue[Dict[str, Any]]" = queue.Queue()
-    spawn_command_reader(command_queue)
+    framing = engine.bootstrap.runtime.protocol.framing
+    serializer = configure_protocol_serializer(engine.bootstrap.runtime.protocol.serializer)
+    spawn_command_reader(command_queue, framing)
+    engine.cycle_wakeup = lambda: command_queue.put({"type": DATA_READY_COMMAND})
 
     emit(
         "ready",
@@ -1400,14 +4400,35 @@ def run() -> int:
             "plant_id": engine.plant_id,
             "driver": engine.bootstrap.driver.plugin_name,
             "runtime_dir": str(runtime_dir),
+            "protocol": {
+                "version": PROTOCOL_VERSION,
+                "framing": framing,
+                "write_mode": engine.bootstrap.runtime.protocol.write_mode,
+                "serializer": serializer,
+                "telemetry_layout": engine.bootstrap.runtime.telemetry.layout,
+                "telemetry_encoding": engine.bootstrap.runtime.telemetry.encoding,
+                "telemetry_publisher": engine.bootstrap.runtime.telemetry.publisher,
+                "telemetry_transport": engine.bootstrap.runtime.telemetry.transport,
+            },
         },
     )
+    configure_protocol_framing(framing)
+    configure_protocol_writer(
+        engine.bootstrap.runtime.protocol.write_mode,
+        engine.bootstrap.runtime.protocol.max_pending_bytes,
+    )
 
     try:
         while not engine.should_exit:
             wait_timeout = engine.next_wait_timeout()
+            loop_timeout = 0.5 if wait_timeout is None else wait_timeout
+            loop_deadline = time.monotonic() + loop_timeout
+            if drain_protocol_output(loop_timeout):
+                loop_timeout = 0.0
+            else:
+                loop_timeout = max(0.0, loop_deadline - time.monotonic())
             try:
-                command = command_queue.get(timeout=0.5 if wait_timeout is None else wait_timeout)
+                command = command_queue.get(timeout=loop_timeout)
                 try:
                     handle_command(command, engine)
                 except Exception as exc:  # noqa: BLE001
@@ -1441,10 +4462,84 @@ def run() -> int:
         engine.stop()
 
     emit("stopped", {"runtime_id": engine.runtime_id, "plant_id": engine.plant_id})
+    flush_protocol_output()
+    return 0
+
+
+def run_controller_worker(argv: List[str]) -> int:
+    parser = argparse.ArgumentParser(prog=f"runner.py {CONTROLLER_WORKER_FLAG}")
+    parser.add_argument("channel_path")
+    parser.add_argument("channel_bytes", type=int)
+    args = parser.parse_args(argv)
+
+    bootstrap_protocol_stdout()
+    doorbell_fd = _resolve_protocol_stdout_fd()
+    channel = ControllerChannel(Path(args.channel_path), args.channel_bytes, create=False)
+    metadata: Optional[ControllerMetadata] = None
+    instance: Any = None
+    bridge: Optional[AsyncioBridge] = None
+
+    def resolve_bridge() -> AsyncioBridge:
+        nonlocal bridge
+        if bridge is None:
+            bridge = AsyncioBridge(0)
+        return bridge
+
+    try:
+        while sys.stdin.buffer.read(1):
+            kind, body = channel.read_request()
+            try:
+                result: Any = None
+                if kind == CONTROLLER_CHANNEL_INIT:
+                    init = json.loads(body)
+                    metadata = normalize_controller_metadata(init["controller"], 0)
+                    controller_cls = load_plugin_class(
+                        Path(metadata.plugin_dir),
+                        metadata.source_file,
+                        metadata.class_name,
+                        CONTROLLER_REQUIRED_METHODS,
+                        f"controlador '{metadata.name}'",
+                    )
+                    instance = instantiate_plugin(
+                        controller_cls,
+                        build_controller_plugin_context(metadata, normalize_plant_context(init["plant"])),
+                        f"controlador '{metadata.name}'",
+                    )
+                    bind_coroutine_methods(instance, CONTROLLER_ASYNC_METHODS, resolve_bridge)
+                    maybe_call_optional_connect(instance, metadata.name)
+                elif metadata is None:
+                    raise RuntimeError("Processo do controlador recebeu comando antes da inicialização")
+                elif kind == CONTROLLER_CHANNEL_COMPUTE:
+                    result = normalize_controller_outputs(
+                        instance.compute(json.loads(body)),
+                        metadata.output_variable_ids,
+                        metadata.name,
+                    )
+                elif kind == CONTROLLER_CHANNEL_STOP:
+                    maybe_call_optional_stop(instance, metadata.name)
+                status = CONTROLLER_CHANNEL_STATUS_OK
+            except Exception as exc:  # noqa: BLE001
+                log_exception(exc)
+                status = CONTROLLER_CHANNEL_STATUS_ERROR
+                result = {"message": format_exception_message(exc)}
+
+            channel.write_response(
+                status,
+                json.dumps(result, ensure_ascii=False, separators=(",", ":")).encode("utf-8"),
+            )
+            os.write(doorbell_fd, CONTROLLER_CHANNEL_DOORBELL)
+            if kind == CONTROLLER_CHANNEL_STOP:
+                break
+    finally:
+        if bridge is not None:
+            bridge.close(1.0)
+        channel.close()
     return 0
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == [CONTROLLER_WORKER_FLAG]:
+        raise SystemExit(run_controller_worker(sys.argv[2:]))
     try:
         raise SystemExit(run())
     except Exception as exc:  # noqa: BLE001
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
+import asyncio
 import importlib.util
+import io
 import json
+import math
+import struct
 import os
 import subprocess
 import sys
 import tempfile
 import textwrap
+import threading
+import time
 import unittest
+from dataclasses import replace
 from unittest.mock import patch
 from pathlib import Path
 from types import ModuleType
@@ -26,6 +33,7 @@ def load_runner_module() -> ModuleType:
 
 
 runner = load_runner_module()
+MULTI_LOOP_PID_PLUGIN_PATH = Path(__file__).resolve().parents[5] / "docs" / "examples" / "multi-loop-pid.json"
 
 
 def run_runner_subprocess(snippet: str) -> subprocess.CompletedProcess[str]:
@@ -58,6 +66,34 @@ def run_runner_subprocess(snippet: str) -> subprocess.CompletedProcess[str]:
     )
 
 
+class FakeClock:
+    def __init__(self) -> None:
+        self.monotonic_now = 1000.0
+        self.wall_now = 1700000000.0
+
+    def monotonic(self) -> float:
+        return self.monotonic_now
+
+    def time(self) -> float:
+        return self.wall_now + (self.monotonic_now - 1000.0)
+
+    def sleep(self, duration: float) -> None:
+        self.monotonic_now += max(0.0, duration)
+
+    def perf_counter_ns(self) -> int:
+        self.monotonic_now += 0.00001
+        return int(self.monotonic_now * 1_000_000_000)
+
+    def patch_runner(self) -> Any:
+        return patch.multiple(
+            runner.time,
+            monotonic=self.monotonic,
+            time=self.time,
+            sleep=self.sleep,
+            perf_counter_ns=self.perf_counter_ns,
+        )
+
+
 def parse_protocol_lines(raw_stdout: str) -> list[dict[str, Any]]:
     return [json.loads(line) for line in raw_stdout.splitlines() if line.strip()]
 
@@ -228,6 +264,37 @@ class RunnerContractTests(unittest.TestCase):
             runtime=runtime,
         )
 
+    def write_plugin(self, root: Path, directory: str, source: str) -> Path:
+        plugin_dir = root / directory
+        plugin_dir.mkdir()
+        (plugin_dir / "main.py").write_text(
+            textwrap.dedent(source).strip() + "\n",
+            encoding="utf-8",
+        )
+        return plugin_dir
+
+    def build_controller(
+        self,
+        controller_dir: Path,
+        class_name: str,
+        controller_id: str,
+        output_variable_ids: list[str],
+    ) -> Any:
+        return runner.ControllerMetadata(
+            id=controller_id,
+            plugin_id=f"{controller_id}_plugin",
+            plugin_name=f"{class_name} Plugin",
+            plugin_dir=str(controller_dir),
+            source_file="main.py",
+            class_name=class_name,
+            name=controller_id,
+            controller_type="custom",
+            active=True,
+            input_variable_ids=["sensor_1"],
+            output_variable_ids=output_variable_ids,
+            params={},
+        )
+
     def test_driver_context_exposes_only_config_and_plant(self) -> None:
         with tempfile.TemporaryDirectory() as tmp_dir:
             bootstrap = self.build_bootstrap(Path(tmp_dir))
@@ -319,20 +386,6 @@ class RunnerContractTests(unittest.TestCase):
                 engine.stop()
 
     def test_engine_uptime_progresses_from_first_cycle_start(self) -> None:
-        class FakeClock:
-            def __init__(self) -> None:
-                self.monotonic_now = 1000.0
-                self.wall_now = 1700000000.0
-
-            def monotonic(self) -> float:
-                return self.monotonic_now
-
-            def time(self) -> float:
-                return self.wall_now + (self.monotonic_now - 1000.0)
-
-            def sleep(self, duration: float) -> None:
-                self.monotonic_now += max(0.0, duration)
-
         with tempfile.TemporaryDirectory() as tmp_dir:
             original_bootstrap = self.build_bootstrap(Path(tmp_dir))
             bootstrap = runner.RuntimeBootstrap(
@@ -378,89 +431,2676 @@ class RunnerContractTests(unittest.TestCase):
             self.assertAlmostEqual(telemetry_payloads[1]["uptime_s"], 1.0, places=6)
             self.assertAlmostEqual(telemetry_payloads[2]["uptime_s"], 2.0, places=6)
 
+    def test_engine_reuses_snapshot_template_until_setpoints_change(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bootstrap = self.build_bootstrap(Path(tmp_dir))
+            engine = runner.PlantRuntimeEngine(bootstrap)
 
-class RunnerProtocolStreamTests(unittest.TestCase):
-    def test_emit_keeps_json_on_stdout_after_bootstrap(self) -> None:
-        completed = run_runner_subprocess(
-            """
-            runner.bootstrap_protocol_stdout()
-            runner.emit("ready", {"ok": True})
-            """
-        )
+            with patch.object(runner, "emit", lambda *_args, **_kwargs: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    first_template = engine.controller_snapshot_templates["ctrl_1"]
+                    engine.run_cycle()
+                    self.assertIs(engine.controller_snapshot_templates["ctrl_1"], first_template)
 
-        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+                    engine.update_setpoints({"sensor_1": 55.0})
+                    self.assertEqual(engine.controller_snapshot_templates, {})
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+            rebuilt_template = engine.controller_snapshot_templates["ctrl_1"]
+            self.assertIsNot(rebuilt_template, first_template)
+            self.assertEqual(rebuilt_template["setpoints"], {"sensor_1": 55.0})
+            self.assertEqual(rebuilt_template["variables_by_id"]["sensor_1"]["setpoint"], 55.0)
+
+    def test_copy_snapshot_mutations_do_not_leak_into_next_cycle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "mutating_plugin",
+                """
+                from typing import Any, Dict
+
+                class Mutator:
+                    mutable_snapshot = True
+
+                    def __init__(self, context: Any) -> None:
+                        self.seen = []
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.seen.append(
+                            (
+                                snapshot["setpoints"]["sensor_1"],
+                                snapshot["variables_by_id"]["sensor_1"]["pv_max"],
+                                list(snapshot["variables_by_id"]["sensor_1"]["linked_sensor_ids"]),
+                                list(snapshot["controller"]["output_variable_ids"]),
+                                snapshot["plant"]["name"],
+                            )
+                        )
+                        snapshot["setpoints"]["sensor_1"] = -1.0
+                        snapshot["variables_by_id"]["sensor_1"]["pv_max"] = -1.0
+                        snapshot["variables_by_id"]["sensor_1"]["linked_sensor_ids"].append("intruder")
+                        snapshot["controller"]["output_variable_ids"].append("intruder")
+                        snapshot["plant"]["name"] = "intruder"
+                        return {"actuator_1": 1.0}
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[self.build_controller(controller_dir, "Mutator", "mutator", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[str] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("warning", "error"):
+                    messages.append(msg_type)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    mutator = engine.controllers[0]
+                finally:
+                    engine.stop()
+
+        self.assertEqual(messages, [])
+        self.assertEqual(mutator.snapshot_mode, "copy")
+        self.assertEqual(len(mutator.instance.seen), 2)
+        self.assertEqual(mutator.instance.seen[1], mutator.instance.seen[0])
+        self.assertEqual(mutator.instance.seen[1][0], 42.0)
+        self.assertEqual(mutator.instance.seen[1][3], ["actuator_1"])
+
+    def test_copy_snapshot_shares_frozen_static_parts_across_cycles(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "recording_plugin",
+                """
+                from typing import Any, Dict
+
+                class Recorder:
+                    def __init__(self, context: Any) -> None:
+                        self.snapshots = []
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.snapshots.append(snapshot)
+                        snapshot["sensors"]["sensor_1"] = -1.0
+                        return {"actuator_1": 1.0}
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[self.build_controller(controller_dir, "Recorder", "recorder", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+
+            with patch.object(runner, "emit", lambda *_args, **_kwargs: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    recorder = engine.controllers[0]
+                finally:
+                    engine.stop()
+
+        first, second = recorder.instance.snapshots
+        self.assertEqual(recorder.snapshot_mode, "copy")
+        for key in ("plant", "setpoints", "variables_by_id", "controller"):
+            self.assertIs(first[key], second[key])
+        self.assertIsNot(first["sensors"], second["sensors"])
+        self.assertEqual(second["sensors"], {"sensor_1": -1.0})
+        with self.assertRaises(TypeError):
+            second["variables_by_id"]["sensor_1"]["pv_max"] = 0.0  # type: ignore[index]
+
+    def test_readonly_snapshots_are_shared_and_isolated_between_controllers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "isolation_plugin",
+                """
+                from typing import Any, Dict
+
+                def assign(target: Any, key: str, value: Any) -> None:
+                    target[key] = value
+
+                class Intruder:
+                    def __init__(self, context: Any) -> None:
+                        self.blocked = []
+
+                    def compute(self, snapshot: Any) -> Dict[str, float]:
+                        attempts = {
+                            "snapshot": lambda: assign(snapshot, "sensors", {}),
+                            "sensors": lambda: assign(snapshot["sensors"], "sensor_1", -1.0),
+                            "setpoints": lambda: assign(snapshot["setpoints"], "sensor_1", -1.0),
+                            "variables_by_id": lambda: assign(
+                                snapshot["variables_by_id"]["sensor_1"], "pv_max", -1.0
+                            ),
+                            "params": lambda: assign(
+                                snapshot["controller"]["params"]["kp"], "value", -1.0
+                            ),
+                        }
+                        for name, attempt in attempts.items():
+                            try:
+                                attempt()
+                            except TypeError:
+                                self.blocked.append(name)
+                        return {}
+
+                class Observer:
+                    def __init__(self, context: Any) -> None:
+                        self.seen = []
+
+                    def compute(self, snapshot: Any) -> Dict[str, float]:
+                        self.seen.append(
+                            (
+                                snapshot["sensors"]["sensor_1"],
+                                snapshot["setpoints"]["sensor_1"],
+                                snapshot["variables_by_id"]["sensor_1"]["pv_max"],
+                            )
+                        )
+                        return {"actuator_1": 1.0}
+
+                class MutableObserver:
+                    mutable_snapshot = True
+
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        snapshot["sensors"]["sensor_1"] = -2.0
+                        snapshot["setpoints"]["sensor_1"] = -2.0
+                        return {}
+                """,
+            )
+            intruder = self.build_controller(controller_dir, "Intruder", "intruder", [])
+            intruder.params = dict(original_bootstrap.controllers[0].params)
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[
+                    intruder,
+                    self.build_controller(controller_dir, "MutableObserver", "mutable", []),
+                    self.build_controller(controller_dir, "Observer", "observer", ["actuator_1"]),
+                ],
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    execution=runner.RuntimeExecution(snapshot_mode="readonly"),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+
+            with patch.object(runner, "emit", lambda *_args, **_kwargs: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    intruder_instance, mutable_controller, observer_instance = engine.controllers
+                finally:
+                    engine.stop()
+
+        self.assertEqual(intruder_instance.snapshot_mode, "readonly")
+        self.assertEqual(mutable_controller.snapshot_mode, "copy")
         self.assertEqual(
-            parse_protocol_lines(completed.stdout),
-            [{"type": "ready", "payload": {"ok": True}}],
+            intruder_instance.instance.blocked,
+            ["snapshot", "sensors", "setpoints", "variables_by_id", "params"] * 2,
         )
-        self.assertEqual(completed.stderr.strip(), "")
+        self.assertEqual(observer_instance.instance.seen, [(1.0, 42.0, 100.0), (1.0, 42.0, 100.0)])
+        self.assertEqual(bootstrap.plant.setpoints["sensor_1"], 42.0)
 
-    def test_python_print_is_redirected_to_stderr(self) -> None:
-        completed = run_runner_subprocess(
-            """
-            runner.bootstrap_protocol_stdout()
-            print("python-log")
-            runner.emit("ready", {"ok": True})
-            """
-        )
+    def test_multi_rate_controllers_run_on_spread_due_cycles_and_hold_outputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "rate_plugin",
+                """
+                from typing import Any, Dict
 
-        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+                class RateController:
+                    def __init__(self, context: Any) -> None:
+                        self.output_ids = context.controller.output_variable_ids
+                        self.runs = []
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.runs.append((snapshot["cycle_id"], round(snapshot["dt_s"], 6)))
+                        return {variable_id: float(snapshot["cycle_id"]) for variable_id in self.output_ids}
+                """,
+            )
+            slow_execution = runner.ControllerExecution(period_ms=300)
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[
+                    self.build_controller(controller_dir, "RateController", "fast", []),
+                    replace(
+                        self.build_controller(controller_dir, "RateController", "slow_a", ["actuator_1"]),
+                        execution=slow_execution,
+                    ),
+                    replace(
+                        self.build_controller(controller_dir, "RateController", "slow_b", []),
+                        execution=slow_execution,
+                    ),
+                ],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            fake_clock = FakeClock()
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with fake_clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(6):
+                        engine.run_cycle()
+                    fast, slow_a, slow_b = engine.controllers
+                finally:
+                    engine.stop()
+
+        self.assertEqual([cycle_id for cycle_id, _ in fast.instance.runs], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(slow_a.instance.runs, [(1, 0.1), (4, 0.3)])
+        self.assertEqual(slow_b.instance.runs, [(2, 0.2), (5, 0.3)])
         self.assertEqual(
-            parse_protocol_lines(completed.stdout),
-            [{"type": "ready", "payload": {"ok": True}}],
+            [payload["controller_outputs"] for payload in telemetry],
+            [{"actuator_1": 1.0}] * 3 + [{"actuator_1": 4.0}] * 3,
+        )
+        self.assertEqual(
+            ["slow_a" in payload["controller_durations_ms"] for payload in telemetry],
+            [True, False, False, True, False, False],
         )
-        self.assertIn("python-log", completed.stderr)
 
-    @unittest.skipUnless(os.name == "posix", "Teste de libc disponível apenas em POSIX")
-    def test_libc_printf_is_redirected_to_stderr(self) -> None:
-        completed = run_runner_subprocess(
-            """
-            import ctypes
+    def test_controller_period_must_be_multiple_of_sample_time(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            controller = replace(
+                original_bootstrap.controllers[0],
+                execution=runner.ControllerExecution(period_ms=250),
+            )
+            engine = runner.PlantRuntimeEngine(replace(original_bootstrap, controllers=[controller]))
 
-            runner.bootstrap_protocol_stdout()
-            libc = ctypes.CDLL(None)
-            libc.printf.argtypes = [ctypes.c_char_p]
-            libc.printf.restype = ctypes.c_int
-            libc.fflush.argtypes = [ctypes.c_void_p]
-            libc.fflush.restype = ctypes.c_int
-            libc.printf(b"native-log\\\\n")
-            libc.fflush(None)
-            runner.emit("ready", {"ok": True})
-            """
+            with self.assertRaisesRegex(RuntimeError, r"deve ser múltiplo de sample_time_ms \(100\)"):
+                engine.start()
+            engine.stop()
+
+    def test_controller_phases_avoid_shared_ticks(self) -> None:
+        controllers = [
+            runner.LoadedController(metadata=None, public_metadata={}, instance=None, period_cycles=period)
+            for period in (1, 4, 4, 2, 4)
+        ]
+        runner.assign_controller_phases(controllers)
+
+        self.assertEqual([controller.cycles_until_due for controller in controllers], [0, 0, 1, 0, 3])
+
+    def test_cascade_controllers_receive_upstream_outputs_in_same_cycle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "cascade_plugin",
+                """
+                from typing import Any, Dict
+
+                class Outer:
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        return {"inner_setpoint": 5.0 + snapshot["cycle_id"]}
+
+                class Inner:
+                    def __init__(self, context: Any) -> None:
+                        self.upstream = []
+
+                    def compute(self, snapshot: Any) -> Dict[str, float]:
+                        upstream_outputs = dict(snapshot["upstream_outputs"])
+                        self.upstream.append(upstream_outputs)
+                        return {"actuator_1": upstream_outputs["inner_setpoint"] + 1.0}
+                """,
+            )
+            inner = replace(
+                self.build_controller(controller_dir, "Inner", "inner", ["actuator_1"]),
+                input_variable_ids=["sensor_1", "inner_setpoint"],
+            )
+            outer = self.build_controller(controller_dir, "Outer", "outer", ["inner_setpoint"])
+            for snapshot_mode in ("copy", "readonly"):
+                with self.subTest(snapshot_mode=snapshot_mode):
+                    engine = runner.PlantRuntimeEngine(
+                        replace(
+                            original_bootstrap,
+                            controllers=[inner, outer],
+                            runtime=replace(
+                                original_bootstrap.runtime,
+                                execution=runner.RuntimeExecution(snapshot_mode=snapshot_mode),
+                            ),
+                        )
+                    )
+                    telemetry: list[dict[str, Any]] = []
+
+                    def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                        if msg_type == "telemetry" and payload is not None:
+                            telemetry.append(payload)
+
+                    with patch.object(runner, "emit", capture_emit):
+                        try:
+                            engine.start()
+                            engine.run_cycle()
+                            engine.run_cycle()
+                            inner_controller = engine.controllers[0]
+                            layers = engine.controller_layers
+                        finally:
+                            engine.stop()
+
+                    self.assertEqual(layers, [[1], [0]])
+                    self.assertEqual(inner_controller.upstream_output_ids, ("inner_setpoint",))
+                    self.assertEqual(
+                        inner_controller.instance.upstream,
+                        [{"inner_setpoint": 6.0}, {"inner_setpoint": 7.0}],
+                    )
+                    self.assertEqual(
+                        [payload["controller_outputs"] for payload in telemetry],
+                        [
+                            {"inner_setpoint": 6.0, "actuator_1": 7.0},
+                            {"inner_setpoint": 7.0, "actuator_1": 8.0},
+                        ],
+                    )
+
+    def test_cyclic_controllers_load_with_warning_and_run_in_list_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "cyclic_plugin",
+                """
+                from typing import Any, Dict
+
+                class Feedback:
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Any) -> Dict[str, float]:
+                        return {"inner_setpoint": snapshot["actuators"]["actuator_1"] + 1.0}
+
+                class Follower:
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Any) -> Dict[str, float]:
+                        return {"actuator_1": snapshot["upstream_outputs"]["inner_setpoint"] * 2.0}
+                """,
+            )
+            feedback = replace(
+                self.build_controller(controller_dir, "Feedback", "feedback", ["inner_setpoint"]),
+                input_variable_ids=["actuator_1"],
+            )
+            follower = replace(
+                self.build_controller(controller_dir, "Follower", "follower", ["actuator_1"]),
+                input_variable_ids=["inner_setpoint"],
+            )
+            engine = runner.PlantRuntimeEngine(replace(original_bootstrap, controllers=[feedback, follower]))
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("telemetry", "warning") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    layers = engine.controller_layers
+                finally:
+                    engine.stop()
+
+        self.assertEqual(layers, [[0], [1]])
+        warnings = [payload["message"] for msg_type, payload in messages if msg_type == "warning"]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("'feedback' roda primeiro", warnings[0])
+        telemetry = [payload for msg_type, payload in messages if msg_type == "telemetry"]
+        outputs = telemetry[0]["controller_outputs"]
+        self.assertEqual(outputs["actuator_1"], outputs["inner_setpoint"] * 2.0)
+
+    def test_controller_graph_builds_layers_and_breaks_cycles_in_list_order(self) -> None:
+        def controller(controller_id: str, inputs: list[str], outputs: list[str]) -> Any:
+            return replace(
+                self.build_controller(Path("."), "Controller", controller_id, outputs),
+                input_variable_ids=inputs,
+            )
+
+        layers, upstream_output_ids, cycle_warnings = runner.build_controller_graph(
+            [
+                controller("inner", ["sensor_1", "sp_inner"], ["actuator_1"]),
+                controller("outer", ["sensor_2"], ["sp_inner"]),
+                controller("self_feedback", ["actuator_2"], ["actuator_2"]),
+            ]
         )
+        self.assertEqual(layers, [1, 0, 0])
+        self.assertEqual(upstream_output_ids, [("sp_inner",), (), ()])
+        self.assertEqual(cycle_warnings, [])
 
-        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
-        self.assertEqual(
-            parse_protocol_lines(completed.stdout),
-            [{"type": "ready", "payload": {"ok": True}}],
+        layers, upstream_output_ids, cycle_warnings = runner.build_controller_graph(
+            [
+                controller("a", ["x"], ["y"]),
+                controller("b", ["y"], ["x"]),
+                controller("c", [], ["z"]),
+                controller("d", ["x", "z"], ["w"]),
+            ]
         )
-        self.assertIn("native-log", completed.stderr)
+        self.assertEqual(layers, [1, 2, 0, 3])
+        self.assertEqual(upstream_output_ids, [(), ("y",), (), ("x", "z")])
+        self.assertEqual(len(cycle_warnings), 1)
+        self.assertIn("Dependência cíclica entre controladores: 'a', 'b', 'd'", cycle_warnings[0])
+        self.assertIn("'a' roda primeiro", cycle_warnings[0])
 
-    def test_emit_stays_atomic_across_threads(self) -> None:
-        completed = run_runner_subprocess(
-            """
-            import threading
+    def test_driver_io_thread_serves_latest_sample_without_blocking_cycle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "slow_driver",
+                """
+                import threading
+                from typing import Any, Dict
 
-            runner.bootstrap_protocol_stdout()
+                class SlowDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.reads = 0
+                        self.release = threading.Event()
+                        self.written = threading.Event()
+                        self.writes = []
 
-            def worker(worker_id: int) -> None:
-                for sequence in range(200):
-                    runner.emit("telemetry", {"worker": worker_id, "sequence": sequence})
+                    def connect(self) -> bool:
+                        return True
 
-            threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(6)]
-            for thread in threads:
-                thread.start()
-            for thread in threads:
-                thread.join()
-            """
-        )
+                    def stop(self) -> bool:
+                        return True
 
-        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
-        lines = parse_protocol_lines(completed.stdout)
+                    def read(self) -> Dict[str, Dict[str, float]]:
+                        self.reads += 1
+                        if self.reads > 1:
+                            self.release.wait(5.0)
+                        return {"sensors": {"sensor_1": float(self.reads)}, "actuators": {"actuator_1": 0.0}}
 
-        self.assertEqual(len(lines), 1200)
-        self.assertTrue(all(line["type"] == "telemetry" for line in lines))
-        self.assertEqual(completed.stderr.strip(), "")
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        self.writes.append(dict(outputs))
+                        self.written.set()
+                        return True
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="SlowDriver"),
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    execution=runner.RuntimeExecution(driver_io="thread", driver_poll_ms=1),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    driver = engine.driver_instance
+                    deadline = time.monotonic() + 5.0
+                    while engine.driver_io.latest() is None and time.monotonic() < deadline:
+                        time.sleep(0.005)
+                    cycle_started_at = time.monotonic()
+                    engine.run_cycle()
+                    cycle_elapsed_s = time.monotonic() - cycle_started_at
+                    driver.release.set()
+                    self.assertTrue(driver.written.wait(5.0))
+                finally:
+                    engine.stop()
+
+        self.assertLess(cycle_elapsed_s, 1.0)
+        self.assertIsNone(engine.driver_io)
+        self.assertEqual(telemetry[0]["sensors"], {"sensor_1": 1.0})
+        self.assertEqual(telemetry[0]["driver_sample_sequence"], 1)
+        self.assertGreaterEqual(telemetry[0]["driver_sample_age_ms"], 0.0)
+        self.assertEqual(telemetry[0]["written_outputs"], {"actuator_1": 0.0})
+        self.assertEqual(driver.writes[0], {"actuator_1": 0.0})
+
+    def test_event_timing_runs_cycle_on_data_ready_with_spacing_and_timeout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "event_driver",
+                """
+                from typing import Any, Callable, Dict
+
+                class EventDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.data_ready: Callable[[], None] | None = None
+
+                    def bind_data_ready(self, callback: Callable[[], None]) -> None:
+                        self.data_ready = callback
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Dict[str, float]]:
+                        return {"sensors": {"sensor_1": 1.0}, "actuators": {"actuator_1": 0.0}}
+
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        return True
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="EventDriver"),
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    timing=replace(
+                        original_bootstrap.runtime.timing,
+                        strategy="event",
+                        event_min_spacing_ms=20,
+                        event_timeout_ms=10,
+                    ),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            wakeups: list[None] = []
+            engine.cycle_wakeup = lambda: wakeups.append(None)
+            telemetry: list[dict[str, Any]] = []
+            clock = FakeClock()
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    first_started_at = engine.last_cycle_started_at
+                    engine.driver_instance.data_ready()
+                    engine.driver_instance.data_ready()
+                    spacing_wait_s = engine.next_wait_timeout()
+                    engine.run_cycle()
+                    event_started_at = engine.last_cycle_started_at
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual(len(wakeups), 1)
+        self.assertAlmostEqual(spacing_wait_s, 0.02)
+        self.assertAlmostEqual(event_started_at - first_started_at, 0.02)
+        self.assertEqual(
+            [payload["cycle_trigger"] for payload in telemetry],
+            ["timeout", "event", "timeout"],
+        )
+
+    def test_burst_read_feeds_latest_sample_and_publishes_full_block(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "burst_driver",
+                """
+                from typing import Any, Dict
+
+                class BurstDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.context = context
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Any]:
+                        return {
+                            "actuators": {"actuator_1": 0.0},
+                            "samples": {
+                                "timestamps": [0.000, 0.001, 0.002],
+                                "sensors": {"sensor_1": [1.0, 2.0, 3.0], "unknown": [9.0]},
+                            },
+                        }
+
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        return True
+                """,
+            )
+            controller_dir = self.write_plugin(
+                root,
+                "echo_controller",
+                """
+                from typing import Any, Dict
+
+                class EchoController:
+                    def __init__(self, context: Any) -> None:
+                        self.context = context
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        return {"actuator_1": snapshot["sensors"]["sensor_1"]}
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="BurstDriver"),
+                controllers=[self.build_controller(controller_dir, "EchoController", "ctrl_echo", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual(telemetry[0]["sensors"], {"sensor_1": 3.0})
+        self.assertEqual(telemetry[0]["controller_outputs"], {"actuator_1": 3.0})
+        self.assertEqual(
+            telemetry[0]["sample_block"],
+            {"timestamps": [0.0, 0.001, 0.002], "sensors": {"sensor_1": [1.0, 2.0, 3.0]}, "actuators": {}},
+        )
+
+    def test_driver_io_caps_pending_sample_blocks_and_discards_on_pause(self) -> None:
+        class BurstDriver:
+            def __init__(self) -> None:
+                self.reads = 0
+                self.idle = threading.Event()
+                self.release = threading.Event()
+
+            def read(self) -> dict[str, Any]:
+                self.reads += 1
+                if self.reads > 5:
+                    self.idle.set()
+                    self.release.wait(5.0)
+                return {"samples": {"timestamps": [0.0, 1.0], "sensors": {"sensor_1": [1.0, 2.0]}}}
+
+            def write(self, outputs: dict[str, float]) -> bool:
+                return True
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plant = self.build_bootstrap(Path(tmp_dir)).plant
+        driver = BurstDriver()
+        with patch.object(runner, "DRIVER_SAMPLE_BLOCK_MAX_PENDING_SAMPLES", 4):
+            driver_io = runner.DriverIoThread(driver, plant, 0.0)
+            try:
+                self.assertTrue(driver.idle.wait(5.0))
+                pending_samples = driver_io.pending_block_samples
+                dropped_before_discard = driver_io.dropped_block_samples
+                driver_io.discard_sample_blocks()
+                drained = driver_io.drain_sample_blocks()
+            finally:
+                driver.release.set()
+                driver_io.close(5.0)
+
+        self.assertEqual(pending_samples, 4)
+        self.assertEqual(dropped_before_discard, 6)
+        self.assertEqual(driver_io.dropped_block_samples, 10)
+        self.assertEqual(drained, [])
+
+    def test_sample_blocks_survive_decimated_telemetry_and_count_shed_samples(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "block_driver",
+                """
+                from typing import Any, Dict
+
+                class BlockDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.reads = 0
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Any]:
+                        self.reads += 1
+                        return {
+                            "samples": {
+                                "timestamps": [float(self.reads)],
+                                "sensors": {"sensor_1": [float(self.reads)]},
+                            },
+                        }
+
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        return True
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="BlockDriver"),
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    load_shedding=runner.RuntimeLoadShedding(telemetry_every_cycles=2),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.load_shed_level = 1
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    engine.load_shed_level = 2
+                    engine.run_cycle()
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual([payload["cycle_id"] for payload in telemetry], [2, 4])
+        self.assertEqual(telemetry[0]["sample_block"]["timestamps"], [1.0, 2.0])
+        self.assertEqual(telemetry[0]["sample_block"]["sensors"], {"sensor_1": [1.0, 2.0]})
+        self.assertNotIn("sample_block", telemetry[1])
+        self.assertEqual(telemetry[1]["sample_block_dropped_samples"], 2)
+
+    def test_shm_transport_sends_sample_blocks_as_separate_messages(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+        bootstrap = replace(
+            original_bootstrap,
+            runtime=replace(
+                original_bootstrap.runtime,
+                telemetry=runner.RuntimeTelemetry(layout="columnar", transport="shm"),
+            ),
+        )
+        engine = runner.PlantRuntimeEngine(bootstrap)
+        engine.cycle_id = 7
+        engine.pending_sample_blocks = [
+            runner.SampleBlock(timestamps=[0.0], sensors={"sensor_1": [1.0]}, actuators={}),
+        ]
+        messages: list[tuple[str, dict[str, Any]]] = []
+        telemetry_payload: dict[str, Any] = {}
+
+        with patch.object(runner, "emit", lambda msg_type, payload=None: messages.append((msg_type, payload))):
+            engine._attach_sample_blocks(telemetry_payload)
+
+        self.assertEqual(telemetry_payload, {})
+        self.assertEqual(
+            messages,
+            [("sample_block", {"cycle_id": 7, "timestamps": [0.0], "sensors": {"sensor_1": [1.0]}, "actuators": {}})],
+        )
+        self.assertEqual(engine.pending_sample_blocks, [])
+
+    def test_burst_read_validates_columns_and_concatenates_blocks(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plant = self.build_bootstrap(Path(tmp_dir)).plant
+
+        invalid_blocks = {
+            "amostras": {"timestamps": [0.0, 1.0], "sensors": {"sensor_1": [1.0]}},
+            "finitos": {"timestamps": [0.0, 1.0], "sensors": {"sensor_1": [1.0, float("nan")]}},
+            "não decrescente": {"timestamps": [1.0, 0.0], "sensors": {"sensor_1": [1.0, 2.0]}},
+            "array numérico": {"timestamps": [0.0], "sensors": {"sensor_1": "1.0"}},
+        }
+        for message, samples in invalid_blocks.items():
+            with self.subTest(message=message):
+                with self.assertRaisesRegex(RuntimeError, message):
+                    runner.normalize_read_snapshot({"samples": samples}, plant)
+
+        first = runner.normalize_sample_block(
+            {"timestamps": [0.0, 1.0], "sensors": {"sensor_1": [1.0, 2.0]}},
+            plant,
+        )
+        second = runner.normalize_sample_block(
+            {"timestamps": [2.0], "actuators": {"actuator_1": [5.0]}},
+            plant,
+        )
+        merged = runner.concat_sample_blocks([first, second])
+        self.assertEqual(merged.timestamps, [0.0, 1.0, 2.0])
+        self.assertEqual(merged.sensors, {"sensor_1": [1.0, 2.0, None]})
+        self.assertEqual(merged.actuators, {"actuator_1": [None, None, 5.0]})
+        self.assertIsNone(runner.concat_sample_blocks([]))
+
+    def test_spin_window_wakes_early_and_spins_to_deadline(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    timing=replace(original_bootstrap.runtime.timing, spin_window_ms=2.0),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+            clock = FakeClock()
+            sleeps: list[float] = []
+            fake_sleep = clock.sleep
+
+            def record_sleep(duration: float) -> None:
+                sleeps.append(duration)
+                fake_sleep(duration)
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            clock.sleep = record_sleep  # type: ignore[method-assign]
+            with clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    deadline = engine.next_cycle_deadline
+                    wait_timeout = engine.next_wait_timeout()
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertAlmostEqual(wait_timeout, 0.098)
+        self.assertEqual(len(sleeps), 1)
+        self.assertAlmostEqual(sleeps[0], 0.098)
+        self.assertGreaterEqual(engine.last_cycle_started_at, deadline)
+        self.assertEqual(telemetry[0]["start_jitter_ms"], 0.0)
+        self.assertGreaterEqual(telemetry[1]["start_jitter_ms"], 0.0)
+        self.assertLess(telemetry[1]["start_jitter_ms"], 0.05)
+
+    def build_slow_driver_bootstrap(self, root: Path, read_sleep_s: float, **timing: Any) -> Any:
+        original_bootstrap = self.build_bootstrap(root)
+        driver_dir = self.write_plugin(
+            root,
+            "slow_read_driver",
+            f"""
+            import time
+            from typing import Any, Dict
+
+            class SlowReadDriver:
+                def __init__(self, context: Any) -> None:
+                    self.context = context
+
+                def connect(self) -> bool:
+                    return True
+
+                def stop(self) -> bool:
+                    return True
+
+                def read(self) -> Dict[str, Dict[str, float]]:
+                    time.sleep({read_sleep_s!r})
+                    return {{"sensors": {{"sensor_1": 1.0}}, "actuators": {{"actuator_1": 0.0}}}}
+
+                def write(self, outputs: Dict[str, float]) -> bool:
+                    return True
+            """,
+        )
+        return replace(
+            original_bootstrap,
+            driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="SlowReadDriver"),
+            runtime=replace(
+                original_bootstrap.runtime,
+                timing=replace(original_bootstrap.runtime.timing, **timing),
+            ),
+        )
+
+    def test_catch_up_policies_schedule_next_deadline_after_overrun(self) -> None:
+        expected = {
+            "skip": (1000.3, 2),
+            "burst": (1000.1, 0),
+            "stretch": (1000.25, 0),
+        }
+        for policy, (expected_deadline, expected_skipped) in expected.items():
+            with self.subTest(policy=policy), tempfile.TemporaryDirectory() as tmp_dir:
+                bootstrap = self.build_slow_driver_bootstrap(
+                    Path(tmp_dir),
+                    0.25,
+                    catch_up=policy,
+                    overrun_report_interval_ms=0,
+                )
+                engine = runner.PlantRuntimeEngine(bootstrap)
+                overruns: list[dict[str, Any]] = []
+
+                def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                    if msg_type == "cycle_overrun" and payload is not None:
+                        overruns.append(payload)
+
+                with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                    try:
+                        engine.start()
+                        engine.run_cycle()
+                        next_deadline = engine.next_cycle_deadline
+                    finally:
+                        engine.stop()
+
+                self.assertAlmostEqual(next_deadline, expected_deadline)
+                self.assertEqual(len(overruns), 1)
+                self.assertAlmostEqual(overruns[0]["late_by_ms"], 150.0)
+                self.assertEqual(overruns[0]["skipped_deadlines"], expected_skipped)
+
+    def test_burst_catch_up_is_bounded_then_skips(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bootstrap = self.build_slow_driver_bootstrap(
+                Path(tmp_dir),
+                0.15,
+                catch_up="burst",
+                catch_up_max_cycles=2,
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            with FakeClock().patch_runner(), patch.object(runner, "emit"):
+                try:
+                    engine.start()
+                    started_at: list[float] = []
+                    for _ in range(4):
+                        engine.run_cycle()
+                        started_at.append(engine.last_cycle_started_at)
+                finally:
+                    engine.stop()
+
+        self.assertEqual(
+            [round(value - 1000.0, 6) for value in started_at],
+            [0.0, 0.15, 0.3, 0.5],
+        )
+
+    def test_overruns_are_reported_as_interval_summaries(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            bootstrap = self.build_slow_driver_bootstrap(
+                Path(tmp_dir),
+                0.15,
+                overrun_report_interval_ms=300,
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type.startswith("cycle_overrun") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(5):
+                        engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual([msg_type for msg_type, _ in messages], ["cycle_overrun_summary"] * 2)
+        first, last = messages[0][1], messages[1][1]
+        self.assertEqual((first["first_cycle_id"], first["last_cycle_id"], first["count"]), (1, 3, 3))
+        self.assertEqual(first["skipped_deadlines"], 3)
+        self.assertAlmostEqual(first["worst_late_by_ms"], 50.0)
+        self.assertAlmostEqual(first["worst_cycle_duration_ms"], 150.0)
+        self.assertEqual((last["first_cycle_id"], last["last_cycle_id"], last["count"]), (4, 5, 2))
+
+    def test_load_shedding_degrades_on_late_streaks_and_recovers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "tunable_driver",
+                """
+                import time
+                from typing import Any, Dict
+
+                class TunableDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.delay_s = 0.15
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Dict[str, float]]:
+                        time.sleep(self.delay_s)
+                        return {"sensors": {"sensor_1": 1.0}, "actuators": {"actuator_1": 0.0}}
+
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        return True
+                """,
+            )
+            controller_dir = self.write_plugin(
+                root,
+                "counting_controller",
+                """
+                from typing import Any, Dict
+
+                class CountingController:
+                    def __init__(self, context: Any) -> None:
+                        self.cycle_ids = []
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.cycle_ids.append(snapshot["cycle_id"])
+                        return {"actuator_1": 1.0}
+                """,
+            )
+            controller = self.build_controller(controller_dir, "CountingController", "ctrl_low", ["actuator_1"])
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="TunableDriver"),
+                controllers=[replace(controller, execution=runner.ControllerExecution(priority="low"))],
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    load_shedding=runner.RuntimeLoadShedding(
+                        degrade_after_late_cycles=2,
+                        recover_after_on_time_cycles=3,
+                        telemetry_every_cycles=2,
+                        low_priority_period_multiplier=2,
+                    ),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+            events: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+                if msg_type == "load_shedding" and payload is not None:
+                    events.append(payload)
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(6):
+                        engine.run_cycle()
+                    engine.driver_instance.delay_s = 0.0
+                    for _ in range(3):
+                        engine.run_cycle()
+                    compute_cycle_ids = list(engine.controllers[0].instance.cycle_ids)
+                finally:
+                    engine.stop()
+
+        self.assertEqual(
+            [(event["cycle_id"], event["previous_level"], event["level"], event["name"]) for event in events],
+            [
+                (2, 0, 1, "reduced_telemetry"),
+                (4, 1, 2, "skip_optional"),
+                (6, 2, 3, "throttle_low_priority"),
+                (9, 3, 2, "skip_optional"),
+            ],
+        )
+        self.assertEqual([payload["cycle_id"] for payload in telemetry], [1, 2, 4, 6, 8])
+        self.assertEqual(
+            [payload.get("load_shedding_level", 0) for payload in telemetry],
+            [0, 0, 1, 2, 3],
+        )
+        self.assertEqual(compute_cycle_ids, [1, 2, 3, 4, 5, 6, 7, 9])
+        self.assertEqual(telemetry[-1]["controller_outputs"], {"actuator_1": 1.0})
+
+    def test_event_timing_normalizes_strategy_and_event_bounds(self) -> None:
+        runtime_raw = {
+            "id": "rt_1",
+            "timing": {
+                "owner": "runtime",
+                "clock": "monotonic",
+                "strategy": "event",
+                "event_min_spacing_ms": 5,
+                "event_timeout_ms": 250,
+            },
+            "supervision": {"owner": "rust"},
+            "paths": {
+                "runtime_dir": "/tmp/rt_1",
+                "venv_python_path": "/tmp/python",
+                "runner_path": "/tmp/runner.py",
+                "bootstrap_path": "/tmp/bootstrap.json",
+            },
+        }
+        timing = runner.normalize_runtime_context(runtime_raw).timing
+        self.assertEqual(
+            (timing.strategy, timing.event_min_spacing_ms, timing.event_timeout_ms),
+            ("event", 5, 250),
+        )
+        with self.assertRaisesRegex(RuntimeError, "timing.strategy"):
+            runner.normalize_runtime_context(
+                {**runtime_raw, "timing": {**runtime_raw["timing"], "strategy": "busy"}}
+            )
+
+    def test_driver_io_mailbox_keeps_only_latest_pending_write(self) -> None:
+        class BlockedDriver:
+            def __init__(self) -> None:
+                self.reading = threading.Event()
+                self.release = threading.Event()
+                self.writes: list[dict[str, float]] = []
+
+            def read(self) -> dict[str, Any]:
+                self.reading.set()
+                self.release.wait(5.0)
+                return {"sensors": {"sensor_1": 1.0}, "actuators": {}}
+
+            def write(self, outputs: dict[str, float]) -> bool:
+                self.writes.append(outputs)
+                return True
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            plant = self.build_bootstrap(Path(tmp_dir)).plant
+        driver = BlockedDriver()
+        driver_io = runner.DriverIoThread(driver, plant, 0.001)
+        try:
+            self.assertTrue(driver.reading.wait(5.0))
+            driver_io.submit_write({"actuator_1": 1.0})
+            driver_io.submit_write({"actuator_1": 2.0})
+            driver.release.set()
+        finally:
+            driver_io.close(5.0)
+
+        self.assertEqual(driver.writes[0], {"actuator_1": 2.0})
+        self.assertEqual(driver_io.replaced_writes, 1)
+        self.assertEqual(driver_io.latest().sensors, {"sensor_1": 1.0})
+
+    def test_coroutine_plugins_share_one_long_lived_event_loop(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "async_driver",
+                """
+                import asyncio
+                from typing import Any, Dict
+
+                class AsyncDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.loops = []
+                        self.writes = []
+
+                    async def connect(self) -> bool:
+                        self.loops.append(asyncio.get_running_loop())
+                        return True
+
+                    async def stop(self) -> bool:
+                        self.loops.append(asyncio.get_running_loop())
+                        return True
+
+                    async def read(self) -> Dict[str, Dict[str, float]]:
+                        await asyncio.sleep(0)
+                        self.loops.append(asyncio.get_running_loop())
+                        return {"sensors": {"sensor_1": 1.0}, "actuators": {"actuator_1": 0.0}}
+
+                    async def write(self, outputs: Dict[str, float]) -> bool:
+                        await asyncio.sleep(0)
+                        self.loops.append(asyncio.get_running_loop())
+                        self.writes.append(dict(outputs))
+                        return True
+                """,
+            )
+            controller_dir = self.write_plugin(
+                root,
+                "async_controller",
+                """
+                import asyncio
+                from typing import Any, Dict
+
+                class AsyncController:
+                    def __init__(self, context: Any) -> None:
+                        self.loops = []
+
+                    async def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        await asyncio.sleep(0)
+                        self.loops.append(asyncio.get_running_loop())
+                        return {"actuator_1": snapshot["sensors"]["sensor_1"] + snapshot["cycle_id"]}
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="AsyncDriver"),
+                controllers=[self.build_controller(controller_dir, "AsyncController", "async", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    bridge = engine.asyncio_bridge
+                    for _ in range(3):
+                        engine.run_cycle()
+                    driver = engine.driver_instance
+                    controller = engine.controllers[0].instance
+                finally:
+                    engine.stop()
+
+        loops = {id(loop) for loop in [*driver.loops, *controller.loops]}
+        self.assertEqual(loops, {id(bridge.loop)})
+        self.assertEqual(len(driver.loops), 1 + 3 + 3 + 1)
+        self.assertEqual(driver.writes, [{"actuator_1": 2.0}, {"actuator_1": 3.0}, {"actuator_1": 4.0}])
+        self.assertEqual([payload["controller_outputs"] for payload in telemetry][-1], {"actuator_1": 4.0})
+        self.assertIsNone(engine.asyncio_bridge)
+        self.assertFalse(bridge.thread.is_alive())
+
+    def test_overlapped_async_write_reports_against_its_own_cycle(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "async_write_driver",
+                """
+                from typing import Any, Dict
+
+                class AsyncWriteDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.writes = 0
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Dict[str, float]]:
+                        return {"sensors": {"sensor_1": 1.0}, "actuators": {"actuator_1": 0.0}}
+
+                    async def write(self, outputs: Dict[str, float]) -> bool:
+                        self.writes += 1
+                        if self.writes == 1:
+                            raise RuntimeError("porta fechada")
+                        return self.writes != 3
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="AsyncWriteDriver"),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("telemetry", "warning") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            with FakeClock().patch_runner(), patch.object(runner, "emit", capture_emit), patch.object(
+                runner, "log_error", lambda _message: None
+            ):
+                try:
+                    engine.start()
+                    for _ in range(3):
+                        engine.run_cycle()
+                        messages.append(("cycle_end", {}))
+                finally:
+                    engine.stop()
+
+        self.assertEqual(
+            [msg_type for msg_type, _payload in messages],
+            ["telemetry", "cycle_end", "warning", "telemetry", "cycle_end", "telemetry", "cycle_end", "warning"],
+        )
+        warnings = [payload for msg_type, payload in messages if msg_type == "warning"]
+        self.assertEqual([payload["cycle_id"] for payload in warnings], [1, 3])
+        self.assertEqual(warnings[0]["message"], "Falha em escrita de driver do ciclo 1: porta fechada")
+        self.assertIn("write(outputs) do ciclo 3", warnings[1]["message"])
+        telemetry = [payload for msg_type, payload in messages if msg_type == "telemetry"]
+        self.assertEqual(warnings[0]["outputs"], telemetry[0]["controller_outputs"])
+        self.assertEqual(
+            [payload["written_outputs"] for payload in telemetry],
+            [payload["controller_outputs"] for payload in telemetry],
+        )
+        self.assertTrue(all(payload["written_outputs"] for payload in telemetry))
+
+    def test_asyncio_bridge_applies_timeout_and_reports_overlapped_write_errors(self) -> None:
+        async def slow_read() -> dict[str, Any]:
+            await asyncio.sleep(1.0)
+            return {}
+
+        async def failing_write(outputs: dict[str, float]) -> bool:
+            raise RuntimeError(f"porta fechada {outputs}")
+
+        bridge = runner.AsyncioBridge(20)
+        try:
+            with self.assertRaisesRegex(RuntimeError, r"read\(\) excedeu o prazo de 20 ms"):
+                bridge.run("read", slow_read)
+            write = runner.OverlappedAsyncWrite(bridge, failing_write)
+            self.assertIsNone(write({"actuator_1": 1.0}))
+            with self.assertRaisesRegex(RuntimeError, "porta fechada"):
+                write({"actuator_1": 2.0})
+            with self.assertRaisesRegex(RuntimeError, "porta fechada"):
+                write.settle()
+            self.assertIsNone(write.submit({"actuator_1": 3.0}, 7))
+            settled = write.submit({"actuator_1": 4.0}, 8)
+            self.assertIsNotNone(settled)
+            self.assertEqual((settled.cycle_id, settled.outputs), (7, {"actuator_1": 3.0}))
+            self.assertRegex(str(settled.error), r"porta fechada \{'actuator_1': 3.0\}")
+            self.assertEqual(write.settle_result().cycle_id, 8)
+        finally:
+            bridge.close(1.0)
+
+    def test_declared_snapshot_scope_projects_controller_io(self) -> None:
+        for snapshot_mode in ("copy", "readonly"):
+            with self.subTest(snapshot_mode=snapshot_mode), tempfile.TemporaryDirectory() as tmp_dir:
+                root = Path(tmp_dir)
+                original_bootstrap = self.build_bootstrap(root)
+                controller_dir = self.write_plugin(
+                    root,
+                    "scope_plugin",
+                    """
+                    from typing import Any, Dict
+
+                    class ScopeObserver:
+                        def __init__(self, context: Any) -> None:
+                            self.seen = []
+
+                        def compute(self, snapshot: Any) -> Dict[str, float]:
+                            self.seen.append(
+                                {
+                                    key: dict(snapshot[key])
+                                    for key in ("sensors", "actuators", "setpoints")
+                                }
+                                | {"variables_by_id": sorted(snapshot["variables_by_id"])}
+                            )
+                            return {}
+                    """,
+                )
+                bootstrap = replace(
+                    original_bootstrap,
+                    controllers=[
+                        self.build_controller(controller_dir, "ScopeObserver", "sensor_side", []),
+                        replace(
+                            self.build_controller(controller_dir, "ScopeObserver", "actuator_side", ["actuator_1"]),
+                            input_variable_ids=[],
+                        ),
+                    ],
+                    runtime=replace(
+                        original_bootstrap.runtime,
+                        execution=runner.RuntimeExecution(
+                            snapshot_mode=snapshot_mode,
+                            snapshot_scope="declared",
+                        ),
+                    ),
+                )
+                engine = runner.PlantRuntimeEngine(bootstrap)
+
+                with patch.object(runner, "emit", lambda *_args, **_kwargs: None):
+                    try:
+                        engine.start()
+                        engine.run_cycle()
+                        sensor_side, actuator_side = engine.controllers
+                    finally:
+                        engine.stop()
+
+                self.assertEqual(sensor_side.snapshot_variable_ids, ("sensor_1",))
+                self.assertEqual(
+                    sensor_side.instance.seen,
+                    [
+                        {
+                            "sensors": {"sensor_1": 1.0},
+                            "actuators": {},
+                            "setpoints": {"sensor_1": 42.0},
+                            "variables_by_id": ["sensor_1"],
+                        }
+                    ],
+                )
+                self.assertEqual(
+                    actuator_side.instance.seen,
+                    [
+                        {
+                            "sensors": {},
+                            "actuators": {"actuator_1": 0.0},
+                            "setpoints": {"actuator_1": 0.0},
+                            "variables_by_id": ["actuator_1"],
+                        }
+                    ],
+                )
+
+    def test_parallel_controllers_keep_output_order_and_conflict_errors(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "parallel_plugin",
+                """
+                import threading
+                import time
+                from typing import Any, Dict
+
+                class Worker:
+                    def __init__(self, context: Any) -> None:
+                        self.output_ids = context.controller.output_variable_ids
+                        self.threads = []
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.threads.append(threading.current_thread().name)
+                        time.sleep(0.01)
+                        return {variable_id: 1.0 for variable_id in self.output_ids}
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[
+                    self.build_controller(controller_dir, "Worker", "first", ["actuator_1"]),
+                    self.build_controller(controller_dir, "Worker", "second", ["actuator_1"]),
+                ],
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    execution=runner.RuntimeExecution(controller_mode="parallel", max_workers=2),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("telemetry", "warning") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            with patch.object(runner, "emit", capture_emit), patch.object(runner, "log_error", lambda _message: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    first, second = engine.controllers
+                    self.assertIsNotNone(engine.controller_pool)
+                finally:
+                    engine.stop()
+
+        self.assertIsNone(engine.controller_pool)
+        self.assertTrue(first.instance.threads[0].startswith("controller-worker"))
+        self.assertTrue(second.instance.threads[0].startswith("controller-worker"))
+        warnings = [payload["message"] for msg_type, payload in messages if msg_type == "warning"]
+        self.assertEqual(len(warnings), 1)
+        self.assertIn("Falha no controlador 'second'", warnings[0])
+        self.assertIn("recebeu mais de um valor", warnings[0])
+
+        telemetry = next(payload for msg_type, payload in messages if msg_type == "telemetry")
+        self.assertEqual(telemetry["controller_outputs"], {"actuator_1": 1.0})
+        self.assertEqual(set(telemetry["controller_durations_ms"]), {"first", "second"})
+        self.assertAlmostEqual(
+            telemetry["controller_compute_total_ms"],
+            sum(telemetry["controller_durations_ms"].values()),
+        )
+
+    def test_isolated_controller_runs_in_child_process_and_restarts_after_failures(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "isolated_plugin",
+                """
+                import os
+                import time
+                from pathlib import Path
+                from typing import Any, Dict
+
+                CALLS = Path(__file__).with_name("calls.txt")
+
+                class Isolated:
+                    def __init__(self, context: Any) -> None:
+                        self.kp = context.controller.params["kp"].value
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        calls = int(CALLS.read_text()) + 1 if CALLS.exists() else 1
+                        CALLS.write_text(str(calls))
+                        if calls == 1:
+                            os._exit(3)
+                        if calls == 2:
+                            time.sleep(5.0)
+                        return {"actuator_1": self.kp * snapshot["sensors"]["sensor_1"]}
+                """,
+            )
+            isolated = self.build_controller(controller_dir, "Isolated", "isolated", ["actuator_1"])
+            isolated.params = dict(original_bootstrap.controllers[0].params)
+            isolated.execution = runner.ControllerExecution(isolation="process", timeout_ms=500)
+            bootstrap = replace(original_bootstrap, controllers=[isolated])
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("telemetry", "warning") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            def telemetry_outputs() -> list[dict[str, float]]:
+                return [payload["controller_outputs"] for msg_type, payload in messages if msg_type == "telemetry"]
+
+            with patch.object(runner, "emit", capture_emit), patch.object(runner, "log_error", lambda _message: None):
+                try:
+                    engine.start()
+                    proxy = engine.controllers[0].instance
+                    engine.run_cycle()
+                    restart_started_at = time.monotonic()
+                    engine.run_cycle()
+                    restart_cycle_s = time.monotonic() - restart_started_at
+                    deadline = time.monotonic() + 20.0
+                    while time.monotonic() < deadline and not telemetry_outputs()[-1]:
+                        time.sleep(0.02)
+                        engine.run_cycle()
+                    channel_path = proxy.channel_path
+                    self.assertTrue(channel_path.exists())
+                finally:
+                    engine.stop()
+
+            self.assertFalse(channel_path.exists())
+
+        self.assertIsInstance(proxy, runner.IsolatedController)
+        self.assertIsNone(proxy.process)
+        self.assertEqual(proxy.restart_count, 2)
+        self.assertLess(restart_cycle_s, 0.25)
+        warnings = [payload["message"] for msg_type, payload in messages if msg_type == "warning"]
+        self.assertIn("terminou", warnings[0])
+        self.assertIn("está reiniciando", warnings[1])
+        self.assertEqual(len([message for message in warnings if "excedeu o prazo de 500 ms" in message]), 1)
+        self.assertTrue(
+            all("está reiniciando" in message for message in warnings if "excedeu" not in message and "terminou" not in message)
+        )
+        outputs = telemetry_outputs()
+        self.assertEqual(outputs[-1], {"actuator_1": 1.2})
+        self.assertTrue(all(cycle_outputs == {} for cycle_outputs in outputs[:-1]))
+
+    def test_isolated_controller_backs_off_restarts_and_cleans_channel_after_crash(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "crashing_plugin",
+                """
+                import os
+                from typing import Any, Dict
+
+                class Crashing:
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        os._exit(3)
+                """,
+            )
+            crashing = self.build_controller(controller_dir, "Crashing", "crashing", ["actuator_1"])
+            crashing.execution = runner.ControllerExecution(isolation="process", timeout_ms=500)
+            bootstrap = replace(original_bootstrap, controllers=[crashing])
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            warnings: list[str] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "warning" and payload is not None:
+                    warnings.append(payload["message"])
+
+            with patch.object(runner, "emit", capture_emit), patch.object(runner, "log_error", lambda _message: None):
+                try:
+                    engine.start()
+                    proxy = engine.controllers[0].instance
+                    channel_path = proxy.channel_path
+                    deadline = time.monotonic() + 20.0
+                    while time.monotonic() < deadline and (proxy.restart_count < 3 or "terminou" not in warnings[-1]):
+                        time.sleep(0.02)
+                        engine.run_cycle()
+                    self.assertIsNone(proxy.process)
+                    self.assertTrue(channel_path.exists())
+                finally:
+                    engine.stop()
+
+            self.assertFalse(channel_path.exists())
+
+        self.assertEqual(proxy.restart_count, 3)
+        self.assertAlmostEqual(
+            proxy.restart_backoff_s,
+            runner.CONTROLLER_RESTART_BACKOFF_INITIAL_S * 4,
+        )
+        self.assertEqual(len([message for message in warnings if "terminou" in message]), 4)
+
+    def test_reinit_stops_previously_loaded_controllers(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "stoppable_plugin",
+                """
+                from pathlib import Path
+                from typing import Any, Dict
+
+                STOPS = Path(__file__).with_name("stops.txt")
+
+                class Stoppable:
+                    def __init__(self, context: Any) -> None:
+                        pass
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        return {"actuator_1": 1.0}
+
+                    def stop(self) -> bool:
+                        STOPS.write_text(str(int(STOPS.read_text()) + 1 if STOPS.exists() else 1))
+                        return True
+                """,
+            )
+            controller = self.build_controller(controller_dir, "Stoppable", "stoppable", ["actuator_1"])
+            bootstrap = replace(original_bootstrap, controllers=[controller])
+            engine = runner.PlantRuntimeEngine(bootstrap)
+
+            with patch.object(runner, "emit", lambda *_args, **_kwargs: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.apply_init(bootstrap)
+                    stops_after_reinit = (controller_dir / "stops.txt").read_text()
+                finally:
+                    engine.stop()
+
+        self.assertEqual(stops_after_reinit, "1")
+
+    def test_controller_deadline_holds_outputs_and_applies_late_results(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_plugin(
+                root,
+                "slow_plugin",
+                """
+                import time
+                from typing import Any, Dict
+
+                class Slow:
+                    def __init__(self, context: Any) -> None:
+                        self.calls = 0
+
+                    def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                        self.calls += 1
+                        if self.calls in (2, 3):
+                            time.sleep(0.3)
+                        return {"actuator_1": float(self.calls)}
+                """,
+            )
+            slow = self.build_controller(controller_dir, "Slow", "slow", ["actuator_1"])
+            slow.execution = runner.ControllerExecution(deadline_ms=50, late_result="apply")
+            bootstrap = replace(original_bootstrap, controllers=[slow])
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    time.sleep(0.4)
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual(
+            [payload["controller_outputs"] for payload in telemetry],
+            [{"actuator_1": 1.0}, {"actuator_1": 1.0}, {"actuator_1": 1.0}, {"actuator_1": 2.0}],
+        )
+        self.assertEqual(
+            telemetry[-1]["controller_watchdogs"],
+            {"slow": {"deadline_misses": 2, "late_results": 1, "skipped_cycles": 1}},
+        )
+        self.assertLess(telemetry[1]["controller_durations_ms"]["slow"], 250.0)
+
+    def test_controller_watchdog_uses_declared_safe_outputs(self) -> None:
+        metadata = runner.ControllerMetadata(
+            id="ctrl",
+            plugin_id="plugin",
+            plugin_name="Plugin",
+            plugin_dir="",
+            source_file="main.py",
+            class_name="Ctrl",
+            name="ctrl",
+            controller_type="custom",
+            active=True,
+            input_variable_ids=[],
+            output_variable_ids=["actuator_1"],
+            params={},
+            execution=runner.ControllerExecution(
+                deadline_ms=10,
+                on_deadline="safe",
+                safe_outputs={"actuator_1": 0.0, "other": 5.0},
+            ),
+        )
+        watchdog = runner.ControllerWatchdog(metadata)
+        release = threading.Event()
+
+        def blocked_compute() -> Any:
+            release.wait(2.0)
+            return runner.ControllerComputeResult(outputs={"actuator_1": 9.0}, duration_ms=0.0)
+
+        try:
+            submitted = watchdog.submit(blocked_compute)
+            result = watchdog.collect(submitted)
+        finally:
+            release.set()
+            watchdog.close()
+
+        self.assertEqual(result.outputs, {"actuator_1": 0.0})
+        self.assertEqual(watchdog.deadline_misses, 1)
+
+    def write_array_controller_plugin(self, root: Path) -> Path:
+        return self.write_plugin(
+            root,
+            "array_plugin",
+            """
+            from typing import Any, Dict
+
+            class ArrayController:
+                def __init__(self, context: Any) -> None:
+                    self.snapshots = []
+
+                def compute(self, snapshot: Dict[str, Any]) -> Dict[str, float]:
+                    return {"actuator_1": -1.0}
+
+                def compute_array(self, snapshot: Any) -> Any:
+                    self.snapshots.append(snapshot)
+                    return snapshot["setpoints"] - snapshot["sensors"]
+            """,
+        )
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy") is not None, "NumPy não instalado")
+    def test_array_controller_receives_aligned_numpy_inputs(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_array_controller_plugin(root)
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[self.build_controller(controller_dir, "ArrayController", "array", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    controller = engine.controllers[0]
+                finally:
+                    engine.stop()
+
+        self.assertTrue(controller.array_api)
+        snapshot = controller.instance.snapshots[0]
+        self.assertEqual(snapshot["sensor_ids"], ("sensor_1",))
+        self.assertEqual(snapshot["output_ids"], ("actuator_1",))
+        self.assertEqual(snapshot["sensors"].tolist(), [1.0])
+        self.assertEqual(snapshot["setpoints"].tolist(), [42.0])
+        self.assertFalse(snapshot["sensors"].flags.writeable)
+        self.assertEqual(telemetry[0]["controller_outputs"], {"actuator_1": 41.0})
+
+    def test_array_controller_falls_back_to_dict_api_without_numpy(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            controller_dir = self.write_array_controller_plugin(root)
+            bootstrap = replace(
+                original_bootstrap,
+                controllers=[self.build_controller(controller_dir, "ArrayController", "array", ["actuator_1"])],
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with patch.object(runner, "emit", capture_emit), patch.object(runner, "load_optional_numpy", lambda: None):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    controller = engine.controllers[0]
+                finally:
+                    engine.stop()
+
+        self.assertFalse(controller.array_api)
+        self.assertEqual(telemetry[0]["controller_outputs"], {"actuator_1": -1.0})
+
+    def test_array_controller_outputs_skip_nan_and_validate_length(self) -> None:
+        self.assertEqual(
+            runner.map_array_controller_outputs([1.5, math.nan, 2.0], ["a", "b", "c"], "ctrl"),
+            {"a": 1.5, "c": 2.0},
+        )
+        with self.assertRaisesRegex(RuntimeError, "deve retornar 2 valores"):
+            runner.map_array_controller_outputs([1.0], ["a", "b"], "ctrl")
+
+    def write_multi_loop_pid_plugin(self, root: Path) -> Path:
+        plugin = json.loads(MULTI_LOOP_PID_PLUGIN_PATH.read_text(encoding="utf-8"))
+        plugin_dir = root / "multi_loop_pid"
+        plugin_dir.mkdir()
+        (plugin_dir / plugin["sourceFile"]).write_text(plugin["sourceCode"], encoding="utf-8")
+        return plugin_dir
+
+    def build_multi_loop_pid(self, loop_count: int, params: dict[str, Any]) -> tuple[Any, Any]:
+        tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp_dir.cleanup)
+        plugin_dir = self.write_multi_loop_pid_plugin(Path(tmp_dir.name))
+        plant = runner.normalize_plant_context(
+            {
+                "id": "plant_pid",
+                "name": "Plant PID",
+                "variables": [
+                    *[
+                        {"id": f"pv_{index}", "name": f"PV {index}", "type": "sensor", "unit": "C"}
+                        for index in range(loop_count)
+                    ],
+                    *[
+                        {
+                            "id": f"mv_{index}",
+                            "name": f"MV {index}",
+                            "type": "atuador",
+                            "unit": "%",
+                            "pv_min": 0.0,
+                            "pv_max": 100.0,
+                        }
+                        for index in range(loop_count)
+                    ],
+                ],
+                "setpoints": {f"pv_{index}": 50.0 for index in range(loop_count)},
+            }
+        )
+        metadata = runner.ControllerMetadata(
+            id=f"pid_{loop_count}",
+            plugin_id="multi_loop_pid",
+            plugin_name="Multi-Loop PID",
+            plugin_dir=str(plugin_dir),
+            source_file="main.py",
+            class_name="MultiLoopPidController",
+            name=f"PID {loop_count}",
+            controller_type="PID",
+            active=True,
+            input_variable_ids=[f"pv_{index}" for index in range(loop_count)],
+            output_variable_ids=[f"mv_{index}" for index in range(loop_count)],
+            params={
+                key: runner.ControllerParamSpec(key=key, type="number", value=value, label=key)
+                for key, value in params.items()
+            },
+        )
+        controller_cls = runner.load_plugin_class(
+            plugin_dir,
+            metadata.source_file,
+            metadata.class_name,
+            runner.CONTROLLER_REQUIRED_METHODS,
+            "controlador 'PID'",
+        )
+        return controller_cls(runner.build_controller_plugin_context(metadata, plant)), plant
+
+    def test_multi_loop_pid_matches_independent_scalar_loops(self) -> None:
+        params = {"kp": [2.0, 40.0, 0.5], "ki": 0.8, "kd": 0.1, "derivative_filter_s": 0.05}
+        multi_loop, _ = self.build_multi_loop_pid(3, params)
+        single_loops = []
+        for index in range(3):
+            single_params = {**params, "kp": params["kp"][index]}
+            single, _ = self.build_multi_loop_pid(1, single_params)
+            single_loops.append(single)
+
+        measurements = [[10.0, 45.0, 49.0], [12.0, 60.0, 49.5], [15.0, 55.0, 50.5], [18.0, 48.0, 50.0]]
+        for values in measurements:
+            snapshot = {
+                "dt_s": 0.1,
+                "sensors": {f"pv_{index}": value for index, value in enumerate(values)},
+                "setpoints": {f"pv_{index}": 50.0 for index in range(3)},
+            }
+            outputs = multi_loop.compute(snapshot)
+            for index, single in enumerate(single_loops):
+                single_outputs = single.compute(
+                    {"dt_s": 0.1, "sensors": {"pv_0": values[index]}, "setpoints": {"pv_0": 50.0}}
+                )
+                self.assertAlmostEqual(outputs[f"mv_{index}"], single_outputs["mv_0"])
+            self.assertTrue(all(0.0 <= value <= 100.0 for value in outputs.values()))
+
+    def test_multi_loop_pid_stops_integrating_while_saturated(self) -> None:
+        controller, _ = self.build_multi_loop_pid(1, {"kp": 10.0, "ki": 1.0})
+
+        for _ in range(5):
+            outputs = controller.compute({"dt_s": 1.0, "sensors": {"pv_0": 0.0}, "setpoints": {"pv_0": 50.0}})
+            self.assertEqual(outputs, {"mv_0": 100.0})
+        self.assertEqual(controller.integral, [0.0])
+
+        outputs = controller.compute({"dt_s": 1.0, "sensors": {"pv_0": 49.0}, "setpoints": {"pv_0": 50.0}})
+        self.assertEqual(outputs, {"mv_0": 11.0})
+        self.assertEqual(controller.integral, [1.0])
+        self.assertEqual(controller.compute({"dt_s": 1.0, "sensors": {}, "setpoints": {"pv_0": 50.0}}), {})
+
+    def test_engine_loads_multi_loop_pid_example_plugin(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            controller = replace(
+                original_bootstrap.controllers[0],
+                plugin_dir=str(self.write_multi_loop_pid_plugin(Path(tmp_dir))),
+                class_name="MultiLoopPidController",
+            )
+            engine = runner.PlantRuntimeEngine(replace(original_bootstrap, controllers=[controller]))
+            telemetry: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    telemetry.append(payload)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertAlmostEqual(telemetry[0]["controller_outputs"]["actuator_1"], 1.2 * 41.0)
+
+    def test_multi_loop_pid_validates_configuration(self) -> None:
+        with self.assertRaisesRegex(RuntimeError, "Parâmetro 'kp' deve ter 1 ou 2 valores"):
+            self.build_multi_loop_pid(2, {"kp": [1.0, 2.0, 3.0]})
+        controller, _ = self.build_multi_loop_pid(2, {"kp": [3.0], "ki": None})
+        self.assertEqual(controller.kp, [3.0, 3.0])
+        self.assertEqual(controller.ki, [0.0, 0.0])
+        for params, message in (
+            ({"kp": "alto"}, "Parâmetro 'kp' deve ser numérico"),
+            ({"ki": True}, "Parâmetro 'ki' deve ser numérico"),
+            ({"kd": [1.0, None]}, r"Parâmetro 'kd'\[1\] deve ser numérico"),
+            ({"kp": [1.0, math.inf]}, r"Parâmetro 'kp'\[1\] deve ser finito"),
+            ({"derivative_filter_s": -0.1}, "Parâmetro 'derivative_filter_s' não pode ser negativo"),
+        ):
+            with self.subTest(params=params), self.assertRaisesRegex(RuntimeError, message):
+                self.build_multi_loop_pid(2, params)
+
+    @unittest.skipUnless(importlib.util.find_spec("numpy") is not None, "NumPy não instalado")
+    def test_multi_loop_pid_array_api_matches_scalar_compute(self) -> None:
+        params = {"kp": [2.0, 40.0, 0.5], "ki": 0.8, "kd": 0.1, "derivative_filter_s": 0.05}
+        array_controller, plant = self.build_multi_loop_pid(3, params)
+        scalar_controller, _ = self.build_multi_loop_pid(3, params)
+        sensor_ids = tuple(plant.sensors.ids)
+        setpoints = runner.build_readonly_array([50.0, 50.0, 50.0])
+
+        for values in ([10.0, 45.0, 49.0], [12.0, 60.0, math.nan], [15.0, 55.0, 50.5]):
+            outputs = array_controller.compute_array(
+                {
+                    "dt_s": 0.1,
+                    "sensor_ids": sensor_ids,
+                    "sensors": runner.build_readonly_array(values),
+                    "setpoints": setpoints,
+                }
+            )
+            expected = scalar_controller.compute(
+                {
+                    "dt_s": 0.1,
+                    "sensors": {f"pv_{index}": value for index, value in enumerate(values) if value == value},
+                    "setpoints": {f"pv_{index}": 50.0 for index in range(3)},
+                }
+            )
+            mapped = runner.map_array_controller_outputs(outputs, ["mv_0", "mv_1", "mv_2"], "pid")
+            self.assertEqual(mapped.keys(), expected.keys())
+            for variable_id, value in expected.items():
+                self.assertAlmostEqual(mapped[variable_id], value)
+
+    def test_columnar_telemetry_sends_schema_once_and_value_arrays(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    telemetry=runner.RuntimeTelemetry(layout="columnar"),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type in ("telemetry", "telemetry_schema") and payload is not None:
+                    messages.append((msg_type, payload))
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                    engine.update_setpoints({"sensor_1": 50.0, "actuator_1": 0.0})
+                    engine.run_cycle()
+                    engine.update_setpoints({"sensor_1": 50.0})
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual(
+            [msg_type for msg_type, _ in messages],
+            ["telemetry_schema", "telemetry", "telemetry", "telemetry", "telemetry_schema", "telemetry"],
+        )
+        first_schema = messages[0][1]
+        self.assertEqual(first_schema["schema_version"], 1)
+        self.assertEqual(first_schema["columns"]["sensors"], ["sensor_1"])
+        self.assertEqual(first_schema["columns"]["setpoints"], ["sensor_1", "actuator_1"])
+
+        telemetry = messages[1][1]
+        self.assertEqual(telemetry["schema_version"], 1)
+        self.assertEqual(telemetry["sensors"], [1.0])
+        self.assertEqual(telemetry["actuators_read"], [0.0])
+        self.assertEqual(telemetry["setpoints"], [42.0, 0.0])
+        self.assertEqual(telemetry["controller_outputs"], [0.0])
+        self.assertEqual(messages[3][1]["setpoints"], [50.0, 0.0])
+
+        self.assertEqual(messages[4][1]["schema_version"], 2)
+        self.assertEqual(messages[4][1]["columns"]["setpoints"], ["sensor_1"])
+        self.assertEqual(messages[5][1]["setpoints"], [50.0])
+
+    def test_telemetry_publisher_applies_overflow_policies(self) -> None:
+        drop_oldest = runner.TelemetryPublisher(2, "drop_oldest")
+        drop_newest = runner.TelemetryPublisher(2, "drop_newest")
+        for sequence in range(4):
+            drop_oldest.publish("telemetry", {"sequence": sequence})
+            drop_newest.publish("telemetry", {"sequence": sequence})
+
+        self.assertEqual([payload["sequence"] for _, payload in drop_oldest.frames], [2, 3])
+        self.assertEqual([payload["sequence"] for _, payload in drop_newest.frames], [0, 1])
+        self.assertEqual(
+            drop_oldest.stats(),
+            {"telemetry_dropped_frames": 2, "telemetry_queue_depth": 2},
+        )
+
+        published: list[int] = []
+        blocking = runner.TelemetryPublisher(1, "block")
+        with patch.object(runner, "emit", lambda _msg_type, payload: published.append(payload["sequence"])):
+            blocking.start()
+            for sequence in range(20):
+                blocking.publish("telemetry", {"sequence": sequence})
+            blocking.close(2.0)
+
+        self.assertEqual(published, list(range(20)))
+        self.assertEqual(blocking.dropped_frames, 0)
+
+    def test_telemetry_publisher_never_drops_schema_or_overrun_messages(self) -> None:
+        for overflow_policy in ("drop_oldest", "drop_newest"):
+            publisher = runner.TelemetryPublisher(2, overflow_policy)
+            publisher.publish("telemetry_schema", {"schema_version": 1})
+            for sequence in range(4):
+                publisher.publish("telemetry", {"sequence": sequence})
+            publisher.publish("cycle_overrun", {"cycle_id": 4})
+
+            queued_types = [msg_type for msg_type, _ in publisher.frames]
+            self.assertEqual(queued_types[0], "telemetry_schema", overflow_policy)
+            self.assertEqual(queued_types[-1], "cycle_overrun", overflow_policy)
+            self.assertEqual(publisher.dropped_frames, 3, overflow_policy)
+
+        published: list[str] = []
+        blocking = runner.TelemetryPublisher(1, "block")
+        blocking.publish("telemetry", {"sequence": 0})
+        blocking.publish("telemetry_schema", {"schema_version": 2})
+        with patch.object(runner, "emit", lambda msg_type, _payload: published.append(msg_type)):
+            blocking.start()
+            blocking.close(2.0)
+
+        self.assertEqual(published, ["telemetry", "telemetry_schema"])
+
+    def test_telemetry_publisher_bounds_control_messages(self) -> None:
+        limit = 2 + runner.TELEMETRY_PUBLISHER_CONTROL_HEADROOM
+        for overflow_policy in ("drop_oldest", "drop_newest"):
+            publisher = runner.TelemetryPublisher(2, overflow_policy)
+            publisher.publish("telemetry", {"sequence": 0})
+            publisher.publish("telemetry", {"sequence": 1})
+            for cycle_id in range(limit + 4):
+                publisher.publish("cycle_overrun", {"cycle_id": cycle_id})
+
+            self.assertEqual(len(publisher.frames), limit, overflow_policy)
+            self.assertTrue(all(msg_type == "cycle_overrun" for msg_type, _ in publisher.frames), overflow_policy)
+            self.assertEqual(publisher.frames[-1][1]["cycle_id"], limit - 1, overflow_policy)
+            self.assertEqual(publisher.dropped_frames, 6, overflow_policy)
+
+        published: list[int] = []
+        blocking = runner.TelemetryPublisher(1, "block")
+        with patch.object(runner, "emit", lambda _msg_type, payload: published.append(payload["cycle_id"])):
+            blocking.start()
+            for cycle_id in range(limit * 3):
+                blocking.publish("cycle_overrun", {"cycle_id": cycle_id})
+            blocking.close(2.0)
+
+        self.assertEqual(published, list(range(limit * 3)))
+        self.assertEqual(blocking.dropped_frames, 0)
+
+    def test_engine_publishes_telemetry_from_publisher_thread(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    telemetry=runner.RuntimeTelemetry(publisher="thread", queue_size=8),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            publisher_threads: list[str] = []
+            telemetry_payloads: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    publisher_threads.append(runner.threading.current_thread().name)
+                    telemetry_payloads.append(payload)
+
+            with patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    engine.run_cycle()
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertIsNone(engine.telemetry_publisher)
+        self.assertEqual(publisher_threads, ["telemetry-publisher", "telemetry-publisher"])
+        self.assertEqual([payload["cycle_id"] for payload in telemetry_payloads], [1, 2])
+        self.assertEqual(telemetry_payloads[1]["telemetry_dropped_frames"], 0)
+        self.assertIn("telemetry_queue_depth", telemetry_payloads[1])
+
+    def test_telemetry_batches_cycles_into_single_envelope(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    timing=replace(original_bootstrap.runtime.timing, publish_every_cycles=3),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            fake_clock = FakeClock()
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if payload is not None:
+                    messages.append((msg_type, payload))
+
+            with fake_clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(7):
+                        engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual([msg_type for msg_type, _ in messages], ["telemetry_batch"] * 3)
+        self.assertEqual([payload["count"] for _, payload in messages], [3, 3, 1])
+        self.assertEqual(
+            [sample["cycle_id"] for _, payload in messages for sample in payload["samples"]],
+            list(range(1, 8)),
+        )
+
+    def test_telemetry_max_publish_rate_flushes_by_elapsed_time(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    timing=replace(original_bootstrap.runtime.timing, publish_max_rate_hz=2.0),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            fake_clock = FakeClock()
+            batch_sizes: list[int] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry_batch" and payload is not None:
+                    batch_sizes.append(payload["count"])
+
+            with fake_clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(10):
+                        engine.run_cycle()
+                    self.assertEqual(batch_sizes, [6])
+                finally:
+                    engine.stop()
+
+        self.assertEqual(batch_sizes, [6, 4])
+
+    def test_delta_telemetry_sends_changes_between_keyframes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            root = Path(tmp_dir)
+            original_bootstrap = self.build_bootstrap(root)
+            driver_dir = self.write_plugin(
+                root,
+                "sequence_driver",
+                """
+                from typing import Any, Dict
+
+                class SequenceDriver:
+                    def __init__(self, context: Any) -> None:
+                        self.values = iter([10.0, 10.0, 10.5, 15.0, 15.0, 15.0])
+
+                    def connect(self) -> bool:
+                        return True
+
+                    def stop(self) -> bool:
+                        return True
+
+                    def read(self) -> Dict[str, Dict[str, float]]:
+                        return {"sensors": {"sensor_1": next(self.values)}, "actuators": {"actuator_1": 0.0}}
+
+                    def write(self, outputs: Dict[str, float]) -> bool:
+                        return True
+                """,
+            )
+            bootstrap = replace(
+                original_bootstrap,
+                driver=replace(original_bootstrap.driver, plugin_dir=str(driver_dir), class_name="SequenceDriver"),
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    telemetry=runner.RuntimeTelemetry(
+                        encoding="delta",
+                        keyframe_interval=4,
+                        deadband_ratio=0.01,
+                    ),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            fake_clock = FakeClock()
+            frames: list[dict[str, Any]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if msg_type == "telemetry" and payload is not None:
+                    frames.append(payload)
+
+            with fake_clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(5):
+                        engine.run_cycle()
+                    runner.handle_command({"type": "request_keyframe"}, engine)
+                    engine.run_cycle()
+                finally:
+                    engine.stop()
+
+        self.assertEqual([frame["sequence"] for frame in frames], [1, 2, 3, 4, 5, 6])
+        self.assertEqual(
+            [frame["keyframe"] for frame in frames],
+            [True, False, False, False, True, True],
+        )
+        self.assertEqual(
+            [frame["sensors"] for frame in frames],
+            [
+                {"sensor_1": 10.0},
+                {},
+                {},
+                {"sensor_1": 15.0},
+                {"sensor_1": 15.0},
+                {"sensor_1": 15.0},
+            ],
+        )
+        self.assertEqual(frames[1]["setpoints"], {})
+        self.assertEqual(frames[0]["setpoints"], {"sensor_1": 42.0, "actuator_1": 0.0})
+
+    def test_columnar_delta_lists_changed_columns_per_field(self) -> None:
+        columns = {field_name: [] for field_name in runner.TELEMETRY_VALUE_FIELDS}
+        columns["sensors"] = ["sensor_1", "sensor_2", "sensor_3"]
+        schema = runner.TelemetrySchema(version=1, columns=columns)
+
+        keyframe = runner.encode_columnar_telemetry(
+            {"keyframe": True, "sensors": {"sensor_1": 1.0, "sensor_3": 3.0}},
+            schema,
+        )
+        delta = runner.encode_columnar_telemetry(
+            {"keyframe": False, "sensors": {"sensor_3": 3.5}},
+            schema,
+        )
+
+        self.assertEqual(keyframe["sensors"], [1.0, None, 3.0])
+        self.assertNotIn("changed_columns", keyframe)
+        self.assertEqual(delta["sensors"], [3.5])
+        self.assertEqual(delta["changed_columns"]["sensors"], [2])
+        self.assertEqual(delta["changed_columns"]["setpoints"], [])
+
+    def test_shared_memory_ring_carries_telemetry_outside_stdout(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            original_bootstrap = self.build_bootstrap(Path(tmp_dir))
+            bootstrap = replace(
+                original_bootstrap,
+                runtime=replace(
+                    original_bootstrap.runtime,
+                    telemetry=runner.RuntimeTelemetry(transport="shm", ring_slots=2),
+                ),
+            )
+            engine = runner.PlantRuntimeEngine(bootstrap)
+            fake_clock = FakeClock()
+            messages: list[tuple[str, dict[str, Any]]] = []
+
+            def capture_emit(msg_type: str, payload: dict[str, Any] | None = None) -> None:
+                if payload is not None:
+                    messages.append((msg_type, payload))
+
+            with fake_clock.patch_runner(), patch.object(runner, "emit", capture_emit):
+                try:
+                    engine.start()
+                    for _ in range(3):
+                        engine.run_cycle()
+
+                    reader = runner.TelemetryRingReader(Path(messages[0][1]["ring_path"]))
+                    try:
+                        samples = reader.read_since(0)
+                        self.assertEqual(reader.read_since(3), [])
+                    finally:
+                        reader.close()
+                finally:
+                    engine.stop()
+
+        self.assertEqual([msg_type for msg_type, _ in messages], ["telemetry_schema"])
+        self.assertEqual(messages[0][1]["transport"], "shm")
+        self.assertEqual(messages[0][1]["slot_count"], 2)
+        self.assertEqual([sample.sequence for sample in samples], [2, 3])
+        self.assertEqual([sample.metrics["cycle_id"] for sample in samples], [2.0, 3.0])
+        self.assertEqual(samples[-1].values["sensors"], [1.0])
+        self.assertEqual(samples[-1].values["setpoints"], [42.0, 0.0])
+        self.assertEqual(samples[-1].values["written_outputs"], [0.0])
+
+
+class RunnerProtocolStreamTests(unittest.TestCase):
+    def test_emit_keeps_json_on_stdout_after_bootstrap(self) -> None:
+        completed = run_runner_subprocess(
+            """
+            runner.bootstrap_protocol_stdout()
+            runner.emit("ready", {"ok": True})
+            """
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        self.assertEqual(
+            parse_protocol_lines(completed.stdout),
+            [{"type": "ready", "payload": {"ok": True}}],
+        )
+        self.assertEqual(completed.stderr.strip(), "")
+
+    def test_emit_with_fast_serializer_keeps_json_on_stdout(self) -> None:
+        completed = run_runner_subprocess(
+            """
+            runner.bootstrap_protocol_stdout()
+            runner.configure_protocol_serializer("auto")
+            runner.emit("ready", {"ok": True, "name": "Forno ºC"})
+            """
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        self.assertEqual(
+            parse_protocol_lines(completed.stdout),
+            [{"type": "ready", "payload": {"ok": True, "name": "Forno ºC"}}],
+        )
+        self.assertEqual(completed.stderr.strip(), "")
+
+    def test_protocol_serializers_match_stdlib_bytes(self) -> None:
+        payloads = [
+            {"ok": True, "value": None},
+            {"cycle_id": 7, "sensors": {"sensor_1": 42.5, "sensor_2": -0.125}, "name": "Forno ºC / 1"},
+            {"samples": [{"values": [1.0, 2.5, None]}], "count": 1, "durations": {"ctrl_1": 0.001}},
+        ]
+        stdlib = runner.resolve_protocol_serializer("json")
+
+        for name in ("orjson", "ujson"):
+            serializer = runner.resolve_protocol_serializer(name)
+            if serializer.name != name:
+                continue
+            for payload in payloads:
+                envelope = {"type": "telemetry", "payload": payload}
+                self.assertEqual(serializer.dumps(envelope), stdlib.dumps(envelope), name)
+                self.assertEqual(serializer.loads(stdlib.dumps(envelope)), envelope, name)
+
+    def test_protocol_serializer_falls_back_to_stdlib(self) -> None:
+        real_import_module = runner.importlib.import_module
+
+        def import_module(name: str) -> Any:
+            if name in ("orjson", "ujson"):
+                raise ImportError(name)
+            return real_import_module(name)
+
+        with (
+            patch.object(runner.importlib, "import_module", import_module),
+            patch.object(runner, "log_error", lambda _message: None),
+        ):
+            self.assertEqual(runner.resolve_protocol_serializer("auto").name, "json")
+            self.assertEqual(runner.resolve_protocol_serializer("orjson").name, "json")
+
+        serializer = runner.resolve_protocol_serializer("auto")
+        self.assertEqual(serializer.dumps({1: "a"}), b'{"1":"a"}')
+
+    def test_python_print_is_redirected_to_stderr(self) -> None:
+        completed = run_runner_subprocess(
+            """
+            runner.bootstrap_protocol_stdout()
+            print("python-log")
+            runner.emit("ready", {"ok": True})
+            """
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        self.assertEqual(
+            parse_protocol_lines(completed.stdout),
+            [{"type": "ready", "payload": {"ok": True}}],
+        )
+        self.assertIn("python-log", completed.stderr)
+
+    @unittest.skipUnless(os.name == "posix", "Teste de libc disponível apenas em POSIX")
+    def test_libc_printf_is_redirected_to_stderr(self) -> None:
+        completed = run_runner_subprocess(
+            """
+            import ctypes
+
+            runner.bootstrap_protocol_stdout()
+            libc = ctypes.CDLL(None)
+            libc.printf.argtypes = [ctypes.c_char_p]
+            libc.printf.restype = ctypes.c_int
+            libc.fflush.argtypes = [ctypes.c_void_p]
+            libc.fflush.restype = ctypes.c_int
+            libc.printf(b"native-log\\\\n")
+            libc.fflush(None)
+            runner.emit("ready", {"ok": True})
+            """
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        self.assertEqual(
+            parse_protocol_lines(completed.stdout),
+            [{"type": "ready", "payload": {"ok": True}}],
+        )
+        self.assertIn("native-log", completed.stderr)
+
+    def test_emit_stays_atomic_across_threads(self) -> None:
+        completed = run_runner_subprocess(
+            """
+            import threading
+
+            runner.bootstrap_protocol_stdout()
+
+            def worker(worker_id: int) -> None:
+                for sequence in range(200):
+                    runner.emit("telemetry", {"worker": worker_id, "sequence": sequence})
+
+            threads = [threading.Thread(target=worker, args=(worker_id,)) for worker_id in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            """
+        )
+
+        self.assertEqual(completed.returncode, 0, msg=completed.stderr)
+        lines = parse_protocol_lines(completed.stdout)
+
+        self.assertEqual(len(lines), 1200)
+        self.assertTrue(all(line["type"] == "telemetry" for line in lines))
+        self.assertEqual(completed.stderr.strip(), "")
+
+    def test_binary_framing_packs_telemetry_values_as_float64(self) -> None:
+        runner.configure_protocol_framing("binary")
+        try:
+            json_frame = runner.encode_envelope("warning", {"message": "ok"})
+            telemetry_frame = runner.encode_envelope(
+                "telemetry",
+                {
+                    "cycle_id": 3,
+                    "schema_version": 1,
+                    "sensors": [1.5, None],
+                    "actuators": [2.0],
+                    "actuators_read": [2.5],
+                    "setpoints": [40.0, 41.0],
+                    "controller_outputs": [2.0],
+                    "written_outputs": [2.0],
+                    "controller_durations_ms": {"ctrl_1": 0.5},
+                },
+            )
+        finally:
+            runner.configure_protocol_framing("ndjson")
+
+        stream = io.BytesIO(json_frame + telemetry_frame)
+        kind, body = runner.read_binary_frame(stream)
+        self.assertEqual(kind, runner.BINARY_FRAME_KIND_JSON)
+        self.assertEqual(json.loads(body), {"type": "warning", "payload": {"message": "ok"}})
+
+        kind, body = runner.read_binary_frame(stream)
+        self.assertEqual(kind, runner.BINARY_FRAME_KIND_TELEMETRY)
+        (header_length,) = struct.unpack_from("<I", body)
+        header = json.loads(body[4 : 4 + header_length])
+        values = struct.unpack(f"<{(len(body) - 4 - header_length) // 8}d", body[4 + header_length :])
+
+        self.assertEqual(header["type"], "telemetry")
+        self.assertEqual(
+            header["payload"],
+            {"cycle_id": 3, "schema_version": 1, "controller_durations_ms": {"ctrl_1": 0.5}},
+        )
+        self.assertEqual(values[0], 1.5)
+        self.assertTrue(math.isnan(values[1]))
+        self.assertEqual(values[2:], (2.0, 2.5, 40.0, 41.0, 2.0, 2.0))
+        self.assertIsNone(runner.read_binary_frame(stream))
+
+    def test_binary_command_frames_are_decoded_and_validated(self) -> None:
+        command = runner.encode_binary_frame(
+            runner.BINARY_FRAME_KIND_JSON,
+            json.dumps({"type": "start"}).encode("utf-8"),
+        )
+        self.assertEqual(
+            [json.loads(body) for body in runner.iter_binary_json_frames(io.BytesIO(command))],
+            [{"type": "start"}],
+        )
+
+        with self.assertRaises(RuntimeError):
+            list(runner.iter_binary_json_frames(io.BytesIO(b"XX" + command[2:])))
+
+    def test_binary_framing_rejects_map_layout_and_init_framing_changes(self) -> None:
+        runtime_raw = {
+            "id": "rt_1",
+            "timing": {"owner": "runtime", "clock": "monotonic", "strategy": "deadline"},
+            "supervision": {"owner": "rust"},
+            "paths": {
+                "runtime_dir": "/tmp/rt_1",
+                "venv_python_path": "/tmp/python",
+                "runner_path": "/tmp/runner.py",
+                "bootstrap_path": "/tmp/bootstrap.json",
+            },
+            "protocol": {"framing": "binary"},
+        }
+        self.assertEqual(runner.normalize_runtime_context(runtime_raw).telemetry.layout, "columnar")
+        with self.assertRaisesRegex(RuntimeError, "columnar"):
+            runner.normalize_runtime_context({**runtime_raw, "telemetry": {"layout": "map"}})
+
+        bootstrap = runner.RuntimeBootstrap(
+            driver=None,
+            controllers=[],
+            plant=None,
+            runtime=runner.normalize_runtime_context(runtime_raw),
+        )
+        with (
+            patch.object(runner, "normalize_bootstrap", lambda _payload: bootstrap),
+            patch.object(runner, "PROTOCOL_FRAMING", "ndjson"),
+        ):
+            with self.assertRaisesRegex(RuntimeError, "framing"):
+                runner.handle_command({"type": "init", "payload": {}}, engine=None)
+
+    def test_command_reader_requests_shutdown_on_malformed_binary_frame(self) -> None:
+        command_queue: Any = runner.queue.Queue()
+        stdin = io.TextIOWrapper(io.BytesIO(b"XX\x01\x01\x00\x00\x00\x00"))
+        errors: list[str] = []
+
+        with (
+            patch.object(runner.sys, "stdin", stdin),
+            patch.object(runner, "emit", lambda _msg_type, payload: errors.append(payload["message"])),
+        ):
+            runner.spawn_command_reader(command_queue, "binary")
+            command = command_queue.get(timeout=2.0)
+
+        self.assertEqual(command, {"type": "shutdown"})
+        self.assertEqual(len(errors), 1)
+
+    @unittest.skipUnless(os.name == "posix", "Pipes não bloqueantes testados apenas em POSIX")
+    def test_nonblocking_writer_drops_telemetry_but_keeps_lifecycle_messages(self) -> None:
+        read_fd, write_fd = os.pipe()
+        try:
+            writer = runner.ProtocolWriter()
+            self.assertTrue(writer.configure_nonblocking(write_fd, 4096))
+
+            telemetry_frame = b"t" * 1024
+            for _ in range(256):
+                writer.write(write_fd, telemetry_frame, droppable=True)
+
+            stats = writer.stats()
+            self.assertGreater(stats["frames_dropped"], 0)
+            self.assertEqual(stats["bytes_dropped"], stats["frames_dropped"] * len(telemetry_frame))
+            self.assertLessEqual(stats["max_pending_bytes_seen"], 4096)
+            self.assertGreater(stats["pending_bytes"], 0)
+
+            os.set_blocking(read_fd, False)
+            received = bytearray()
+
+            def read_available() -> None:
+                try:
+                    while True:
+                        received.extend(os.read(read_fd, 65536))
+                except BlockingIOError:
+                    pass
+
+            read_available()
+            writer.write(write_fd, b"stopped\n", droppable=False)
+            while writer.pending:
+                read_available()
+                writer.drain(write_fd)
+            read_available()
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        self.assertTrue(received.endswith(b"stopped\n"))
+        self.assertEqual(len(received), writer.bytes_written)
+        self.assertEqual(
+            writer.bytes_written + writer.bytes_dropped,
+            256 * len(telemetry_frame) + len(b"stopped\n"),
+        )
+
+    @unittest.skipUnless(os.name == "posix", "Pipes não bloqueantes testados apenas em POSIX")
+    def test_drain_protocol_output_flushes_pending_lifecycle_messages_while_idle(self) -> None:
+        read_fd, write_fd = os.pipe()
+        try:
+            writer = runner.ProtocolWriter()
+            self.assertTrue(writer.configure_nonblocking(write_fd, 4096))
+            writer.pending += b"stopped\n"
+
+            with patch.object(runner, "PROTOCOL_WRITER", writer), patch.object(runner, "PROTOCOL_STDOUT", write_fd):
+                still_pending = runner.drain_protocol_output(0.1)
+
+            received = os.read(read_fd, 65536)
+        finally:
+            os.close(read_fd)
+            os.close(write_fd)
+
+        self.assertFalse(still_pending)
+        self.assertEqual(received, b"stopped\n")
 
 
 if __name__ == "__main__":
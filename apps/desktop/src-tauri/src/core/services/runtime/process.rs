@@ -123,6 +123,16 @@ pub(super) fn spawn_stdout_task<R: Runtime + 'static>(
                     lock.cycle_late = true;
                     lock.late_cycle_count = lock.late_cycle_count.saturating_add(1);
                 }
+                "cycle_overrun_summary" => {
+                    let count = envelope
+                        .payload
+                        .get("count")
+                        .and_then(Value::as_u64)
+                        .unwrap_or(1);
+                    let mut lock = metrics.lock();
+                    lock.cycle_late = true;
+                    lock.late_cycle_count = lock.late_cycle_count.saturating_add(count);
+                }
                 "stopped" => {
                     handle_stopped_event(
                         &app,